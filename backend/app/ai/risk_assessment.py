@@ -13,3 +13,32 @@ def assess_risk(token_data: List[Dict[str, float]]) -> Dict[str, float]:
         'risk_score': float(1 / (1 + sharpe_ratio))
     }
 
+
+def assess_risk_many(prices: np.ndarray, offsets: np.ndarray) -> Dict[str, np.ndarray]:
+    # Vectorized assess_risk over series stored back to back: series i is
+    # prices[offsets[i]:offsets[i + 1]] and needs at least two prices
+    prices = np.asarray(prices, dtype=np.float64)
+    offsets = np.asarray(offsets, dtype=np.int64)
+    if len(offsets) < 2:
+        return {'volatility': np.empty(0), 'sharpe_ratio': np.empty(0), 'risk_score': np.empty(0)}
+    starts = offsets[:-1]
+    counts = np.diff(offsets) - 1
+    boundaries = offsets[1:-1] - 1
+
+    returns = np.diff(prices) / prices[:-1]
+    # A difference across two series is not a return; zero it so it drops out of the sums
+    returns[boundaries] = 0
+    mean = np.add.reduceat(returns, starts) / counts
+    deviations = returns - np.repeat(mean, counts + 1)[:len(returns)]
+    deviations[boundaries] = 0
+    volatility = np.sqrt(np.add.reduceat(deviations * deviations, starts) / counts)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sharpe_ratio = np.where(volatility != 0, mean / volatility, 0.0)
+        risk_score = 1 / (1 + sharpe_ratio)
+
+    return {
+        'volatility': volatility,
+        'sharpe_ratio': sharpe_ratio,
+        'risk_score': risk_score
+    }
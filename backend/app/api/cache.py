@@ -0,0 +1,131 @@
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Tuple
+import asyncio
+import hashlib
+import json
+import time
+
+# Result handed to waiters when the computing request was cancelled
+_RETRY = object()
+
+class CacheBackend(ABC):
+    # Async so a shared store (Redis, memcached) can be swapped in without
+    # changing callers
+
+    @abstractmethod
+    async def get(self, key: str) -> Tuple[bool, Any]:
+        """Return (found, value) for a key."""
+
+    @abstractmethod
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        """Store a value for ttl seconds."""
+
+    @abstractmethod
+    async def clear(self) -> None:
+        """Drop every entry and reset the counters."""
+
+    @abstractmethod
+    async def stats(self) -> Dict[str, int]:
+        """Counters, including at least hits, misses and evictions."""
+
+class MemoryCache(CacheBackend):
+    # In-process LRU with per-entry expiry; expired entries are dropped when read
+    # or when they reach the LRU end
+
+    def __init__(self, max_entries: int = 1024, clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self.clock = clock
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._counters = dict.fromkeys(("hits", "misses", "evictions", "expirations"), 0)
+
+    async def get(self, key: str) -> Tuple[bool, Any]:
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] <= self.clock():
+            del self._entries[key]
+            self._counters["expirations"] += 1
+            entry = None
+        if entry is None:
+            self._counters["misses"] += 1
+            return False, None
+        self._entries.move_to_end(key)
+        self._counters["hits"] += 1
+        return True, entry[1]
+
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        self._entries[key] = (self.clock() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            _, (expires, _) = self._entries.popitem(last=False)
+            self._counters["expirations" if expires <= self.clock() else "evictions"] += 1
+
+    async def clear(self) -> None:
+        self._entries.clear()
+        self._counters = dict.fromkeys(self._counters, 0)
+
+    async def stats(self) -> Dict[str, int]:
+        return {**self._counters, "entries": len(self._entries)}
+
+class ResponseCache:
+    # Caches route results under a sha256 of the route and its canonical
+    # payload. Concurrent requests for a key that is being computed wait for
+    # that computation instead of starting their own (single flight). If the
+    # computing request is cancelled, a waiter takes over the computation
+
+    def __init__(self, backend: CacheBackend, ttl: float = 60.0):
+        self.backend = backend
+        self.ttl = ttl
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.coalesced = 0
+
+    @staticmethod
+    def key(route: str, payload: Any) -> str:
+        # Bytes are taken as already canonical (e.g. a float64 array the route
+        # reads); anything else is hashed as sorted compact JSON
+        if not isinstance(payload, bytes):
+            payload = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode()
+        digest = hashlib.sha256(route.encode() + b"\n")
+        digest.update(payload)
+        return digest.hexdigest()
+
+    async def get_or_compute(self, route: str, payload: Any, compute: Callable[[], Any]) -> Any:
+        key = self.key(route, payload)
+        while True:
+            inflight = self._inflight.get(key)
+            if inflight is None:
+                return await self._compute(key, compute)
+            self.coalesced += 1
+            value = await asyncio.shield(inflight)
+            if value is not _RETRY:
+                return value
+
+    async def _compute(self, key: str, compute: Callable[[], Any]) -> Any:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._inflight[key] = future
+        try:
+            found, value = await self.backend.get(key)
+            if not found:
+                # NumPy work runs off the event loop, so identical requests can overlap it
+                value = await loop.run_in_executor(None, compute)
+                await self.backend.set(key, value, self.ttl)
+            future.set_result(value)
+        except asyncio.CancelledError:
+            # Only this request was cancelled; its waiters retry
+            future.set_result(_RETRY)
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Waiters receive the error; nobody may be left to retrieve it
+            future.exception()
+            raise
+        finally:
+            del self._inflight[key]
+        return value
+
+    async def clear(self) -> None:
+        await self.backend.clear()
+        self.coalesced = 0
+
+    async def stats(self) -> Dict[str, int]:
+        return {**await self.backend.stats(), "coalesced": self.coalesced, "inflight": len(self._inflight)}
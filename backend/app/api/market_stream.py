@@ -0,0 +1,211 @@
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from starlette.websockets import WebSocketState
+from typing import Any, Dict, List, Optional
+import asyncio
+import json
+import os
+import threading
+import time
+import numpy as np
+
+router = APIRouter()
+
+# One long-lived engine for every connection, so each client's deltas reflect
+# the market history all clients have streamed. It is created on the first
+# connection: the barn package is imported there, so the rest of the API
+# starts in images that do not install it
+engine = None
+# The engine is not thread-safe; batches from all connections are analyzed
+# in executor threads one at a time
+engine_lock = threading.Lock()
+
+QUEUE_SIZE = int(os.getenv("MARKET_STREAM_QUEUE_SIZE", "64"))
+MAX_BATCH_FRAMES = int(os.getenv("MARKET_STREAM_MAX_BATCH", "256"))
+
+class FrameError(ValueError):
+    pass
+
+@router.websocket("/ws/market-signals")
+async def market_signals(websocket: WebSocket):
+    # Client frames are one signal {"token", "price", "volume", "timestamp"?,
+    # "indicators"?}, a list of them, or columnar arrays of the same fields.
+    # Frames queued while a batch is analyzed are ingested together as the
+    # next batch; a full queue stops reading from the socket, pushing back on
+    # the client. Replies carry only the per-token fields that changed since
+    # this connection's previous reply
+    try:
+        analysis_engine = _get_engine()
+    except ImportError:
+        # 1011: the server cannot serve the request
+        await websocket.close(code=1011)
+        return
+    await websocket.accept()
+    frames: asyncio.Queue = asyncio.Queue(QUEUE_SIZE)
+    reader = asyncio.ensure_future(_read_frames(websocket, frames))
+    sent: Dict[str, Dict[str, Any]] = {}
+    sequence = 0
+    loop = asyncio.get_running_loop()
+    try:
+        while True:
+            batch = [await frames.get()]
+            while len(batch) < MAX_BATCH_FRAMES and not frames.empty():
+                batch.append(frames.get_nowait())
+            closed = None in batch
+            columns = _merge_columns([frame for frame in batch if frame is not None])
+            if columns is not None:
+                # Ingesting a batch is CPU-bound NumPy work; keep it off the
+                # event loop so other connections are still served
+                delta = await loop.run_in_executor(None, _analyze, analysis_engine, columns, sent)
+                if delta:
+                    sequence += 1
+                    await _send(websocket, {"type": "analysis", "sequence": sequence, "tokens": delta})
+            if closed:
+                break
+    except WebSocketDisconnect:
+        pass
+    finally:
+        reader.cancel()
+        await asyncio.gather(reader, return_exceptions=True)
+
+def _get_engine():
+    global engine
+    if engine is None:
+        from barn.core.engine import TokenAnalysisEngine
+        engine = TokenAnalysisEngine({
+            "market_window_size": int(os.getenv("MARKET_WINDOW_SIZE", "100"))
+        })
+    return engine
+
+async def _send(websocket: WebSocket, message: Dict[str, Any]) -> None:
+    try:
+        await websocket.send_text(json.dumps(message))
+    except RuntimeError:
+        # Starlette raises RuntimeError for a send on a socket that has
+        # closed; anything else is a real error
+        if websocket.client_state == WebSocketState.CONNECTED and websocket.application_state == WebSocketState.CONNECTED:
+            raise
+        raise WebSocketDisconnect(1006)
+
+async def _read_frames(websocket: WebSocket, frames: asyncio.Queue) -> None:
+    try:
+        while True:
+            message = await websocket.receive_text()
+            try:
+                columns = _parse_frame(message)
+            except FrameError as e:
+                await _send(websocket, {"type": "error", "detail": str(e)})
+                continue
+            await frames.put(columns)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        # None tells the batching loop the client is gone. Never wait for
+        # room: the loop may have exited already, leaving nobody to make it.
+        # A full queue gives up its oldest frame instead, whose reply could
+        # not reach the departed client anyway
+        if frames.full():
+            frames.get_nowait()
+        frames.put_nowait(None)
+
+def _parse_frame(message: str) -> Dict[str, Any]:
+    try:
+        frame = json.loads(message)
+    except ValueError:
+        raise FrameError("Frame is not valid JSON")
+    if isinstance(frame, dict) and isinstance(frame.get("token"), list):
+        signals = None
+    elif isinstance(frame, (dict, list)):
+        signals = [frame] if isinstance(frame, dict) else frame
+        if not all(isinstance(signal, dict) for signal in signals):
+            raise FrameError("Signals must be JSON objects")
+    else:
+        raise FrameError("Frame must be a signal, a list of signals or columnar arrays")
+
+    try:
+        columns = frame if signals is None else _signals_to_columns(signals)
+        if not isinstance(columns.get("indicators") or {}, dict):
+            raise FrameError("Indicators must be an object of name to values")
+        count = len(columns["token"])
+        if not all(isinstance(token, str) for token in columns["token"]):
+            raise TypeError("token")
+        parsed = {
+            "token": np.asarray(columns["token"], dtype=str),
+            "price": np.asarray(columns["price"], dtype=np.float64),
+            "volume": np.asarray(columns["volume"], dtype=np.float64),
+            "timestamp": np.asarray(
+                [time.time() if t is None else t for t in columns.get("timestamp") or [None] * count],
+                dtype=np.float64
+            ),
+            "indicators": {
+                name: np.asarray([np.nan if v is None else v for v in values], dtype=np.float64)
+                for name, values in (columns.get("indicators") or {}).items()
+            }
+        }
+    except FrameError:
+        raise
+    except (KeyError, TypeError, ValueError):
+        raise FrameError("Signals need a token, a numeric price and volume")
+    if any(len(parsed[name]) != count for name in ("price", "volume", "timestamp")) or any(
+        len(values) != count for values in parsed["indicators"].values()
+    ):
+        raise FrameError("Columnar arrays must have equal lengths")
+    return parsed
+
+def _signals_to_columns(signals: List[Dict[str, Any]]) -> Dict[str, Any]:
+    indicators: Dict[str, List[Optional[float]]] = {}
+    for i, signal in enumerate(signals):
+        if not isinstance(signal.get("indicators") or {}, dict):
+            raise FrameError("Indicators must be an object of name to values")
+        for name, value in (signal.get("indicators") or {}).items():
+            indicators.setdefault(name, [None] * len(signals))[i] = value
+    return {
+        "token": [signal.get("token") for signal in signals],
+        "price": [signal.get("price") for signal in signals],
+        "volume": [signal.get("volume") for signal in signals],
+        "timestamp": [signal.get("timestamp") for signal in signals],
+        "indicators": indicators
+    }
+
+def _merge_columns(frames: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    if not frames:
+        return None
+    if len(frames) == 1:
+        return frames[0]
+    names = {name for frame in frames for name in frame["indicators"]}
+    return {
+        **{field: np.concatenate([frame[field] for frame in frames]) for field in ("token", "price", "volume", "timestamp")},
+        "indicators": {
+            name: np.concatenate([
+                frame["indicators"].get(name, np.full(len(frame["token"]), np.nan)) for frame in frames
+            ])
+            for name in names
+        }
+    }
+
+def _analyze(analysis_engine, columns: Dict[str, Any], sent: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    with engine_lock:
+        tokens = analysis_engine.ingest(columns)
+        return _delta(analysis_engine, tokens, sent)
+
+def _delta(analysis_engine, tokens: List[str], sent: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    delta = {}
+    for token in tokens:
+        analysis = analysis_engine.token_analysis(token)
+        signal = analysis["trading_signal"]
+        current = {
+            **analysis["risk_analysis"],
+            **analysis["token_metrics"],
+            "signal": signal["action"] if signal else None,
+            "signal_confidence": signal["confidence"] if signal else None
+        }
+        # Missing indicator values are NaN in the engine; send them as null
+        current = {key: None if value != value else value for key, value in current.items()}
+        previous = sent.get(token)
+        if previous is None:
+            changed = current
+        else:
+            changed = {key: value for key, value in current.items() if key not in previous or previous[key] != value}
+        if changed:
+            delta[token] = changed
+            sent[token] = current
+    return delta
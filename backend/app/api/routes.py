@@ -1,12 +1,42 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
 from app.ai import risk_assessment, trading_agents, portfolio_optimization
-from typing import Dict, List
+from app.api.cache import MemoryCache, ResponseCache
+from typing import Any, Dict, Iterator, List, Tuple
+import itertools
+import json
+import os
+import numpy as np
 
 router = APIRouter()
 
+response_cache = ResponseCache(
+    MemoryCache(max_entries=int(os.getenv("CACHE_MAX_ENTRIES", "1024"))),
+    ttl=float(os.getenv("CACHE_TTL_SECONDS", "60"))
+)
+
+MSGPACK_TYPES = ("application/msgpack", "application/x-msgpack")
+BULK_METRICS = ("volatility", "sharpe_ratio", "risk_score")
+
 @router.post("/risk-assessment")
 async def get_risk_assessment(token_data: List[Dict[str, float]]):
-    return risk_assessment.assess_risk(token_data)
+    # Only the prices feed the assessment, and their float64 bytes hash far
+    # faster than re-encoding thousands of dicts as JSON
+    prices = np.array([data['price'] for data in token_data], dtype=np.float64)
+    return await response_cache.get_or_compute(
+        "/risk-assessment", prices.tobytes(), lambda: risk_assessment.assess_risk(token_data)
+    )
+
+@router.post("/risk-assessment/bulk")
+async def get_bulk_risk_assessment(request: Request):
+    # Columnar body {"tokens": [...], "prices": [[...], ...]} as JSON or msgpack;
+    # msgpack series may also be raw little-endian float64 bytes. Answered as
+    # NDJSON, one line per token in request order
+    tokens, prices, offsets = _decode_bulk_body(
+        await request.body(), request.headers.get("content-type", "application/json")
+    )
+    metrics = risk_assessment.assess_risk_many(prices, offsets)
+    return StreamingResponse(_ndjson_lines(tokens, metrics), media_type="application/x-ndjson")
 
 @router.post("/execute-trade")
 async def execute_trade(token: str, amount: float, action: str):
@@ -16,5 +46,73 @@ async def execute_trade(token: str, amount: float, action: str):
 async def optimize_portfolio(portfolio: Dict[str, float], risk_tolerance: float):
     if risk_tolerance < 0 or risk_tolerance > 1:
         raise HTTPException(status_code=400, detail="Risk tolerance must be between 0 and 1")
-    return portfolio_optimization.optimize_portfolio(portfolio, risk_tolerance)
+    return await response_cache.get_or_compute(
+        "/optimize-portfolio",
+        {"portfolio": portfolio, "risk_tolerance": risk_tolerance},
+        lambda: portfolio_optimization.optimize_portfolio(portfolio, risk_tolerance)
+    )
+
+@router.get("/cache/stats")
+async def get_cache_stats():
+    return await response_cache.stats()
+
+def _decode_bulk_body(body: bytes, content_type: str) -> Tuple[List[str], np.ndarray, np.ndarray]:
+    media_type = content_type.split(";")[0].strip().lower()
+    if media_type in MSGPACK_TYPES:
+        try:
+            import msgpack
+        except ImportError:
+            raise HTTPException(status_code=415, detail="msgpack bodies need the msgpack package installed")
+        try:
+            payload = msgpack.unpackb(body, raw=False)
+        except Exception:
+            raise HTTPException(status_code=400, detail="Malformed msgpack body")
+    elif media_type == "application/json":
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Malformed JSON body")
+    else:
+        raise HTTPException(status_code=415, detail=f"Unsupported content type {media_type}")
+
+    if not isinstance(payload, dict) or "tokens" not in payload or "prices" not in payload:
+        raise HTTPException(status_code=400, detail="Body needs 'tokens' and 'prices'")
+    tokens, series = payload["tokens"], payload["prices"]
+    if not isinstance(tokens, list) or not isinstance(series, list) or len(tokens) != len(series):
+        raise HTTPException(status_code=400, detail="'tokens' and 'prices' must be lists of equal length")
+    if not tokens:
+        return [], np.empty(0), np.zeros(1, dtype=np.int64)
+
+    lengths, prices = _flatten_series(series)
+    if min(lengths) < 2:
+        raise HTTPException(status_code=400, detail="Every series needs at least two prices")
+    return tokens, prices, np.concatenate([[0], np.cumsum(lengths)])
+
+def _flatten_series(series: List[Any]) -> Tuple[List[int], np.ndarray]:
+    # Series are all float64 bytes or all number arrays; iterating a bytes
+    # series as a list would read its raw bytes as prices
+    try:
+        if all(isinstance(values, bytes) for values in series):
+            if any(len(values) % 8 for values in series):
+                raise ValueError("partial float64")
+            lengths = [len(values) // 8 for values in series]
+            return lengths, np.frombuffer(b"".join(series), dtype="<f8")
+        if all(isinstance(values, list) for values in series):
+            lengths = [len(values) for values in series]
+            return lengths, np.fromiter(itertools.chain.from_iterable(series), dtype=np.float64, count=sum(lengths))
+    except (TypeError, ValueError):
+        pass
+    raise HTTPException(
+        status_code=400,
+        detail="Prices must be all arrays of numbers or all float64 bytes"
+    )
 
+def _ndjson_lines(tokens: List[str], metrics: Dict[str, np.ndarray], batch_size: int = 1000) -> Iterator[str]:
+    columns = [metrics[name].tolist() for name in BULK_METRICS]
+    for start in range(0, len(tokens), batch_size):
+        stop = start + batch_size
+        rows = zip(tokens[start:stop], *(column[start:stop] for column in columns))
+        yield "".join(
+            json.dumps({"token": token, **dict(zip(BULK_METRICS, values))}) + "\n"
+            for token, *values in rows
+        )
@@ -0,0 +1,41 @@
+from sqlalchemy import select
+from sqlalchemy.engine import Engine
+from typing import Any, Dict, List, Optional
+import asyncio
+import functools
+
+def time_range(
+    engine: Engine,
+    model: Any,
+    token: str,
+    start: float,
+    end: float,
+    limit: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    # Rows of a time-series model (Tick, RiskMetricRecord, Trade) for one token
+    # with start <= timestamp < end (epoch seconds), oldest first. Served by
+    # the (token, timestamp) index
+    table = model.__table__
+    query = (
+        select(table)
+        .where(table.c.token == token, table.c.timestamp >= start, table.c.timestamp < end)
+        .order_by(table.c.timestamp)
+    )
+    if limit is not None:
+        query = query.limit(limit)
+    with engine.connect() as connection:
+        return [dict(row._mapping) for row in connection.execute(query)]
+
+async def time_range_async(
+    engine: Engine,
+    model: Any,
+    token: str,
+    start: float,
+    end: float,
+    limit: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    # time_range on the default thread pool, keeping the event loop free
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        None, functools.partial(time_range, engine, model, token, start, end, limit)
+    )
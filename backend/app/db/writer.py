@@ -0,0 +1,114 @@
+from sqlalchemy import Table
+from sqlalchemy.engine import Engine
+from typing import Any, Dict, Iterable, List, Optional, Union
+import logging
+import threading
+import time
+
+class BatchWriter:
+    # Write-behind buffer for time-series rows. add() only appends to an
+    # in-memory buffer, so it is safe to call from the event loop; a
+    # background thread writes everything buffered in one transaction (one
+    # executemany per table) once batch_size rows are waiting or
+    # flush_interval seconds have passed. add() blocks only when max_pending
+    # rows are already waiting, pushing back on producers that outrun the
+    # database. A failed batch is logged and counted as dropped
+
+    def __init__(
+        self,
+        engine: Engine,
+        batch_size: int = 1000,
+        flush_interval: float = 1.0,
+        max_pending: Optional[int] = None
+    ):
+        self.engine = engine
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending or 10 * batch_size
+        self.logger = logging.getLogger("barn.db.writer")
+        self.stats = dict.fromkeys(("rows_written", "flushes", "rows_dropped"), 0)
+        self._buffers: Dict[Table, List[Dict[str, Any]]] = {}
+        self._pending = 0
+        self._writing = 0
+        self._flush_requested = False
+        self._closed = False
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="barn-db-writer", daemon=True)
+        self._thread.start()
+
+    def __enter__(self) -> "BatchWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def add(self, table: Union[Table, Any], row: Dict[str, Any]) -> None:
+        self.add_many(table, (row,))
+
+    def add_many(self, table: Union[Table, Any], rows: Iterable[Dict[str, Any]]) -> None:
+        # table may be a Table or a mapped model class
+        table = getattr(table, "__table__", table)
+        rows = list(rows)
+        with self._condition:
+            while not self._closed and self._pending >= self.max_pending:
+                self._condition.wait()
+            if self._closed:
+                raise RuntimeError("writer is closed")
+            self._buffers.setdefault(table, []).extend(rows)
+            self._pending += len(rows)
+            if self._pending >= self.batch_size:
+                self._condition.notify_all()
+
+    def flush(self) -> None:
+        # Block until every row added so far has been written (or dropped)
+        with self._condition:
+            self._flush_requested = True
+            self._condition.notify_all()
+            while self._pending or self._writing:
+                self._condition.wait()
+
+    def close(self) -> None:
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join()
+
+    def _run(self) -> None:
+        deadline = time.monotonic() + self.flush_interval
+        while True:
+            with self._condition:
+                while (
+                    not self._closed
+                    and self._pending < self.batch_size
+                    and not (self._pending and self._flush_requested)
+                ):
+                    timeout = deadline - time.monotonic()
+                    if timeout <= 0:
+                        break
+                    self._condition.wait(timeout)
+                buffers, self._buffers = self._buffers, {}
+                count, self._pending = self._pending, 0
+                self._writing = count
+                self._flush_requested = False
+                closed = self._closed
+                self._condition.notify_all()
+            if count:
+                self._write(buffers, count)
+            deadline = time.monotonic() + self.flush_interval
+            with self._condition:
+                self._writing = 0
+                self._condition.notify_all()
+                if closed and not self._pending:
+                    return
+
+    def _write(self, buffers: Dict[Table, List[Dict[str, Any]]], count: int) -> None:
+        try:
+            with self.engine.begin() as connection:
+                for table, rows in buffers.items():
+                    connection.execute(table.insert(), rows)
+        except Exception:
+            self.logger.exception(f"Dropped a batch of {count} rows")
+            self.stats["rows_dropped"] += count
+            return
+        self.stats["rows_written"] += count
+        self.stats["flushes"] += 1
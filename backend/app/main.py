@@ -1,6 +1,6 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.api import routes
+from app.api import routes, market_stream
 
 app = FastAPI(title="Barn System API")
 
@@ -13,6 +13,7 @@ app.add_middleware(
 )
 
 app.include_router(routes.router)
+app.include_router(market_stream.router)
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,82 @@
+from sqlalchemy import Column, Float, Index, Integer, JSON, String
+from app.db.database import Base
+from datetime import datetime
+from typing import Any, Dict, Optional
+import numpy as np
+
+# Timestamps are stored as float epoch seconds, the unit TokenAnalysisEngine
+# keeps internally; (token, timestamp) indexes serve the time-range queries
+
+class Tick(Base):
+    __tablename__ = "ticks"
+    __table_args__ = (Index("ix_ticks_token_timestamp", "token", "timestamp"),)
+
+    id = Column(Integer, primary_key=True)
+    token = Column(String, nullable=False)
+    timestamp = Column(Float, nullable=False)
+    price = Column(Float, nullable=False)
+    volume = Column(Float, nullable=False)
+    indicators = Column(JSON)
+
+class RiskMetricRecord(Base):
+    __tablename__ = "risk_metrics"
+    __table_args__ = (Index("ix_risk_metrics_token_timestamp", "token", "timestamp"),)
+
+    id = Column(Integer, primary_key=True)
+    token = Column(String, nullable=False)
+    timestamp = Column(Float, nullable=False)
+    volatility = Column(Float)
+    var = Column(Float)
+    expected_shortfall = Column(Float)
+    liquidity_score = Column(Float)
+
+class Trade(Base):
+    __tablename__ = "trades"
+    __table_args__ = (Index("ix_trades_token_timestamp", "token", "timestamp"),)
+
+    id = Column(Integer, primary_key=True)
+    transaction_id = Column(String, index=True)
+    token = Column(String)
+    timestamp = Column(Float, nullable=False)
+    action = Column(String, nullable=False)
+    size = Column(Float, nullable=False)
+    status = Column(String)
+
+def epoch_seconds(value: Any) -> float:
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, np.datetime64):
+        return value.astype("datetime64[ns]").astype(np.int64) / 1e9
+    return float(value)
+
+def tick_row(signal: Any) -> Dict[str, Any]:
+    # From a barn MarketSignal
+    return {
+        "token": signal.token,
+        "timestamp": epoch_seconds(signal.timestamp),
+        "price": float(signal.price),
+        "volume": float(signal.volume),
+        "indicators": dict(signal.indicators) or None
+    }
+
+def risk_metric_row(metrics: Any) -> Dict[str, Any]:
+    # From a barn RiskMetrics
+    return {
+        "token": metrics.token,
+        "timestamp": epoch_seconds(metrics.timestamp),
+        "volatility": float(metrics.volatility),
+        "var": float(metrics.var),
+        "expected_shortfall": float(metrics.expected_shortfall),
+        "liquidity_score": float(metrics.liquidity_score)
+    }
+
+def trade_row(trade: Dict[str, Any], token: Optional[str] = None) -> Dict[str, Any]:
+    # From an entry of TradingAgent.trades_history, which does not name the token
+    return {
+        "transaction_id": trade.get("transaction_id"),
+        "token": token if token is not None else trade.get("token"),
+        "timestamp": epoch_seconds(trade["timestamp"]),
+        "action": trade["action"],
+        "size": float(trade["size"]),
+        "status": trade.get("status")
+    }
@@ -0,0 +1,79 @@
+import json
+import numpy as np
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from app.main import app
+from app.ai import risk_assessment
+from app.api import routes
+
+client = TestClient(app)
+
+def make_series(lengths, seed=0):
+    rng = np.random.default_rng(seed)
+    return [list(100 * np.cumprod(1 + rng.normal(0, 0.01, n))) for n in lengths]
+
+def read_ndjson(response):
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    return [json.loads(line) for line in response.text.splitlines()]
+
+def test_assess_risk_many_matches_assess_risk():
+    series = make_series([2, 3, 10, 250, 7])
+    offsets = np.cumsum([0] + [len(s) for s in series])
+    
+    result = risk_assessment.assess_risk_many(np.concatenate(series), offsets)
+    
+    for i, prices in enumerate(series):
+        expected = risk_assessment.assess_risk([{'price': p} for p in prices])
+        for metric, value in expected.items():
+            assert result[metric][i] == pytest.approx(value, rel=1e-9, abs=1e-15)
+
+def test_bulk_json_streams_one_line_per_token():
+    series = make_series([5, 40, 3])
+    response = client.post("/risk-assessment/bulk", json={"tokens": ["A", "B", "C"], "prices": series})
+    
+    assert response.status_code == 200
+    rows = read_ndjson(response)
+    assert [row["token"] for row in rows] == ["A", "B", "C"]
+    single = client.post("/risk-assessment", json=[{"price": p} for p in series[1]]).json()
+    assert rows[1]["volatility"] == pytest.approx(single["volatility"])
+    assert rows[1]["risk_score"] == pytest.approx(single["risk_score"])
+
+def test_bulk_msgpack_accepts_lists_and_float64_bytes():
+    msgpack = pytest.importorskip("msgpack")
+    series = make_series([6, 12])
+    as_lists = msgpack.packb({"tokens": ["A", "B"], "prices": series})
+    as_bytes = msgpack.packb({
+        "tokens": ["A", "B"],
+        "prices": [np.asarray(s, dtype="<f8").tobytes() for s in series]
+    })
+    
+    responses = [
+        client.post("/risk-assessment/bulk", content=body, headers={"content-type": "application/msgpack"})
+        for body in (as_lists, as_bytes)
+    ]
+    
+    assert read_ndjson(responses[0]) == read_ndjson(responses[1])
+
+@pytest.mark.parametrize("body, content_type, status", [
+    (b'{"tokens": ["A"]}', "application/json", 400),
+    (b'{"tokens": ["A"], "prices": [[100.0]]}', "application/json", 400),
+    (b'{"tokens": ["A", "B"], "prices": [[1.0, 2.0]]}', "application/json", 400),
+    (b'{"tokens": ["A"], "prices": [["x", 2.0]]}', "application/json", 400),
+    (b'{"tokens": ["A"], "prices": ["12345"]}', "application/json", 400),
+    (b'not json', "application/json", 400),
+    (b'tokens=A', "text/plain", 415)
+])
+def test_bulk_rejects_bad_bodies(body, content_type, status):
+    response = client.post("/risk-assessment/bulk", content=body, headers={"content-type": content_type})
+    assert response.status_code == status
+
+def test_mixed_bytes_and_list_series_are_rejected():
+    series = [[100.0, 101.0], np.array([100.0, 99.0], dtype="<f8").tobytes()]
+    with pytest.raises(HTTPException) as error:
+        routes._flatten_series(series)
+    assert error.value.status_code == 400
+
+def test_bulk_empty_request():
+    response = client.post("/risk-assessment/bulk", json={"tokens": [], "prices": []})
+    assert response.status_code == 200 and response.text == ""
@@ -0,0 +1,111 @@
+import asyncio
+import time
+from fastapi.testclient import TestClient
+from app.main import app
+from app.api.cache import MemoryCache, ResponseCache
+from app.api.routes import response_cache
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self):
+        return self.now
+
+def test_keys_ignore_key_order_but_not_route():
+    a = ResponseCache.key("/optimize-portfolio", {"portfolio": {"BTC": 1.0, "ETH": 2.0}, "risk_tolerance": 0.5})
+    b = ResponseCache.key("/optimize-portfolio", {"risk_tolerance": 0.5, "portfolio": {"ETH": 2.0, "BTC": 1.0}})
+    
+    assert a == b and len(a) == 64
+    assert a != ResponseCache.key("/risk-assessment", {"portfolio": {"BTC": 1.0, "ETH": 2.0}, "risk_tolerance": 0.5})
+
+def test_memory_cache_lru_and_ttl():
+    async def scenario():
+        clock = FakeClock()
+        cache = MemoryCache(max_entries=2, clock=clock)
+        await cache.set("a", 1, ttl=10)
+        await cache.set("b", 2, ttl=10)
+        assert await cache.get("a") == (True, 1)
+        await cache.set("c", 3, ttl=10)  # evicts b, the least recently used
+        assert await cache.get("b") == (False, None)
+        clock.now = 11
+        assert await cache.get("a") == (False, None)
+        return await cache.stats()
+    
+    stats = asyncio.run(scenario())
+    
+    assert stats == {"hits": 1, "misses": 2, "evictions": 1, "expirations": 1, "entries": 1}
+
+def test_concurrent_identical_requests_compute_once():
+    calls = []
+    
+    def compute():
+        calls.append(1)
+        time.sleep(0.05)
+        return {"value": len(calls)}
+    
+    async def scenario():
+        cache = ResponseCache(MemoryCache(), ttl=60)
+        results = await asyncio.gather(*(cache.get_or_compute("/r", {"x": 1}, compute) for _ in range(5)))
+        again = await cache.get_or_compute("/r", {"x": 1}, compute)
+        return results, again, await cache.stats()
+    
+    results, again, stats = asyncio.run(scenario())
+    
+    assert len(calls) == 1
+    assert results == [{"value": 1}] * 5 and again == {"value": 1}
+    assert stats["coalesced"] == 4 and stats["hits"] == 1 and stats["inflight"] == 0
+
+def test_failures_reach_waiters_and_are_not_cached():
+    def compute():
+        time.sleep(0.02)
+        raise RuntimeError("solver failed")
+    
+    async def scenario():
+        cache = ResponseCache(MemoryCache(), ttl=60)
+        results = await asyncio.gather(
+            *(cache.get_or_compute("/r", {}, compute) for _ in range(3)), return_exceptions=True
+        )
+        return results, await cache.get_or_compute("/r", {}, lambda: "recovered")
+    
+    results, recovered = asyncio.run(scenario())
+    
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert recovered == "recovered"
+
+def test_waiters_take_over_when_the_computing_request_is_cancelled():
+    calls = []
+    
+    def compute():
+        calls.append(1)
+        time.sleep(0.05)
+        return len(calls)
+    
+    async def scenario():
+        cache = ResponseCache(MemoryCache(), ttl=60)
+        leader = asyncio.ensure_future(cache.get_or_compute("/r", {}, compute))
+        await asyncio.sleep(0.01)
+        waiters = [asyncio.ensure_future(cache.get_or_compute("/r", {}, compute)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        return await asyncio.gather(*waiters), leader.cancelled()
+    
+    results, cancelled = asyncio.run(scenario())
+    
+    assert cancelled
+    # One waiter recomputed; the others coalesced onto it
+    assert results == [2, 2, 2] and len(calls) == 2
+
+def test_routes_serve_repeats_from_cache():
+    client = TestClient(app)
+    asyncio.run(response_cache.clear())
+    portfolio = {"BTC": 1.0, "ETH": 2.0}
+    
+    first = client.post("/optimize-portfolio", params={"risk_tolerance": 0.5}, json=portfolio).json()
+    second = client.post("/optimize-portfolio", params={"risk_tolerance": 0.5}, json=portfolio).json()
+    client.post("/risk-assessment", json=[{"price": 100}, {"price": 101}, {"price": 99}])
+    stats = client.get("/cache/stats").json()
+    
+    # optimize_portfolio is randomized, so equal answers mean the second came from the cache
+    assert first == second
+    assert stats["hits"] == 1 and stats["misses"] == 2 and stats["entries"] == 2
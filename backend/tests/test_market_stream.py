@@ -0,0 +1,129 @@
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import pytest
+from fastapi import WebSocketDisconnect
+from fastapi.testclient import TestClient
+from app.main import app
+from app.api import market_stream
+from barn.core.engine import TokenAnalysisEngine
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(market_stream, "engine", TokenAnalysisEngine({"market_window_size": 50}))
+    return TestClient(app)
+
+def receive(websocket):
+    return json.loads(websocket.receive_text())
+
+def test_first_reply_has_full_analysis_then_only_changes(client):
+    with client.websocket_connect("/ws/market-signals") as websocket:
+        websocket.send_text(json.dumps({"token": "BTC", "price": 100.0, "volume": 10.0, "indicators": {"rsi": 55.0}}))
+        first = receive(websocket)
+        websocket.send_text(json.dumps({"token": "BTC", "price": 101.0, "volume": 10.0, "indicators": {"rsi": 55.0}}))
+        second = receive(websocket)
+    
+    assert first["type"] == "analysis" and first["sequence"] == 1
+    btc = first["tokens"]["BTC"]
+    assert btc["current_price"] == 100.0 and btc["rsi"] == 55.0 and "risk_score" in btc
+    changed = second["tokens"]["BTC"]
+    assert changed["current_price"] == 101.0
+    assert "rsi" not in changed and "current_volume" not in changed
+
+def test_list_and_columnar_frames(client):
+    with client.websocket_connect("/ws/market-signals") as websocket:
+        websocket.send_text(json.dumps([
+            {"token": "BTC", "price": 100.0, "volume": 1.0, "timestamp": 1.0},
+            {"token": "ETH", "price": 10.0, "volume": 5.0, "timestamp": 1.0}
+        ]))
+        listed = receive(websocket)
+        websocket.send_text(json.dumps({"token": ["ETH", "ETH"], "price": [11.0, 12.0], "volume": [5.0, 6.0]}))
+        columnar = receive(websocket)
+    
+    assert set(listed["tokens"]) == {"BTC", "ETH"}
+    assert set(columnar["tokens"]) == {"ETH"}
+    assert columnar["tokens"]["ETH"]["current_price"] == 12.0
+
+def test_engine_is_shared_across_connections(client):
+    with client.websocket_connect("/ws/market-signals") as first:
+        for price in (100.0, 110.0, 99.0):
+            first.send_text(json.dumps({"token": "SOL", "price": price, "volume": 1.0}))
+            receive(first)
+    with client.websocket_connect("/ws/market-signals") as second:
+        second.send_text(json.dumps({"token": "SOL", "price": 105.0, "volume": 1.0}))
+        reply = receive(second)["tokens"]["SOL"]
+    
+    # The new connection's volatility spans ticks streamed by the first one
+    assert reply["price_volatility"] > 0
+    assert len(market_stream.engine._market_state["SOL"]) == 4
+
+@pytest.mark.parametrize("frame", [
+    "not json",
+    json.dumps(42),
+    json.dumps({"token": "BTC", "price": "high", "volume": 1.0}),
+    json.dumps({"token": ["BTC", "ETH"], "price": [1.0], "volume": [1.0, 2.0]}),
+    json.dumps({"price": 1.0, "volume": 1.0}),
+    json.dumps({"token": "X", "price": 1.0, "volume": 1.0, "indicators": [1]}),
+    json.dumps({"token": ["X"], "price": [1.0], "volume": [1.0], "indicators": [[1.0]]})
+])
+def test_bad_frames_get_errors_and_keep_the_connection(client, frame):
+    with client.websocket_connect("/ws/market-signals") as websocket:
+        websocket.send_text(frame)
+        error = receive(websocket)
+        websocket.send_text(json.dumps({"token": "BTC", "price": 100.0, "volume": 1.0}))
+        reply = receive(websocket)
+    
+    assert error["type"] == "error"
+    assert reply["type"] == "analysis"
+
+def test_engine_errors_are_not_taken_for_disconnects(client, monkeypatch):
+    class BrokenEngine:
+        def ingest(self, columns):
+            raise RuntimeError("engine failure")
+    monkeypatch.setattr(market_stream, "engine", BrokenEngine())
+    
+    with pytest.raises(RuntimeError, match="engine failure"):
+        with client.websocket_connect("/ws/market-signals") as websocket:
+            websocket.send_text(json.dumps({"token": "BTC", "price": 100.0, "volume": 1.0}))
+            websocket.receive_text()
+
+def test_batches_are_analyzed_off_the_event_loop_under_the_lock(client, monkeypatch):
+    calls = []
+    class RecordingEngine(TokenAnalysisEngine):
+        def ingest(self, columns):
+            try:
+                asyncio.get_running_loop()
+                on_loop = True
+            except RuntimeError:
+                on_loop = False
+            calls.append((on_loop, market_stream.engine_lock.locked()))
+            return super().ingest(columns)
+    monkeypatch.setattr(market_stream, "engine", RecordingEngine({"market_window_size": 50}))
+    
+    with client.websocket_connect("/ws/market-signals") as websocket:
+        websocket.send_text(json.dumps({"token": "BTC", "price": 100.0, "volume": 1.0}))
+        reply = receive(websocket)
+    
+    assert reply["tokens"]["BTC"]["current_price"] == 100.0
+    assert calls == [(False, True)]
+
+def test_reader_ends_on_a_full_queue_without_a_consumer():
+    class ClosedSocket:
+        async def receive_text(self):
+            raise WebSocketDisconnect(1000)
+    
+    async def run():
+        frames = asyncio.Queue(1)
+        frames.put_nowait({"token": []})
+        await asyncio.wait_for(market_stream._read_frames(ClosedSocket(), frames), 1)
+        return frames.get_nowait()
+    
+    assert asyncio.run(run()) is None
+
+def test_app_starts_without_the_barn_package():
+    # The backend image installs only requirements.txt
+    code = "import sys, app.main; assert not any(m == 'barn' or m.startswith('barn.') for m in sys.modules)"
+    backend = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+    subprocess.run([sys.executable, "-c", code], cwd=backend, check=True)
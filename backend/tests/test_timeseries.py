@@ -0,0 +1,97 @@
+import asyncio
+import time
+from datetime import datetime, timezone
+import numpy as np
+import pytest
+from sqlalchemy import text
+from app.db.database import Base, create_db_engine
+from app.db.queries import time_range, time_range_async
+from app.db.writer import BatchWriter
+from app.models.timeseries import RiskMetricRecord, Tick, Trade, risk_metric_row, tick_row, trade_row
+from barn.core.engine import MarketSignal
+from barn.core.risk_manager import RiskMetrics
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'barn.db'}")
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+def count(engine, table):
+    with engine.connect() as connection:
+        return connection.execute(text(f"SELECT COUNT(*) FROM {table}")).scalar()
+
+def ticks(n, token="BTC", start=0.0):
+    return [
+        {"token": token, "timestamp": start + i, "price": 100.0 + i, "volume": 1.0, "indicators": None}
+        for i in range(n)
+    ]
+
+def test_engine_uses_wal(engine):
+    with engine.connect() as connection:
+        assert connection.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+
+def test_writer_flushes_by_size(engine):
+    with BatchWriter(engine, batch_size=100, flush_interval=60) as writer:
+        writer.add_many(Tick, ticks(250))
+        deadline = time.monotonic() + 2
+        while count(engine, "ticks") < 200 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        # Two full batches went out without waiting for the interval
+        assert count(engine, "ticks") >= 200
+    assert count(engine, "ticks") == 250
+    assert writer.stats["rows_written"] == 250 and writer.stats["rows_dropped"] == 0
+
+def test_writer_flushes_by_time_and_on_demand(engine):
+    with BatchWriter(engine, batch_size=10_000, flush_interval=0.05) as writer:
+        writer.add(Tick, ticks(1)[0])
+        time.sleep(0.3)
+        assert count(engine, "ticks") == 1
+        writer.add_many(Tick, ticks(5, start=10))
+        writer.flush()
+        assert count(engine, "ticks") == 6
+
+def test_failed_batch_is_counted_and_writer_keeps_going(engine):
+    with BatchWriter(engine, batch_size=1000, flush_interval=60) as writer:
+        writer.add(Tick, {"token": None, "timestamp": 0.0, "price": 1.0, "volume": 1.0})
+        writer.flush()
+        writer.add_many(Tick, ticks(3))
+        writer.flush()
+    assert writer.stats["rows_dropped"] == 1 and count(engine, "ticks") == 3
+    with pytest.raises(RuntimeError):
+        writer.add_many(Tick, ticks(1))
+
+def test_domain_objects_round_trip_through_time_range(engine):
+    moment = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    signal = MarketSignal(moment, "ETH", 2500.0, 12.0, {"rsi": 61.0})
+    metrics = RiskMetrics("ETH", 0.04, -0.05, -0.07, 0.9, moment)
+    trade = {"timestamp": np.datetime64("2024-01-01T00:00:00"), "action": "buy", "size": 0.5,
+             "status": "executed", "transaction_id": "tx_0"}
+    
+    with BatchWriter(engine) as writer:
+        writer.add(Tick, tick_row(signal))
+        writer.add(RiskMetricRecord, risk_metric_row(metrics))
+        writer.add(Trade, trade_row(trade, token="ETH"))
+    
+    t = moment.timestamp()
+    (tick,) = time_range(engine, Tick, "ETH", t, t + 1)
+    (risk,) = time_range(engine, RiskMetricRecord, "ETH", t, t + 1)
+    (stored_trade,) = asyncio.run(time_range_async(engine, Trade, "ETH", t, t + 1))
+    assert tick["price"] == 2500.0 and tick["indicators"] == {"rsi": 61.0}
+    assert risk["expected_shortfall"] == -0.07
+    assert stored_trade["transaction_id"] == "tx_0" and stored_trade["timestamp"] == t
+
+def test_time_range_is_indexed_and_bounded(engine):
+    with BatchWriter(engine) as writer:
+        writer.add_many(Tick, ticks(100, "BTC"))
+        writer.add_many(Tick, ticks(100, "ETH"))
+    
+    rows = time_range(engine, Tick, "BTC", 10, 20)
+    assert [row["timestamp"] for row in rows] == [float(i) for i in range(10, 20)]
+    assert len(time_range(engine, Tick, "BTC", 10, 20, limit=3)) == 3
+    with engine.connect() as connection:
+        plan = " ".join(str(row[-1]) for row in connection.execute(text(
+            "EXPLAIN QUERY PLAN SELECT * FROM ticks WHERE token = 'BTC' AND timestamp >= 10 AND timestamp < 20"
+        )))
+    assert "ix_ticks_token_timestamp" in plan
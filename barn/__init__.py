@@ -1,8 +1,5 @@
-from .orchestrator import BarnOrchestrator
-from .agents.base import BaseAgent, AgentPool
-from .agents.risk_analyzer import RiskAnalyzerAgent
-from .agents.trading_agent import TradingAgent
-from .agents.portfolio_manager import PortfolioManagerAgent
+from typing import TYPE_CHECKING
+from . import _lazy
 
 __version__ = "0.1.0"
 
@@ -10,8 +7,32 @@ __all__ = [
     "BarnOrchestrator",
     "BaseAgent",
     "AgentPool",
+    "AgentResult",
     "RiskAnalyzerAgent",
     "TradingAgent",
-    "PortfolioManagerAgent"
+    "PortfolioManagerAgent",
+    "StreamingPipeline",
+    "StreamResult"
 ]
 
+# Submodules are imported on first attribute access (PEP 562) so short-lived
+# workers only pay for the agents they actually use.
+__getattr__, __dir__ = _lazy.attach(__name__, {
+    "BarnOrchestrator": ".orchestrator",
+    "BaseAgent": ".agents.base",
+    "AgentPool": ".agents.base",
+    "AgentResult": ".agents.base",
+    "RiskAnalyzerAgent": ".agents.risk_analyzer",
+    "TradingAgent": ".agents.trading_agent",
+    "PortfolioManagerAgent": ".agents.portfolio_manager",
+    "StreamingPipeline": ".streaming",
+    "StreamResult": ".streaming"
+})
+
+if TYPE_CHECKING:
+    from .orchestrator import BarnOrchestrator
+    from .agents.base import BaseAgent, AgentPool, AgentResult
+    from .agents.risk_analyzer import RiskAnalyzerAgent
+    from .agents.trading_agent import TradingAgent
+    from .agents.portfolio_manager import PortfolioManagerAgent
+    from .streaming import StreamingPipeline, StreamResult
@@ -0,0 +1,26 @@
+"""PEP 562 helpers for deferring submodule imports until first attribute access."""
+import importlib
+from typing import Callable, Dict, List, Tuple
+
+
+def attach(package: str, attributes: Dict[str, str]) -> Tuple[Callable, Callable]:
+    """Build ``__getattr__``/``__dir__`` for a package with lazy attributes
+
+    ``attributes`` maps each public name to the relative module that defines
+    it. The module is imported on first access and the value is cached in
+    the package namespace, so later lookups never reach ``__getattr__``.
+    """
+    namespace = importlib.import_module(package).__dict__
+
+    def __getattr__(name: str):
+        module = attributes.get(name)
+        if module is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(module, package), name)
+        namespace[name] = value
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(namespace) | set(attributes))
+
+    return __getattr__, __dir__
@@ -1,8 +1,54 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import asyncio
+import atexit
+import functools
+import time
+
+EXECUTOR_KINDS = ("inline", "thread", "process")
+
+# Pools shared by every agent, keyed by (kind, max_workers)
+_executors: Dict[Tuple[str, Optional[int]], Executor] = {}
+
+def get_executor(kind: str, max_workers: Optional[int] = None) -> Optional[Executor]:
+    """Shared pool for an executor kind, or None for inline execution."""
+    if kind not in EXECUTOR_KINDS:
+        raise ValueError(f"Unknown executor {kind!r}, expected one of {EXECUTOR_KINDS}")
+    if kind == "inline":
+        return None
+    key = (kind, max_workers)
+    if key not in _executors:
+        pool_class = ThreadPoolExecutor if kind == "thread" else ProcessPoolExecutor
+        _executors[key] = pool_class(max_workers=max_workers)
+    return _executors[key]
+
+def shutdown_executors(wait: bool = True) -> None:
+    """Shut down every shared agent pool; later offloads start new ones."""
+    while _executors:
+        _, executor = _executors.popitem()
+        executor.shutdown(wait=wait)
+
+atexit.register(shutdown_executors)
 
 class BaseAgent(ABC):
-    """Base agent class for all Barn System agents."""
+    """Base agent class for all Barn System agents.
+    
+    ``inputs`` and ``outputs`` name the orchestrator context entries an
+    agent reads and produces; the orchestrator schedules each agent once
+    the agents producing its inputs have finished.
+    
+    ``executor`` declares where CPU-heavy steps passed to ``offload`` run:
+    ``"inline"`` on the event loop, ``"thread"`` or ``"process"`` on a pool
+    shared by all agents. The ``executor`` and ``executor_workers`` config
+    entries override it per agent. Process offloads must pass picklable
+    callables and arguments, such as module-level functions.
+    """
+    
+    inputs: Tuple[str, ...] = ()
+    outputs: Tuple[str, ...] = ()
+    executor: str = "inline"
     
     def __init__(self, name: str, config: Optional[Dict] = None):
         self.name = name
@@ -22,12 +68,39 @@ class BaseAgent(ABC):
     def update_state(self, new_state: Dict[str, Any]) -> None:
         """Update agent's internal state."""
         self.state.update(new_state)
+    
+    def prepare(self, context: Dict[str, Any]) -> None:
+        """Load the declared inputs from the orchestrator context before a run."""
+        self.update_state({key: context[key] for key in self.inputs if key in context})
+    
+    async def offload(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run a CPU-heavy step on the agent's executor without blocking the event loop."""
+        executor = get_executor(self.config.get("executor", self.executor), self.config.get("executor_workers"))
+        if executor is None:
+            return func(*args)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, functools.partial(func, *args))
+
+@dataclass
+class AgentResult:
+    """Outcome of one agent run within a pool."""
+    
+    name: str
+    result: Any = None
+    error: Optional[BaseException] = None
+    latency: float = 0.0
+    
+    @property
+    def ok(self) -> bool:
+        return self.error is None
 
 class AgentPool:
     """Manages a pool of agents for concurrent execution."""
     
-    def __init__(self):
+    def __init__(self, max_concurrency: Optional[int] = None, timeout: Optional[float] = None):
         self.agents: List[BaseAgent] = []
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
         
     def add_agent(self, agent: BaseAgent) -> None:
         """Add an agent to the pool."""
@@ -37,11 +110,36 @@ class AgentPool:
         """Remove an agent from the pool."""
         self.agents = [a for a in self.agents if a.name != agent_name]
         
-    async def run_all(self) -> List[Any]:
-        """Run all agents concurrently."""
-        results = []
-        for agent in self.agents:
-            result = await agent.run()
-            results.append(result)
-        return results
-
+    async def run_all(
+        self,
+        max_concurrency: Optional[int] = None,
+        timeout: Optional[float] = None
+    ) -> List[AgentResult]:
+        """Run all agents concurrently.
+        
+        At most ``max_concurrency`` agents run at once (unbounded by
+        default). Each run is limited to ``timeout`` seconds, or to the
+        agent's own ``timeout`` config entry when set. A failing or timed
+        out agent is recorded in its AgentResult and does not stop the
+        others; results are returned in pool order.
+        """
+        limit = max_concurrency if max_concurrency is not None else self.max_concurrency
+        semaphore = asyncio.Semaphore(limit) if limit else None
+        default_timeout = timeout if timeout is not None else self.timeout
+        
+        async def run_one(agent: BaseAgent) -> AgentResult:
+            if semaphore is None:
+                return await self._run_agent(agent, agent.config.get("timeout", default_timeout))
+            async with semaphore:
+                return await self._run_agent(agent, agent.config.get("timeout", default_timeout))
+        
+        return list(await asyncio.gather(*(run_one(agent) for agent in self.agents)))
+    
+    async def _run_agent(self, agent: BaseAgent, timeout: Optional[float]) -> AgentResult:
+        start = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(agent.run(), timeout)
+        except Exception as e:
+            # Includes asyncio.TimeoutError from an agent over its time limit
+            return AgentResult(agent.name, error=e, latency=time.perf_counter() - start)
+        return AgentResult(agent.name, result=result, latency=time.perf_counter() - start)
@@ -1,32 +1,106 @@
-from typing import Dict, List
-from .base import BaseAgent
+from typing import Dict, List, Optional, Sequence, Tuple
+from .base import BaseAgent, get_executor
+from ..core.parallel import (
+    PortfolioBatchResult,
+    PortfolioRequest,
+    optimize_portfolios,
+    optimize_portfolios_on,
+    rebalancing_trades
+)
+from ..core.solvers import SolverBackend, get_solver
 import numpy as np
-from scipy.optimize import minimize
+
+def optimize_weights(
+    solver: SolverBackend,
+    tokens: List[str],
+    returns_data: np.ndarray,
+    risk_free_rate: float
+) -> Dict[str, float]:
+    """Maximum-Sharpe weights for tokens given their return history (one row each)."""
+    if not tokens:
+        return {}
+        
+    # Calculate expected returns and covariance matrix
+    exp_returns = np.mean(returns_data, axis=1)
+    cov_matrix = np.atleast_2d(np.cov(returns_data))
+    
+    # Maximize the Sharpe ratio with weights in [0, 1] summing to 1
+    n_assets = len(tokens)
+    result = solver.solve(
+        exp_returns,
+        cov_matrix,
+        np.full(n_assets, 1 / n_assets),
+        risk_free_rate=risk_free_rate
+    )
+    
+    return dict(zip(tokens, result.weights))
 
 class PortfolioManagerAgent(BaseAgent):
     """Agent responsible for portfolio optimization and management."""
     
+    inputs = ('market_data',)
+    outputs = ('portfolio_update',)
+    # Typical solves take milliseconds, less than a process round trip; set
+    # the executor config to 'process' for portfolios large enough to block
+    executor = 'inline'
+    
     def __init__(self, name: str, config: Dict = None):
         super().__init__(name, config)
         self.portfolio: Dict[str, float] = {}
         self.historical_returns: Dict[str, List[float]] = {}
+        self.solver = get_solver(self.config.get('solver'), self.config.get('solver_options'))
         
     async def process(self, portfolio_data: Dict) -> Dict:
         """Process portfolio data and optimize allocations."""
         self._update_portfolio_data(portfolio_data)
-        optimal_weights = self._optimize_portfolio()
+        optimal_weights = await self.offload(optimize_weights, *self._optimization_args())
         rebalancing_trades = self._calculate_rebalancing_trades(optimal_weights)
         return {
             "optimal_weights": optimal_weights,
             "rebalancing_trades": rebalancing_trades
         }
     
+    def prepare(self, context: Dict) -> None:
+        """Take holdings and return history from the market update."""
+        market_data = context['market_data']
+        self.update_state({
+            'portfolio_data': {
+                'current_allocation': market_data.get('portfolio', {}),
+                'historical_returns': market_data.get('historical_returns', {})
+            }
+        })
+    
     async def run(self) -> Dict:
         """Run portfolio optimization based on current state."""
         if 'portfolio_data' not in self.state:
             raise ValueError("No portfolio data available in state")
         return await self.process(self.state['portfolio_data'])
     
+    async def optimize_many(
+        self,
+        portfolios: Sequence[PortfolioRequest],
+        historical_returns: Optional[Dict[str, List[float]]] = None
+    ) -> List[PortfolioBatchResult]:
+        """Optimize many portfolios without blocking the event loop.
+        
+        Solves fan out over the shared process pool sized by the
+        ``batch_workers`` config entry; with ``batch_workers`` of 1 the
+        batch runs as one step on the agent's executor instead.
+        """
+        if historical_returns is None:
+            historical_returns = self.historical_returns
+        workers = self.config.get('batch_workers')
+        if workers == 1:
+            return await self.offload(optimize_portfolios, portfolios, historical_returns, self.config, 1)
+        return await optimize_portfolios_on(
+            get_executor('process', workers),
+            portfolios,
+            historical_returns,
+            self.config,
+            workers=workers,
+            chunk_size=self.config.get('batch_chunk_size')
+        )
+    
     def _update_portfolio_data(self, portfolio_data: Dict) -> None:
         """Update portfolio and historical returns data."""
         self.portfolio = portfolio_data.get('current_allocation', {})
@@ -34,54 +108,16 @@ class PortfolioManagerAgent(BaseAgent):
     
     def _optimize_portfolio(self) -> Dict[str, float]:
         """Optimize portfolio weights using mean-variance optimization."""
+        return optimize_weights(*self._optimization_args())
+    
+    def _optimization_args(self) -> Tuple:
+        """Picklable arguments of optimize_weights for the current portfolio."""
         tokens = list(self.portfolio.keys())
-        if not tokens:
-            return {}
-            
-        # Calculate expected returns and covariance matrix
         returns_data = np.array([self.historical_returns[token] for token in tokens])
-        exp_returns = np.mean(returns_data, axis=1)
-        cov_matrix = np.cov(returns_data)
-        
-        # Define optimization constraints
-        n_assets = len(tokens)
-        constraints = [
-            {'type': 'eq', 'fun': lambda x: np.sum(x) - 1}  # weights sum to 1
-        ]
-        bounds = tuple((0, 1) for _ in range(n_assets))  # weights between 0 and 1
-        
-        # Define objective function (negative Sharpe ratio)
-        risk_free_rate = self.config.get('risk_free_rate', 0.01)
-        def objective(weights):
-            portfolio_return = np.sum(exp_returns * weights)
-            portfolio_std = np.sqrt(np.dot(weights.T, np.dot(cov_matrix, weights)))
-            sharpe_ratio = (portfolio_return - risk_free_rate) / portfolio_std
-            return -sharpe_ratio
-        
-        # Run optimization
-        initial_weights = np.array([1/n_assets] * n_assets)
-        result = minimize(objective, initial_weights, method='SLSQP',
-                        constraints=constraints, bounds=bounds)
-        
-        return dict(zip(tokens, result.x))
+        return self.solver, tokens, returns_data, self.config.get('risk_free_rate', 0.01)
     
     def _calculate_rebalancing_trades(self, optimal_weights: Dict[str, float]) -> List[Dict]:
         """Calculate trades needed to rebalance to optimal weights."""
-        trades = []
-        total_value = sum(self.portfolio.values())
-        
-        for token, current_amount in self.portfolio.items():
-            current_weight = current_amount / total_value
-            optimal_weight = optimal_weights.get(token, 0)
-            
-            if abs(current_weight - optimal_weight) > self.config.get('rebalance_threshold', 0.01):
-                target_amount = total_value * optimal_weight
-                trade_amount = target_amount - current_amount
-                trades.append({
-                    "token": token,
-                    "action": "buy" if trade_amount > 0 else "sell",
-                    "amount": abs(trade_amount)
-                })
-                
-        return trades
-
+        return rebalancing_trades(
+            self.portfolio, optimal_weights, self.config.get('rebalance_threshold', 0.01)
+        )
@@ -1,46 +1,105 @@
 import numpy as np
-from typing import Dict, List
+from typing import Callable, Dict, List, Union
 from .base import BaseAgent
+from ..core.sketches import TDigest
+from ..core.tail_risk import tail_risk
 
 class RiskAnalyzerAgent(BaseAgent):
     """Agent responsible for analyzing token risks."""
     
+    inputs = ('market_data',)
+    outputs = ('risk_analysis',)
+    # NumPy releases the GIL in the heavy kernels
+    executor = 'thread'
+    
     def __init__(self, name: str, config: Dict = None):
         super().__init__(name, config)
+        # Each metric maps (returns, moments) to values along the last axis
         self.risk_metrics = {
             'volatility': self._calculate_volatility,
             'sharpe_ratio': self._calculate_sharpe_ratio,
-            'value_at_risk': self._calculate_var
+            'value_at_risk': self._calculate_var,
+            'expected_shortfall': self._calculate_expected_shortfall
         }
     
-    async def process(self, price_data: List[float]) -> Dict[str, float]:
-        """Process token price data and return risk metrics."""
-        results = {}
-        for metric_name, metric_func in self.risk_metrics.items():
-            results[metric_name] = metric_func(price_data)
-        return results
+    async def process(
+        self,
+        price_data: Union[List[float], np.ndarray]
+    ) -> Dict[str, Union[float, np.ndarray]]:
+        """Process token price data and return risk metrics.
+        
+        A 1-D price series yields floats; a 2-D (tokens x time) matrix
+        yields one array per metric with a value for each token.
+        """
+        return await self.offload(self.analyze, price_data)
+    
+    def prepare(self, context: Dict) -> None:
+        """Take price data from the market update."""
+        price_data = context['market_data'].get('price_data')
+        if price_data is not None:
+            self.update_state({'price_data': price_data})
     
-    async def run(self) -> Dict[str, float]:
+    async def run(self) -> Dict[str, Union[float, np.ndarray]]:
         """Run risk analysis on current state data."""
         if 'price_data' not in self.state:
             raise ValueError("No price data available in state")
         return await self.process(self.state['price_data'])
     
-    def _calculate_volatility(self, prices: List[float]) -> float:
+    def analyze(self, price_data: Union[List[float], np.ndarray]) -> Dict[str, Union[float, np.ndarray]]:
+        """Compute all registered metrics from a single pass over the returns."""
+        prices = np.asarray(price_data, dtype=np.float64)
+        returns = np.diff(prices, axis=-1) / prices[..., :-1]
+        moments = {
+            'mean': returns.mean(axis=-1),
+            'std': returns.std(axis=-1)
+        } if returns.shape[-1] else {}
+        if moments and self.config.get('quantile_backend', 'exact') == 'tdigest':
+            # Bounded-memory approximate tails for long series
+            compression = self.config.get('tdigest_compression', 200)
+            moments['digests'] = [
+                TDigest(compression).update_many(row)
+                for row in returns.reshape(-1, returns.shape[-1])
+            ]
+        elif moments:
+            moments['sorted'] = np.sort(returns, axis=-1)
+        
+        results = {}
+        for metric_name, metric_func in self.risk_metrics.items():
+            value = metric_func(returns, moments)
+            results[metric_name] = float(value) if prices.ndim == 1 else np.asarray(value)
+        return results
+    
+    def _calculate_volatility(self, returns: np.ndarray, moments: Dict[str, np.ndarray]) -> np.ndarray:
         """Calculate price volatility."""
-        returns = np.diff(prices) / prices[:-1]
-        return float(np.std(returns))
+        return moments['std'] if moments else np.std(returns, axis=-1)
     
-    def _calculate_sharpe_ratio(self, prices: List[float], risk_free_rate: float = 0.01) -> float:
+    def _calculate_sharpe_ratio(self, returns: np.ndarray, moments: Dict[str, np.ndarray]) -> np.ndarray:
         """Calculate Sharpe ratio."""
-        returns = np.diff(prices) / prices[:-1]
-        excess_returns = returns - risk_free_rate
-        if len(excess_returns) == 0:
-            return 0.0
-        return float(np.mean(excess_returns) / np.std(excess_returns))
+        if not moments:
+            return np.zeros(returns.shape[:-1])
+        # Subtracting a constant leaves the standard deviation unchanged
+        risk_free_rate = self.config.get('risk_free_rate', 0.01)
+        return (moments['mean'] - risk_free_rate) / moments['std']
     
-    def _calculate_var(self, prices: List[float], confidence: float = 0.95) -> float:
+    def _calculate_var(self, returns: np.ndarray, moments: Dict[str, np.ndarray]) -> np.ndarray:
         """Calculate Value at Risk."""
-        returns = np.diff(prices) / prices[:-1]
-        return float(np.percentile(returns, (1 - confidence) * 100))
-
+        confidence = self.config.get('var_confidence', 0.95)
+        if not moments:
+            return np.percentile(returns, (1 - confidence) * 100, axis=-1)
+        if 'digests' in moments:
+            return self._from_digests(moments, lambda digest: digest.value_at_risk(confidence))
+        return tail_risk(moments['sorted'], confidence)[0]
+    
+    def _calculate_expected_shortfall(self, returns: np.ndarray, moments: Dict[str, np.ndarray]) -> np.ndarray:
+        """Calculate expected shortfall (mean return at or below VaR)."""
+        if not moments:
+            return np.full(returns.shape[:-1], np.nan)
+        confidence = self.config.get('var_confidence', 0.95)
+        if 'digests' in moments:
+            return self._from_digests(moments, lambda digest: digest.expected_shortfall(confidence))
+        return tail_risk(moments['sorted'], confidence)[1]
+    
+    def _from_digests(self, moments: Dict[str, np.ndarray], read: Callable[[TDigest], float]) -> np.ndarray:
+        """Apply ``read`` to each row's digest, shaped like the other metrics."""
+        values = np.array([read(digest) for digest in moments['digests']])
+        return values.reshape(np.shape(moments['mean']))
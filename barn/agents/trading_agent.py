@@ -1,10 +1,14 @@
 from typing import Dict, List, Optional
 from .base import BaseAgent
-import numpy as np
 
 class TradingAgent(BaseAgent):
     """Agent responsible for executing trades based on risk analysis."""
     
+    inputs = ('risk_analysis',)
+    outputs = ('trade_decision',)
+    # Decisions are cheap; a pool hop would cost more than the work
+    executor = 'inline'
+    
     def __init__(self, name: str, config: Dict = None):
         super().__init__(name, config)
         self.position_size = 0
@@ -19,6 +23,11 @@ class TradingAgent(BaseAgent):
             return trade_result
         return {"action": "hold", "reason": action['reason']}
     
+    def prepare(self, context: Dict) -> None:
+        """Derive trading signals from the risk analysis."""
+        risk_analysis = context['risk_analysis']
+        self.update_state({"signal_data": {"risk_score": risk_analysis.get("risk_score", 1.0)}})
+    
     async def run(self) -> Dict:
         """Run trading logic based on current state."""
         if 'signal_data' not in self.state:
@@ -50,6 +59,9 @@ class TradingAgent(BaseAgent):
     
     async def _execute_trade(self, action: Dict) -> Dict:
         """Execute the trade and return results."""
+        # Imported here so trading-only workers start without NumPy
+        import numpy as np
+        
         # In a real implementation, this would interact with an exchange API
         trade_result = {
             "timestamp": np.datetime64('now'),
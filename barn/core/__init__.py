@@ -1,6 +1,5 @@
-from .engine import TokenAnalysisEngine, MarketSignal
-from .portfolio import PortfolioOptimizer, Position
-from .risk_manager import RiskManager, RiskMetrics
+from typing import TYPE_CHECKING
+from .. import _lazy
 
 __all__ = [
     'TokenAnalysisEngine',
@@ -11,3 +10,16 @@ __all__ = [
     'RiskMetrics'
 ]
 
+__getattr__, __dir__ = _lazy.attach(__name__, {
+    'TokenAnalysisEngine': '.engine',
+    'MarketSignal': '.engine',
+    'PortfolioOptimizer': '.portfolio',
+    'Position': '.portfolio',
+    'RiskManager': '.risk_manager',
+    'RiskMetrics': '.risk_manager'
+})
+
+if TYPE_CHECKING:
+    from .engine import TokenAnalysisEngine, MarketSignal
+    from .portfolio import PortfolioOptimizer, Position
+    from .risk_manager import RiskManager, RiskMetrics
@@ -0,0 +1,190 @@
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+from dataclasses import dataclass, field
+from urllib.parse import quote, unquote
+import json
+import os
+import numpy as np
+
+COLUMNS = ("timestamp", "price", "volume")
+INDEX_FILE = "index.json"
+
+
+@dataclass
+class TickSlice:
+    """A token's ticks in a time range as read-only array views"""
+    token: str
+    timestamps: np.ndarray
+    prices: np.ndarray
+    volumes: np.ndarray
+    indicators: Dict[str, np.ndarray] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+
+class TickArchive:
+    """Append-only columnar tick files per token, read back as memory maps
+
+    Each token has a directory holding one raw little-endian float64 file per
+    column (``timestamp``, ``price``, ``volume`` and one per indicator, NaN
+    where a tick has no value) and an ``index.json`` with the committed tick
+    count, the indicator names and the first/last timestamps. Column data is
+    appended before the index is atomically replaced, so bytes past the
+    indexed count after a crash are ignored and overwritten by the next
+    append. Ticks are kept in timestamp order per token, so a time range is
+    two binary searches over the mapped timestamp column and ``read`` hands
+    out views of the maps: nothing is copied, and only the pages a consumer
+    touches are read from disk.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        # token -> (tick count the maps were opened at, column maps)
+        self._maps: Dict[str, Tuple[int, Dict[str, np.ndarray]]] = {}
+
+    def tokens(self) -> List[str]:
+        return sorted(
+            unquote(name) for name in os.listdir(self.root)
+            if os.path.exists(os.path.join(self.root, name, INDEX_FILE))
+        )
+
+    def index(self, token: str) -> Dict:
+        """The token's index entry (count, indicators, first, last)"""
+        path = os.path.join(self._directory(token), INDEX_FILE)
+        if not os.path.exists(path):
+            return {"count": 0, "indicators": [], "first": None, "last": None}
+        with open(path) as f:
+            return json.load(f)
+
+    def append(
+        self,
+        token: str,
+        timestamps: np.ndarray,
+        prices: np.ndarray,
+        volumes: np.ndarray,
+        indicators: Optional[Mapping[str, np.ndarray]] = None
+    ) -> int:
+        """Append ticks (oldest first, not older than the stored ones); returns the new count"""
+        timestamps = np.asarray(timestamps, dtype="<f8")
+        count = len(timestamps)
+        columns = {
+            "timestamp": timestamps,
+            "price": np.asarray(prices, dtype="<f8"),
+            "volume": np.asarray(volumes, dtype="<f8")
+        }
+        indicators = {name: np.asarray(values, dtype="<f8") for name, values in (indicators or {}).items()}
+        if any(len(values) != count for values in (*columns.values(), *indicators.values())):
+            raise ValueError("all columns must have the same length")
+        if not count:
+            return self.index(token)["count"]
+        if np.any(np.diff(timestamps) < 0):
+            raise ValueError("timestamps must be non-decreasing")
+
+        index = self.index(token)
+        stored = index["count"]
+        if stored and timestamps[0] < index["last"]:
+            raise ValueError("ticks must not be older than the last archived tick")
+        directory = self._directory(token)
+        os.makedirs(directory, exist_ok=True)
+
+        names = list(index["indicators"])
+        for name in indicators:
+            if name not in names:
+                # Earlier ticks never reported this indicator
+                self._write(directory, _indicator_file(name), np.full(stored, np.nan), 0)
+                names.append(name)
+        for name in names:
+            columns[_indicator_file(name)] = indicators.get(name, np.full(count, np.nan))
+        for column, values in columns.items():
+            self._write(directory, column, values, stored)
+
+        index = {
+            "count": stored + count,
+            "indicators": names,
+            "first": index["first"] if stored else float(timestamps[0]),
+            "last": float(timestamps[-1])
+        }
+        temporary = os.path.join(directory, INDEX_FILE + ".tmp")
+        with open(temporary, "w") as f:
+            json.dump(index, f)
+        os.replace(temporary, os.path.join(directory, INDEX_FILE))
+        self._maps.pop(token, None)
+        return index["count"]
+
+    def read(
+        self,
+        token: str,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        last: Optional[int] = None
+    ) -> TickSlice:
+        """Ticks with ``start <= timestamp < end``, or only the final ``last`` of them"""
+        maps = self._open(token)
+        timestamps = maps["timestamp"]
+        lo = 0 if start is None else int(np.searchsorted(timestamps, start, side="left"))
+        hi = len(timestamps) if end is None else int(np.searchsorted(timestamps, end, side="left"))
+        if last is not None:
+            lo = max(lo, hi - last)
+        window = slice(lo, max(lo, hi))
+        return TickSlice(
+            token,
+            timestamps[window],
+            maps["price"][window],
+            maps["volume"][window],
+            {name: maps[_indicator_file(name)][window] for name in self.index(token)["indicators"]}
+        )
+
+    def warm_engine(
+        self,
+        engine,
+        tokens: Optional[Iterable[str]] = None,
+        end: Optional[float] = None
+    ) -> None:
+        """Fill a TokenAnalysisEngine with each token's history before ``end``"""
+        for token in tokens if tokens is not None else self.tokens():
+            ticks = self.read(token, end=end)
+            engine.load_history(token, ticks.timestamps, ticks.prices, ticks.volumes, ticks.indicators)
+
+    def warm_optimizer(
+        self,
+        optimizer,
+        tokens: Optional[Iterable[str]] = None,
+        end: Optional[float] = None
+    ) -> None:
+        """Fill a PortfolioOptimizer's price history with each token's ticks before ``end``"""
+        history = {}
+        for token in tokens if tokens is not None else self.tokens():
+            ticks = self.read(token, end=end)
+            history[token] = (ticks.timestamps, ticks.prices)
+        optimizer.load_price_history(history)
+
+    def _directory(self, token: str) -> str:
+        return os.path.join(self.root, quote(token, safe=""))
+
+    def _write(self, directory: str, column: str, values: np.ndarray, stored: int) -> None:
+        path = os.path.join(directory, column + ".f8")
+        with open(path, "ab") as f:
+            # Drop anything a crashed append left past the indexed count
+            f.truncate(stored * 8)
+            f.write(np.ascontiguousarray(values, dtype="<f8").tobytes())
+
+    def _open(self, token: str) -> Dict[str, np.ndarray]:
+        index = self.index(token)
+        count = index["count"]
+        cached = self._maps.get(token)
+        if cached is not None and cached[0] == count:
+            return cached[1]
+        directory = self._directory(token)
+        maps = {}
+        for column in (*COLUMNS, *(_indicator_file(name) for name in index["indicators"])):
+            if count:
+                maps[column] = np.memmap(os.path.join(directory, column + ".f8"), dtype="<f8", mode="r", shape=(count,))
+            else:
+                maps[column] = np.empty(0)
+        self._maps[token] = (count, maps)
+        return maps
+
+
+def _indicator_file(name: str) -> str:
+    return "indicator-" + quote(name, safe="")
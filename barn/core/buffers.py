@@ -0,0 +1,146 @@
+from typing import Dict, List, Optional
+import numpy as np
+
+
+class MarketRingBuffer:
+    """Fixed-capacity columnar tick history for a single token
+
+    Every column is backed by an array of twice the capacity and each tick is
+    written to both halves (slot ``i`` and ``i + capacity``). The most recent
+    ``len(self)`` ticks therefore always occupy one contiguous slice, so the
+    ``timestamps``/``prices``/``volumes``/``indicators`` properties are
+    zero-copy views ordered oldest to newest, and an append is O(1).
+    """
+
+    def __init__(self, capacity: int, indicator_names: Optional[List[str]] = None):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self._timestamps = np.zeros(2 * capacity, dtype=np.float64)
+        self._prices = np.zeros(2 * capacity, dtype=np.float64)
+        self._volumes = np.zeros(2 * capacity, dtype=np.float64)
+        self._indicator_index: Dict[str, int] = {}
+        self._indicators = np.full((2 * capacity, 0), np.nan, dtype=np.float64)
+        self._pos = 0
+        self._size = 0
+        for name in indicator_names or []:
+            self._add_indicator(name)
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def is_full(self) -> bool:
+        return self._size == self.capacity
+
+    @property
+    def indicator_names(self) -> List[str]:
+        return list(self._indicator_index)
+
+    def append(
+        self,
+        timestamp: float,
+        price: float,
+        volume: float,
+        indicators: Optional[Dict[str, float]] = None
+    ) -> None:
+        """Write one tick, overwriting the oldest once the buffer is full"""
+        lo = self._pos
+        hi = lo + self.capacity
+        self._timestamps[lo] = self._timestamps[hi] = timestamp
+        self._prices[lo] = self._prices[hi] = price
+        self._volumes[lo] = self._volumes[hi] = volume
+
+        indicators = indicators or {}
+        for name in indicators:
+            if name not in self._indicator_index:
+                self._add_indicator(name)
+        row = self._indicators[lo]
+        if row.size:
+            row.fill(np.nan)
+            for name, value in indicators.items():
+                row[self._indicator_index[name]] = value
+            self._indicators[hi] = row
+
+        self._pos = (lo + 1) % self.capacity
+        if self._size < self.capacity:
+            self._size += 1
+
+    def extend(
+        self,
+        timestamps: np.ndarray,
+        prices: np.ndarray,
+        volumes: np.ndarray,
+        indicators: Optional[Dict[str, np.ndarray]] = None
+    ) -> None:
+        """Write a block of ticks (oldest first) with vectorized stores"""
+        count = len(prices)
+        if not count:
+            return
+        keep = slice(max(count - self.capacity, 0), count)
+        slots = (self._pos + np.arange(count)[keep]) % self.capacity
+        mirror = slots + self.capacity
+
+        for column, values in (
+            (self._timestamps, timestamps),
+            (self._prices, prices),
+            (self._volumes, volumes)
+        ):
+            values = np.asarray(values, dtype=np.float64)[keep]
+            column[slots] = values
+            column[mirror] = values
+
+        indicators = indicators or {}
+        for name in indicators:
+            if name not in self._indicator_index:
+                self._add_indicator(name)
+        if self._indicators.shape[1]:
+            block = np.full((len(slots), self._indicators.shape[1]), np.nan)
+            for name, values in indicators.items():
+                block[:, self._indicator_index[name]] = np.asarray(values, dtype=np.float64)[keep]
+            self._indicators[slots] = block
+            self._indicators[mirror] = block
+
+        self._pos = (self._pos + count) % self.capacity
+        self._size = min(self._size + count, self.capacity)
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        return self._timestamps[self._window()]
+
+    @property
+    def prices(self) -> np.ndarray:
+        return self._prices[self._window()]
+
+    @property
+    def volumes(self) -> np.ndarray:
+        return self._volumes[self._window()]
+
+    @property
+    def indicators(self) -> np.ndarray:
+        """Indicator block of shape (len, n_indicators); NaN marks absent values"""
+        return self._indicators[self._window()]
+
+    def latest_indicators(self) -> Dict[str, float]:
+        """Indicators reported with the most recent tick"""
+        if not self._size:
+            return {}
+        row = self._indicators[self._pos + self.capacity - 1]
+        return {
+            name: float(row[column])
+            for name, column in self._indicator_index.items()
+            if not np.isnan(row[column])
+        }
+
+    def _window(self) -> slice:
+        end = self._pos + self.capacity
+        return slice(end - self._size, end)
+
+    def _add_indicator(self, name: str) -> int:
+        column = len(self._indicator_index)
+        self._indicator_index[name] = column
+        self._indicators = np.concatenate(
+            [self._indicators, np.full((2 * self.capacity, 1), np.nan)],
+            axis=1
+        )
+        return column
@@ -1,8 +1,11 @@
-from typing import Dict, List, Any, Optional
-import asyncio
+from typing import Dict, List, Any, Mapping, Optional, Sequence, Union
 import logging
 from dataclasses import dataclass
 from datetime import datetime
+import numpy as np
+
+from .buffers import MarketRingBuffer
+from .stats import OnlineMarketStats
 
 @dataclass
 class MarketSignal:
@@ -18,155 +21,282 @@ class TokenAnalysisEngine:
     def __init__(self, config: Optional[Dict] = None):
         self.config = config or {}
         self.logger = logging.getLogger("barn.engine")
-        self._market_state: Dict[str, Any] = {}
-        self._risk_metrics: Dict[str, float] = {}
+        self._market_state: Dict[str, MarketRingBuffer] = {}
+        self._market_stats: Dict[str, OnlineMarketStats] = {}
+        # Per-token analysis results, recomputed only for dirty tokens
+        self._dirty_tokens: Dict[str, None] = {}
+        self._risk_cache: Dict[str, Dict[str, float]] = {}
+        self._metrics_cache: Dict[str, Dict[str, float]] = {}
+        self._signal_cache: Dict[str, Optional[Dict[str, Any]]] = {}
         self._last_update: Optional[datetime] = None
         
     async def process_market_signal(self, signal: MarketSignal) -> Dict[str, Any]:
         """Process incoming market signals and generate analysis"""
         self._update_market_state(signal)
+        self._refresh_analysis_batch()
+        return self._analysis_results()
+    
+    async def process_market_signals(
+        self,
+        batch: Union[Sequence[MarketSignal], Mapping[str, Any]]
+    ) -> Dict[str, Any]:
+        """Ingest a burst of signals, then analyze every affected token once
         
-        analysis_tasks = [
-            self._analyze_market_risk(),
-            self._analyze_token_metrics(),
-            self._generate_trading_signals()
-        ]
+        ``batch`` is either a sequence of ``MarketSignal`` or a columnar
+        mapping of equal-length ``token``, ``price`` and ``volume`` arrays with
+        optional ``timestamp`` (epoch seconds, datetime64 or datetime objects)
+        and ``indicators`` (name -> array, NaN where a tick has no value).
+        """
+        self.ingest(batch)
+        return self._analysis_results()
+    
+    def ingest(self, batch: Union[Sequence[MarketSignal], Mapping[str, Any]]) -> List[str]:
+        """Ingest a batch like ``process_market_signals`` without assembling results
         
-        results = await asyncio.gather(*analysis_tasks)
+        Returns the tokens whose analysis was refreshed, for callers that
+        only need those (see ``token_analysis``).
+        """
+        if isinstance(batch, Mapping):
+            columns = batch
+        else:
+            columns = self._signals_to_columns(batch)
         
+        self._ingest_columns(columns)
+        tokens = list(self._dirty_tokens)
+        self._refresh_analysis_batch()
+        return tokens
+    
+    def token_analysis(self, token: str) -> Dict[str, Any]:
+        """Cached analysis of one token, shaped like a slice of the full results
+        
+        The dicts are copies, so callers cannot alter the engine's caches.
+        """
+        signal = self._signal_cache.get(token)
         return {
-            "risk_analysis": results[0],
-            "token_metrics": results[1],
-            "trading_signals": results[2],
+            "risk_analysis": dict(self._risk_cache[token]),
+            "token_metrics": dict(self._metrics_cache[token]),
+            "trading_signal": dict(signal) if signal is not None else None
+        }
+
+    def load_history(
+        self,
+        token: str,
+        timestamps: np.ndarray,
+        prices: np.ndarray,
+        volumes: np.ndarray,
+        indicators: Optional[Mapping[str, np.ndarray]] = None
+    ) -> None:
+        """Warm a token from historical columns (oldest first), e.g. archive views
+
+        Only the last market_window_size ticks are read, so memory-mapped
+        columns are paged in just for that tail.
+        """
+        if not len(prices):
+            return
+        window = slice(-self._get_history(token).capacity, None)
+        self._extend_market_state(
+            token,
+            timestamps[window],
+            prices[window],
+            volumes[window],
+            {name: values[window] for name, values in (indicators or {}).items()}
+        )
+        self._refresh_analysis_batch()
+
+    def _analysis_results(self) -> Dict[str, Any]:
+        """Assemble the analysis response from the per-token caches"""
+        return {
+            "risk_analysis": dict(self._risk_cache),
+            "token_metrics": dict(self._metrics_cache),
+            "trading_signals": [
+                s for s in self._signal_cache.values() if s is not None
+            ],
             "timestamp": datetime.now()
         }
     
     def _update_market_state(self, signal: MarketSignal) -> None:
         """Update internal market state with new signal data"""
-        if signal.token not in self._market_state:
-            self._market_state[signal.token] = []
+        history = self._get_history(signal.token)
         
-        self._market_state[signal.token].append({
-            "timestamp": signal.timestamp,
-            "price": signal.price,
-            "volume": signal.volume,
-            "indicators": signal.indicators
-        })
+        evicted_price = evicted_volume = None
+        if history.is_full:
+            evicted_price = float(history.prices[0])
+            evicted_volume = float(history.volumes[0])
         
-        # Keep only recent data based on config
-        window_size = self.config.get("market_window_size", 100)
-        self._market_state[signal.token] = self._market_state[signal.token][-window_size:]
+        history.append(
+            signal.timestamp.timestamp(),
+            signal.price,
+            signal.volume,
+            signal.indicators
+        )
+        self._market_stats[signal.token].update(history, evicted_price, evicted_volume)
+        self._dirty_tokens[signal.token] = None
         self._last_update = datetime.now()
-
-    async def _analyze_market_risk(self) -> Dict[str, float]:
-        """Analyze market risk factors"""
-        risk_factors = {}
-        
-        for token, history in self._market_state.items():
-            if not history:
-                continue
-                
-            prices = [h["price"] for h in history]
-            volumes = [h["volume"] for h in history]
-            
-            risk_factors[token] = {
-                "price_volatility": self._calculate_volatility(prices),
-                "volume_trend": self._calculate_trend(volumes),
-                "risk_score": self._calculate_risk_score(prices, volumes)
-            }
-            
-        return risk_factors
     
-    async def _analyze_token_metrics(self) -> Dict[str, Dict[str, float]]:
-        """Analyze individual token metrics"""
-        token_metrics = {}
-        
-        for token, history in self._market_state.items():
-            if not history:
-                continue
-                
-            recent_data = history[-1]
-            token_metrics[token] = {
-                "current_price": recent_data["price"],
-                "current_volume": recent_data["volume"],
-                "market_impact": self._calculate_market_impact(
-                    recent_data["volume"],
-                    recent_data["price"]
-                ),
-                **recent_data["indicators"]
-            }
-            
-        return token_metrics
+    def _get_history(self, token: str) -> MarketRingBuffer:
+        """Return the token's ring buffer, creating it on first sight"""
+        history = self._market_state.get(token)
+        if history is None:
+            # Keep only recent data based on config
+            window_size = self.config.get("market_window_size", 100)
+            history = MarketRingBuffer(window_size)
+            self._market_state[token] = history
+            self._market_stats[token] = OnlineMarketStats(
+                self.config.get("stats_recompute_interval", window_size)
+            )
+        return history
     
-    async def _generate_trading_signals(self) -> List[Dict[str, Any]]:
-        """Generate trading signals based on analysis"""
-        signals = []
-        risk_threshold = self.config.get("risk_threshold", 0.7)
+    def _ingest_columns(self, columns: Mapping[str, Any]) -> None:
+        """Append a columnar batch, one vectorized block write per token"""
+        tokens = np.asarray(columns["token"])
+        if not len(tokens):
+            return
+            
+        prices = np.asarray(columns["price"], dtype=np.float64)
+        volumes = np.asarray(columns["volume"], dtype=np.float64)
+        timestamps = self._to_epoch_seconds(columns.get("timestamp"), len(tokens))
+        indicators = {
+            name: np.asarray(values, dtype=np.float64)
+            for name, values in (columns.get("indicators") or {}).items()
+        }
+        if any(
+            len(values) != len(tokens)
+            for values in (prices, volumes, timestamps, *indicators.values())
+        ):
+            raise ValueError("all batch columns must have the same length as token")
         
-        for token, history in self._market_state.items():
-            if not history:
-                continue
-                
-            risk_score = self._calculate_risk_score(
-                [h["price"] for h in history],
-                [h["volume"] for h in history]
+        # Group ticks by token, keeping arrival order within each token
+        order = np.argsort(tokens, kind="stable")
+        grouped = tokens[order]
+        starts = np.flatnonzero(np.r_[True, grouped[1:] != grouped[:-1]])
+        ends = np.r_[starts[1:], len(order)]
+        
+        # New tokens are registered in order of first arrival
+        for group in np.argsort(order[starts], kind="stable"):
+            index = order[starts[group]:ends[group]]
+            self._extend_market_state(
+                str(grouped[starts[group]]),
+                timestamps[index],
+                prices[index],
+                volumes[index],
+                {name: values[index] for name, values in indicators.items()}
             )
-            
-            if risk_score < risk_threshold:
-                signal = {
-                    "token": token,
-                    "action": "ANALYZE",
-                    "confidence": 1 - risk_score,
-                    "timestamp": datetime.now()
-                }
-                signals.append(signal)
+        self._last_update = datetime.now()
+    
+    def _extend_market_state(
+        self,
+        token: str,
+        timestamps: np.ndarray,
+        prices: np.ndarray,
+        volumes: np.ndarray,
+        indicators: Dict[str, np.ndarray]
+    ) -> None:
+        """Write a block of ticks for one token and fold them into its stats"""
+        history = self._get_history(token)
+        evicted = min(max(len(history) + len(prices) - history.capacity, 0), len(history))
+        evicted_prices = history.prices[:evicted].copy()
+        evicted_volumes = history.volumes[:evicted].copy()
+        
+        history.extend(timestamps, prices, volumes, indicators)
+        self._market_stats[token].update_many(
+            history, len(prices), evicted_prices, evicted_volumes
+        )
+        self._dirty_tokens[token] = None
+    
+    def _signals_to_columns(self, signals: Sequence[MarketSignal]) -> Dict[str, Any]:
+        """Convert a list of signals into the columnar batch layout"""
+        indicators: Dict[str, np.ndarray] = {}
+        for i, signal in enumerate(signals):
+            for name, value in signal.indicators.items():
+                if name not in indicators:
+                    indicators[name] = np.full(len(signals), np.nan)
+                indicators[name][i] = value
                 
-        return signals
+        return {
+            "token": [s.token for s in signals],
+            "timestamp": [s.timestamp.timestamp() for s in signals],
+            "price": [s.price for s in signals],
+            "volume": [s.volume for s in signals],
+            "indicators": indicators
+        }
     
-    def _calculate_volatility(self, values: List[float]) -> float:
-        """Calculate volatility using advanced statistical methods"""
-        if len(values) < 2:
-            return 0.0
+    def _to_epoch_seconds(self, values: Any, count: int) -> np.ndarray:
+        """Normalize a timestamp column to float epoch seconds"""
+        if values is None:
+            return np.full(count, datetime.now().timestamp())
             
-        import numpy as np
-        returns = np.diff(values) / values[:-1]
-        return float(np.std(returns))
+        values = np.asarray(values)
+        if values.dtype.kind == "M":
+            return values.astype("datetime64[ns]").astype(np.int64) / 1e9
+        if values.dtype.kind == "O":
+            return np.array([v.timestamp() for v in values], dtype=np.float64)
+        return values.astype(np.float64)
     
-    def _calculate_trend(self, values: List[float]) -> float:
-        """Calculate trend strength using regression"""
-        if len(values) < 2:
-            return 0.0
+    def _refresh_analysis_batch(self) -> None:
+        """Recompute cached analysis for all dirty tokens in one pass
+        
+        The per-token statistics are gathered into a (tokens x 4) array so
+        risk scores, market impact and signal selection are evaluated as
+        array expressions across every affected token at once.
+        """
+        tokens = list(self._dirty_tokens)
+        if not tokens:
+            return
             
-        import numpy as np
-        x = np.arange(len(values))
-        y = np.array(values)
-        z = np.polyfit(x, y, 1)
-        return float(z[0])
-    
-    def _calculate_market_impact(self, volume: float, price: float) -> float:
-        """Calculate market impact score"""
-        base_liquidity = self.config.get("base_liquidity", 1000000)
-        return (volume * price) / base_liquidity
-    
-    def _calculate_risk_score(self, prices: List[float], volumes: List[float]) -> float:
-        """Calculate comprehensive risk score"""
-        volatility = self._calculate_volatility(prices)
-        volume_trend = self._calculate_trend(volumes)
+        state = np.array([
+            (
+                self._market_stats[token].volatility,
+                self._market_stats[token].trend,
+                self._market_state[token].prices[-1],
+                self._market_state[token].volumes[-1]
+            )
+            for token in tokens
+        ], dtype=np.float64)
+        volatility, volume_trend, prices, volumes = state.T
         
-        # Normalize components
-        norm_volatility = min(volatility * 10, 1)
-        norm_volume = max(min(volume_trend, 1), -1)
+        risk_scores = self._score_risk_array(volatility, volume_trend)
+        market_impact = volumes * prices / self.config.get("base_liquidity", 1000000)
+        signalled = risk_scores < self.config.get("risk_threshold", 0.7)
         
-        # Weighted combination
-        weights = self.config.get("risk_weights", {
+        now = datetime.now()
+        rows = zip(
+            tokens,
+            state.tolist(),
+            risk_scores.tolist(),
+            market_impact.tolist(),
+            signalled.tolist()
+        )
+        for token, (vol, trend, price, volume), risk_score, impact, signal in rows:
+            self._risk_cache[token] = {
+                "price_volatility": vol,
+                "volume_trend": trend,
+                "risk_score": risk_score
+            }
+            self._metrics_cache[token] = {
+                "current_price": price,
+                "current_volume": volume,
+                "market_impact": impact,
+                **self._market_state[token].latest_indicators()
+            }
+            self._signal_cache[token] = {
+                "token": token,
+                "action": "ANALYZE",
+                "confidence": 1 - risk_score,
+                "timestamp": now
+            } if signal else None
+        self._dirty_tokens.clear()
+    
+    def _score_risk_array(self, volatility: np.ndarray, volume_trend: np.ndarray) -> np.ndarray:
+        """Combine volatility and volume trend into 0-1 risk scores, per token"""
+        weights = self._risk_weights()
+        risk_scores = (
+            weights["volatility"] * np.minimum(volatility * 10, 1) +
+            weights["volume_trend"] * (1 - np.abs(np.clip(volume_trend, -1, 1)))
+        )
+        return np.clip(risk_scores, 0, 1)
+    
+    def _risk_weights(self) -> Dict[str, float]:
+        return self.config.get("risk_weights", {
             "volatility": 0.7,
             "volume_trend": 0.3
         })
-        
-        risk_score = (
-            weights["volatility"] * norm_volatility +
-            weights["volume_trend"] * (1 - abs(norm_volume))
-        )
-        
-        return min(max(risk_score, 0), 1)
-
@@ -0,0 +1,171 @@
+from typing import Dict, Iterator, List, Optional, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+import math
+import time
+import numpy as np
+
+from .tail_risk import tail_risk, tail_size
+
+
+@dataclass
+class MonteCarloResult:
+    paths: int
+    value_at_risk: Dict[float, float]
+    expected_shortfall: Dict[float, float]
+    elapsed: float
+    chunks: int = 0
+    complete: bool = True
+
+    @property
+    def paths_per_second(self) -> float:
+        return self.paths / self.elapsed if self.elapsed else 0.0
+
+
+@dataclass
+class _Scenario:
+    expected_returns: np.ndarray
+    factor: np.ndarray
+    weights: np.ndarray
+    horizon: int
+    tail: int = field(default=0)
+
+
+# Scenario installed in each pool process by _install_scenario; inline runs
+# pass theirs to _simulate instead, so concurrent simulators never share it
+_scenario: Optional[_Scenario] = None
+
+
+class MonteCarloVaR:
+    """Portfolio Monte Carlo VaR and expected shortfall from return moments
+
+    Each path draws ``horizon`` steps of correlated normal asset returns
+    (mean ``expected_returns``, covariance ``covariance`` per step),
+    compounds them per asset and takes the weighted portfolio return.
+    Paths are simulated in chunks of ``chunk_size`` so memory stays at
+    O(chunk_size * horizon * assets) however many paths are requested, and
+    only the worst returns any confidence level can need are kept between
+    chunks. Chunk i always draws from child i of
+    ``SeedSequence(seed).spawn``, so results are identical for any number
+    of workers. VaR/ES follow ``tail_risk``: returns, negative for losses.
+    """
+
+    def __init__(
+        self,
+        expected_returns: np.ndarray,
+        covariance: np.ndarray,
+        weights: np.ndarray,
+        horizon: int = 1,
+        confidences: Sequence[float] = (0.95, 0.99),
+        chunk_size: int = 50_000,
+        seed: Optional[int] = None,
+        max_workers: int = 1
+    ):
+        self.expected_returns = np.asarray(expected_returns, dtype=np.float64)
+        self.weights = np.asarray(weights, dtype=np.float64)
+        self.factor = _covariance_factor(np.atleast_2d(np.asarray(covariance, dtype=np.float64)))
+        self.horizon = max(int(horizon), 1)
+        self.confidences = tuple(confidences)
+        self.chunk_size = max(int(chunk_size), 1)
+        self.seed = seed
+        self.max_workers = max(int(max_workers), 1)
+
+    @classmethod
+    def from_optimizer(cls, optimizer, weights: Optional[Dict[str, float]] = None, **kwargs) -> "MonteCarloVaR":
+        """Simulate a PortfolioOptimizer's return moments
+
+        ``weights`` defaults to the optimizer's current holdings by value.
+        """
+        tokens, expected_returns, covariance = optimizer.return_moments()
+        if weights is None:
+            weights = optimizer.current_weights()
+        return cls(
+            expected_returns,
+            covariance,
+            np.array([weights.get(token, 0.0) for token in tokens]),
+            **kwargs
+        )
+
+    def run(self, paths: int) -> MonteCarloResult:
+        """Simulate ``paths`` paths and return the final estimates"""
+        result = None
+        for result in self.stream(paths):
+            pass
+        return result
+
+    def stream(self, paths: int) -> Iterator[MonteCarloResult]:
+        """Yield estimates over all paths simulated so far after every chunk"""
+        if paths < 1:
+            raise ValueError("paths must be at least 1")
+        n_chunks = math.ceil(paths / self.chunk_size)
+        sizes = [self.chunk_size] * (n_chunks - 1) + [paths - self.chunk_size * (n_chunks - 1)]
+        seeds = np.random.SeedSequence(self.seed).spawn(n_chunks)
+        # The most returns any level reads once all paths are in
+        tail = max(tail_size(paths, confidence) for confidence in self.confidences)
+        scenario = _Scenario(self.expected_returns, self.factor, self.weights, self.horizon, tail)
+
+        start = time.perf_counter()
+        worst = np.empty(0)
+        done = 0
+        for index, chunk_worst in enumerate(self._chunks(scenario, sizes, seeds)):
+            worst = _keep_worst(np.concatenate([worst, chunk_worst]), tail)
+            done += sizes[index]
+            yield self._result(np.sort(worst), done, time.perf_counter() - start, index + 1, done == paths)
+
+    def _chunks(self, scenario: _Scenario, sizes: List[int], seeds: List[np.random.SeedSequence]):
+        if self.max_workers == 1 or len(sizes) == 1:
+            for size, seed in zip(sizes, seeds):
+                yield _simulate(scenario, size, seed)
+            return
+        with ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            initializer=_install_scenario,
+            initargs=(scenario,)
+        ) as executor:
+            # map yields in submission order, keeping partial estimates reproducible
+            yield from executor.map(_simulate_chunk, sizes, seeds)
+
+    def _result(self, worst: np.ndarray, paths: int, elapsed: float, chunks: int, complete: bool) -> MonteCarloResult:
+        value_at_risk, expected_shortfall = {}, {}
+        for confidence in self.confidences:
+            var, shortfall = tail_risk(worst, confidence, paths)
+            value_at_risk[confidence] = float(var)
+            expected_shortfall[confidence] = float(shortfall)
+        return MonteCarloResult(paths, value_at_risk, expected_shortfall, elapsed, chunks, complete)
+
+
+def _install_scenario(scenario: _Scenario) -> None:
+    global _scenario
+    _scenario = scenario
+
+
+def _simulate_chunk(size: int, seed: np.random.SeedSequence) -> np.ndarray:
+    """Pool entry point: simulate a chunk of the scenario this process was given"""
+    return _simulate(_scenario, size, seed)
+
+
+def _simulate(scenario: _Scenario, size: int, seed: np.random.SeedSequence) -> np.ndarray:
+    """Worst portfolio returns of one chunk of paths"""
+    rng = np.random.default_rng(seed)
+    n_assets = len(scenario.expected_returns)
+    shocks = rng.standard_normal((size, scenario.horizon, n_assets))
+    step_returns = shocks @ scenario.factor.T
+    step_returns += scenario.expected_returns
+    growth = np.prod(1 + step_returns, axis=1) if scenario.horizon > 1 else 1 + step_returns[:, 0]
+    portfolio = (growth - 1) @ scenario.weights
+    return _keep_worst(portfolio, scenario.tail)
+
+
+def _keep_worst(values: np.ndarray, count: int) -> np.ndarray:
+    if len(values) <= count:
+        return values
+    return np.partition(values, count - 1)[:count]
+
+
+def _covariance_factor(covariance: np.ndarray) -> np.ndarray:
+    """Matrix F with F F' = covariance, tolerating singular covariances"""
+    try:
+        return np.linalg.cholesky(covariance)
+    except np.linalg.LinAlgError:
+        eigenvalues, eigenvectors = np.linalg.eigh(covariance)
+        return eigenvectors * np.sqrt(np.clip(eigenvalues, 0, None))
@@ -0,0 +1,240 @@
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from multiprocessing.shared_memory import SharedMemory
+import asyncio
+import functools
+import math
+import os
+import numpy as np
+
+from .solvers import get_solver
+
+
+@dataclass
+class PortfolioRequest:
+    portfolio_id: Any
+    allocation: Dict[str, float]
+    risk_tolerance: float = 1.0
+
+
+@dataclass
+class PortfolioBatchResult:
+    portfolio_id: Any
+    optimal_weights: Dict[str, float]
+    rebalancing_trades: List[Dict] = field(default_factory=list)
+    sharpe_ratio: float = float("nan")
+    success: bool = True
+    message: str = ""
+
+
+@dataclass
+class _BatchState:
+    expected_returns: np.ndarray
+    covariance: np.ndarray
+    solver: Any
+    risk_free_rate: float
+    threshold: float
+
+    @classmethod
+    def from_config(cls, expected_returns: np.ndarray, covariance: np.ndarray, config: Dict) -> "_BatchState":
+        return cls(
+            expected_returns,
+            covariance,
+            get_solver(config.get("solver"), config.get("solver_options")),
+            config.get("risk_free_rate", 0.01),
+            config.get("rebalance_threshold", 0.01)
+        )
+
+
+# Batch state of a pool process, attached by _attach_moments for the shared
+# memory block its latest chunk named. Inline runs pass theirs to _solve
+# instead, so concurrent batches never share it
+_worker: Dict[str, Any] = {}
+
+Task = Tuple[Any, np.ndarray, List[Tuple[str, float]], float]
+
+
+def optimize_portfolios(
+    requests: Sequence[PortfolioRequest],
+    historical_returns: Dict[str, Sequence[float]],
+    config: Optional[Dict] = None,
+    max_workers: Optional[int] = None,
+    chunk_size: Optional[int] = None
+) -> List[PortfolioBatchResult]:
+    """Optimize many portfolios over one shared return history
+
+    Expected returns and the covariance of every token in the union of the
+    portfolios are estimated once. With more than one worker they are
+    placed in a shared memory block that pool processes attach to by name,
+    so a task only carries token indices, amounts and the risk tolerance;
+    portfolios are sent in chunks to amortize IPC. Each portfolio solves on
+    its sub-block of the moments.
+
+    ``risk_tolerance`` in [0, 1] sets the per-asset weight cap, from equal
+    weights at 0 to the unconstrained maximum-Sharpe portfolio at 1.
+    Results are returned in request order.
+    """
+    if not requests:
+        return []
+    config = config or {}
+    expected_returns, covariance, tasks = _prepare(requests, historical_returns)
+    workers = min(max_workers or os.cpu_count() or 1, len(tasks))
+    if workers <= 1:
+        return _solve(_BatchState.from_config(expected_returns, covariance, config), tasks)
+
+    with _shared_moments(expected_returns, covariance) as name:
+        solve = functools.partial(_solve_chunk, name, len(expected_returns), config)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = []
+            for chunk_results in executor.map(solve, _chunks(tasks, workers, chunk_size)):
+                results.extend(chunk_results)
+            return results
+
+
+async def optimize_portfolios_on(
+    executor: Executor,
+    requests: Sequence[PortfolioRequest],
+    historical_returns: Dict[str, Sequence[float]],
+    config: Optional[Dict] = None,
+    workers: Optional[int] = None,
+    chunk_size: Optional[int] = None
+) -> List[PortfolioBatchResult]:
+    """``optimize_portfolios`` on a long-lived process pool, from the event loop
+
+    Chunks are submitted from the calling loop, so the pool is never
+    created or grown from another thread. ``workers`` is only used to size
+    chunks.
+    """
+    if not requests:
+        return []
+    config = config or {}
+    expected_returns, covariance, tasks = _prepare(requests, historical_returns)
+    workers = min(workers or os.cpu_count() or 1, len(tasks))
+    loop = asyncio.get_running_loop()
+    with _shared_moments(expected_returns, covariance) as name:
+        solve = functools.partial(_solve_chunk, name, len(expected_returns), config)
+        chunk_results = await asyncio.gather(*(
+            loop.run_in_executor(executor, solve, chunk) for chunk in _chunks(tasks, workers, chunk_size)
+        ))
+    return [result for results in chunk_results for result in results]
+
+
+def rebalancing_trades(
+    allocation: Dict[str, float],
+    optimal_weights: Dict[str, float],
+    threshold: float = 0.01
+) -> List[Dict]:
+    """Trades moving current token amounts to the target weights"""
+    trades = []
+    total_value = sum(allocation.values())
+
+    for token, current_amount in allocation.items():
+        current_weight = current_amount / total_value
+        optimal_weight = optimal_weights.get(token, 0)
+
+        if abs(current_weight - optimal_weight) > threshold:
+            target_amount = total_value * optimal_weight
+            trade_amount = target_amount - current_amount
+            trades.append({
+                "token": token,
+                "action": "buy" if trade_amount > 0 else "sell",
+                "amount": abs(trade_amount)
+            })
+
+    return trades
+
+
+def _prepare(
+    requests: Sequence[PortfolioRequest],
+    historical_returns: Dict[str, Sequence[float]]
+) -> Tuple[np.ndarray, np.ndarray, List[Task]]:
+    tokens = sorted({token for request in requests for token in request.allocation})
+    index = {token: i for i, token in enumerate(tokens)}
+    returns_data = np.array([historical_returns[token] for token in tokens], dtype=np.float64)
+    tasks = [
+        (
+            request.portfolio_id,
+            np.array([index[token] for token in request.allocation], dtype=np.intp),
+            list(request.allocation.items()),
+            request.risk_tolerance
+        )
+        for request in requests
+    ]
+    return returns_data.mean(axis=1), np.atleast_2d(np.cov(returns_data)), tasks
+
+
+def _chunks(tasks: List[Task], workers: int, chunk_size: Optional[int]) -> List[List[Task]]:
+    chunk_size = chunk_size or math.ceil(len(tasks) / (workers * 4))
+    return [tasks[i:i + chunk_size] for i in range(0, len(tasks), chunk_size)]
+
+
+@contextmanager
+def _shared_moments(expected_returns: np.ndarray, covariance: np.ndarray) -> Iterator[str]:
+    """Copy the moments into a shared memory block, unlinked on exit"""
+    n_tokens = len(expected_returns)
+    shm = SharedMemory(create=True, size=(n_tokens + n_tokens * n_tokens) * 8)
+    try:
+        moments = np.ndarray(n_tokens + n_tokens * n_tokens, dtype=np.float64, buffer=shm.buf)
+        moments[:n_tokens] = expected_returns
+        moments[n_tokens:] = covariance.ravel()
+        del moments
+        yield shm.name
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def _attach_moments(name: str, n_tokens: int, config: Dict) -> None:
+    previous = _worker.pop("shm", None)
+    # The state's arrays view the previous block and must go before it closes
+    _worker.clear()
+    if previous is not None:
+        previous.close()
+    # Workers share the parent's resource tracker, which unlinks the block
+    shm = SharedMemory(name=name)
+    moments = np.ndarray(n_tokens + n_tokens * n_tokens, dtype=np.float64, buffer=shm.buf)
+    _worker["state"] = _BatchState.from_config(
+        moments[:n_tokens], moments[n_tokens:].reshape(n_tokens, n_tokens), config
+    )
+    _worker["shm"] = shm
+    _worker["name"] = name
+
+
+def _solve_chunk(name: str, n_tokens: int, config: Dict, tasks: Iterable[Task]) -> List[PortfolioBatchResult]:
+    """Pool entry point: solve a chunk against the batch in shared block ``name``"""
+    if _worker.get("name") != name:
+        _attach_moments(name, n_tokens, config)
+    return _solve(_worker["state"], tasks)
+
+
+def _solve(state: _BatchState, tasks: Iterable[Task]) -> List[PortfolioBatchResult]:
+    expected_returns = state.expected_returns
+    covariance = state.covariance
+    results = []
+    for portfolio_id, rows, items, risk_tolerance in tasks:
+        allocation = dict(items)
+        n_assets = len(rows)
+        if not n_assets:
+            results.append(PortfolioBatchResult(portfolio_id, {}))
+            continue
+
+        tolerance = min(max(risk_tolerance, 0.0), 1.0)
+        result = state.solver.solve(
+            expected_returns[rows],
+            covariance[np.ix_(rows, rows)],
+            np.full(n_assets, 1 / n_assets),
+            max_weight=1 / n_assets + tolerance * (1 - 1 / n_assets),
+            risk_free_rate=state.risk_free_rate
+        )
+        weights = dict(zip(allocation, result.weights.tolist()))
+        results.append(PortfolioBatchResult(
+            portfolio_id=portfolio_id,
+            optimal_weights=weights,
+            rebalancing_trades=rebalancing_trades(allocation, weights, state.threshold),
+            sharpe_ratio=result.sharpe_ratio,
+            success=result.success,
+            message=result.message
+        ))
+    return results
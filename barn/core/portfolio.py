@@ -1,8 +1,12 @@
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 from dataclasses import dataclass
 from datetime import datetime
+import logging
 import numpy as np
-from scipy.optimize import minimize
+
+from .prices import PriceMatrix
+from .solvers import SolverResult, get_solver
+from .stats import RollingCovariance
 
 @dataclass
 class Position:
@@ -18,93 +22,239 @@ class PortfolioOptimizer:
     def __init__(self, config: Optional[Dict] = None):
         self.config = config or {}
         self._positions: Dict[str, Position] = {}
-        self._historical_data: Dict[str, List[float]] = {}
+        self._price_matrix = PriceMatrix(
+            self.config.get("max_history_length", 1000),
+            interval=self.config.get("price_interval")
+        )
+        self._solver = get_solver(self.config.get("solver"), self.config.get("solver_options"))
+        self.last_result: Optional[SolverResult] = None
+        self.logger = logging.getLogger("barn.portfolio")
+        
+        # Rolling return moments, advanced with rank-k updates as prices arrive
+        self._moments: Optional[RollingCovariance] = None
+        self._moment_tokens: Tuple[str, ...] = ()
+        self._consumed_id = 0
+        self._seen_rewrites = 0
+        self._moments_version = 0
+        
+        # Previous solve, used as a warm start and to skip redundant solves
+        self._last_solve: Optional[Dict[str, Any]] = None
+        self.solve_stats = {"solves": 0, "cache_hits": 0}
+        # Last (min_position_size, n_assets) reported as infeasible
+        self._infeasible_warned: Optional[Tuple[float, int]] = None
         
     def update_position(self, position: Position) -> None:
         """Update or add a new position"""
         self._positions[position.token] = position
         
-        if position.token not in self._historical_data:
-            self._historical_data[position.token] = []
-        
-        self._historical_data[position.token].append(position.current_price)
-        
-        # Keep historical data window manageable
-        max_history = self.config.get("max_history_length", 1000)
-        if len(self._historical_data[position.token]) > max_history:
-            self._historical_data[position.token] = self._historical_data[position.token][-max_history:]
+        # The price matrix keeps a fixed max_history_length window of columns
+        stored = self._price_matrix.write(
+            position.token,
+            position.timestamp.timestamp(),
+            position.current_price
+        )
+        if not stored:
+            self.logger.warning(
+                f"Dropped late price for {position.token} at {position.timestamp}: "
+                "no price column covers it"
+            )
     
+    def load_price_history(self, history: Dict[str, Tuple[np.ndarray, np.ndarray]]) -> None:
+        """Warm the price matrix from per-token (timestamps, prices) columns
+
+        Each token contributes at most its last max_history_length ticks,
+        the most the matrix window can hold of it; the ticks of all tokens
+        are then written in time order.
+        """
+        window = self._price_matrix.window
+        tails = [
+            (token, np.asarray(timestamps)[-window:], np.asarray(prices)[-window:])
+            for token, (timestamps, prices) in history.items()
+            if len(timestamps)
+        ]
+        if not tails:
+            return
+        tokens = np.repeat(np.arange(len(tails)), [len(ts) for _, ts, _ in tails])
+        timestamps = np.concatenate([ts for _, ts, _ in tails])
+        prices = np.concatenate([ps for _, _, ps in tails])
+        order = np.argsort(timestamps, kind="stable")
+        for row, timestamp, price in zip(tokens[order].tolist(), timestamps[order].tolist(), prices[order].tolist()):
+            self._price_matrix.write(tails[row][0], timestamp, price)
+
     def optimize_portfolio(self) -> Dict[str, float]:
         """Optimize portfolio weights using advanced techniques"""
         if not self._positions:
             return {}
             
-        returns_data = self._calculate_returns_data()
-        constraints = self._generate_constraints()
-        initial_weights = self._get_initial_weights()
+        tokens = tuple(self._positions)
+        expected_returns, covariance = self._update_moments(tokens)
+        bounds = self._position_bounds()
         
-        result = self._run_optimization(returns_data, constraints, initial_weights)
+        cached = self._cached_weights(tokens, expected_returns, covariance, bounds)
+        if cached is not None:
+            self.solve_stats["cache_hits"] += 1
+            return dict(zip(tokens, cached))
+            
+        initial_weights = self._get_initial_weights()
+        result = self._run_optimization(expected_returns, covariance, initial_weights, bounds)
+        self.last_result = result
+        self.solve_stats["solves"] += 1
+        self._last_solve = {
+            "tokens": tokens,
+            "bounds": bounds,
+            "version": self._moments_version,
+            "expected_returns": expected_returns,
+            "covariance": covariance,
+            "weights": result.weights
+        }
         
-        return dict(zip(self._positions.keys(), result.x))
+        return dict(zip(tokens, result.weights))
     
-    def _calculate_returns_data(self) -> Tuple[np.ndarray, np.ndarray]:
-        """Calculate returns and covariance data"""
-        returns_list = []
-        
-        for token in self._positions.keys():
-            prices = self._historical_data[token]
-            if len(prices) < 2:
-                returns_list.append([0.0])
-                continue
-                
-            returns = np.diff(prices) / prices[:-1]
-            returns_list.append(returns)
+    def return_moments(self) -> Tuple[List[str], np.ndarray, np.ndarray]:
+        """Position tokens with the expected returns and covariance used to optimize"""
+        tokens = tuple(self._positions)
+        expected_returns, covariance = self._update_moments(tokens)
+        return list(tokens), expected_returns, covariance
+    
+    def current_weights(self) -> Dict[str, float]:
+        """Current portfolio weights by position value"""
+        values = {
+            token: pos.amount * pos.current_price
+            for token, pos in self._positions.items()
+        }
+        total_value = sum(values.values())
+        return {token: value / total_value for token, value in values.items()}
+    
+    def _calculate_returns_data(self) -> np.ndarray:
+        """Calculate the (tokens x observations) simple returns matrix
         
-        returns_data = np.array(returns_list)
-        return returns_data
+        Covers the columns where every position token has a price, up to
+        the newest column once all of them have reported in it. When the
+        tokens are the matrix rows in order this is a view, not a copy.
+        """
+        rows = self._token_rows(tuple(self._positions))
+        start_id, end_id = self._returns_range(rows)
+        return self._returns_for(rows, start_id, end_id)
     
-    def _generate_constraints(self) -> List[Dict]:
-        """Generate optimization constraints"""
-        constraints = [
-            {'type': 'eq', 'fun': lambda x: np.sum(x) - 1}  # weights sum to 1
-        ]
+    def _token_rows(self, tokens: Tuple[str, ...]) -> Optional[np.ndarray]:
+        """Matrix rows for ``tokens``, or None if they are exactly all rows in order"""
+        rows = np.array([self._price_matrix.row(token) for token in tokens])
+        if len(rows) == len(self._price_matrix.tokens) and (rows == np.arange(len(rows))).all():
+            return None
+        return rows
+    
+    def _returns_range(self, rows: Optional[np.ndarray]) -> Tuple[int, int]:
+        """Absolute column ids [start, end) of returns usable for the tokens"""
+        matrix = self._price_matrix
+        tokens = matrix.tokens if rows is None else [matrix.tokens[row] for row in rows]
+        start_id = max(
+            matrix.start_id,
+            max(matrix.first_seen_id(token) for token in tokens)
+        ) + 1
+        end_id = matrix.end_id
+        if end_id > start_id and not matrix.column_complete(end_id - 1, rows):
+            end_id -= 1
+        return start_id, max(end_id, start_id)
+    
+    def _returns_for(self, rows: Optional[np.ndarray], start_id: int, end_id: int) -> np.ndarray:
+        returns = self._price_matrix.returns_between(start_id, end_id)
+        return returns if rows is None else returns[rows]
+    
+    def _update_moments(self, tokens: Tuple[str, ...]) -> Tuple[np.ndarray, np.ndarray]:
+        """Fold price columns completed since the last call into the moments
         
-        # Add minimum position constraints
-        min_position = self.config.get("min_position_size", 0.05)
-        for i in range(len(self._positions)):
-            constraints.append(
-                {'type': 'ineq', 'fun': lambda x, i=i: x[i] - min_position}
-            )
+        Only columns not yet consumed are added, as one rank-k update; any
+        in-place rewrite of older columns triggers a full rebuild.
+        """
+        if (
+            self._moments is None
+            or tokens != self._moment_tokens
+            or self._price_matrix.rewrites != self._seen_rewrites
+        ):
+            return self._reset_moments(tokens)
+            
+        rows = self._token_rows(tokens)
+        start_id, end_id = self._returns_range(rows)
+        first_new = max(self._consumed_id, start_id)
+        if end_id > first_new:
+            self._moments.add(self._returns_for(rows, first_new, end_id).T)
+            self._moments.trim(end_id - start_id)
+            self._consumed_id = end_id
+            self._moments_version += 1
+            
+        return self._moments.mean, self._moments.covariance
+    
+    def _reset_moments(self, tokens: Tuple[str, ...]) -> Tuple[np.ndarray, np.ndarray]:
+        """Rebuild the rolling moments from the price matrix"""
+        rows = self._token_rows(tokens)
+        start_id, end_id = self._returns_range(rows)
+        self._moments = RollingCovariance(len(tokens), self._price_matrix.window - 1)
+        self._moments.add(self._returns_for(rows, start_id, end_id).T)
+        self._moment_tokens = tokens
+        self._consumed_id = end_id
+        self._seen_rewrites = self._price_matrix.rewrites
+        self._moments_version += 1
+        return self._moments.mean, self._moments.covariance
+    
+    def _cached_weights(
+        self,
+        tokens: Tuple[str, ...],
+        expected_returns: np.ndarray,
+        covariance: np.ndarray,
+        bounds: Tuple[float, float]
+    ) -> Optional[np.ndarray]:
+        """Previous optimal weights if the solve inputs have not materially changed"""
+        last = self._last_solve
+        if last is None or last["tokens"] != tokens or last["bounds"] != bounds:
+            return None
+        if last["version"] == self._moments_version:
+            return last["weights"]
             
-        return constraints
+        tolerance = self.config.get("reoptimize_tolerance", 1e-6)
+        if (
+            _relative_change(expected_returns, last["expected_returns"]) <= tolerance
+            and _relative_change(covariance, last["covariance"]) <= tolerance
+        ):
+            return last["weights"]
+        return None
+    
+    def _position_bounds(self) -> Tuple[float, float]:
+        """Per-asset weight bounds, with the minimum position as a lower bound"""
+        min_position = self.config.get("min_position_size", 0.05)
+        n_assets = len(self._positions)
+        if min_position * n_assets > 1:
+            # Warn once per configuration, not on every optimization
+            if self._infeasible_warned != (min_position, n_assets):
+                self.logger.warning(
+                    f"min_position_size {min_position} is infeasible for {n_assets} assets; "
+                    f"using {1 / n_assets:.4f}"
+                )
+                self._infeasible_warned = (min_position, n_assets)
+            min_position = 1 / n_assets
+        return min_position, 1.0
     
     def _get_initial_weights(self) -> np.ndarray:
-        """Get initial weights for optimization"""
+        """Get initial weights, warm-starting from the previous optimum"""
+        if self._last_solve is not None and self._last_solve["tokens"] == tuple(self._positions):
+            return self._last_solve["weights"].copy()
         n_assets = len(self._positions)
         return np.array([1/n_assets] * n_assets)
     
     def _run_optimization(
         self,
-        returns_data: np.ndarray,
-        constraints: List[Dict],
-        initial_weights: np.ndarray
-    ) -> Any:
+        expected_returns: np.ndarray,
+        covariance: np.ndarray,
+        initial_weights: np.ndarray,
+        bounds: Tuple[float, float]
+    ) -> SolverResult:
         """Run portfolio optimization"""
-        def objective(weights):
-            portfolio_return = np.sum(np.mean(returns_data, axis=1) * weights)
-            portfolio_vol = np.sqrt(
-                np.dot(weights.T, np.dot(np.cov(returns_data), weights))
-            )
-            return -portfolio_return/portfolio_vol  # Negative Sharpe ratio
-            
-        bounds = tuple((0, 1) for _ in range(len(self._positions)))
-        
-        return minimize(
-            objective,
+        min_weight, max_weight = bounds
+        return self._solver.solve(
+            expected_returns,
+            covariance,
             initial_weights,
-            method='SLSQP',
-            constraints=constraints,
-            bounds=bounds
+            min_weight=min_weight,
+            max_weight=max_weight
         )
     
     def get_rebalancing_trades(self, optimal_weights: Dict[str, float]) -> List[Dict]:
@@ -134,3 +284,8 @@ class PortfolioOptimizer:
                 
         return trades
 
+
+def _relative_change(new: np.ndarray, old: np.ndarray) -> float:
+    """Largest absolute change relative to the largest previous magnitude"""
+    scale = max(float(np.max(np.abs(old))), 1e-12)
+    return float(np.max(np.abs(new - old))) / scale
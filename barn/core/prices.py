@@ -0,0 +1,192 @@
+from typing import Dict, List, Optional
+import math
+import numpy as np
+
+
+class PriceMatrix:
+    """Time-aligned (assets x columns) price history updated in place
+
+    Each column is one observation time. With ``interval`` set, columns are
+    fixed time buckets and a later price in the same bucket overwrites the
+    earlier one; without it a column closes as soon as an asset that already
+    has a price in it reports again, so assets updated in lockstep share
+    columns. Assets that did not report in a column carry their previous
+    price forward, and ``observed`` marks which cells hold real prices.
+
+    Storage holds twice ``window`` columns; live columns advance through it
+    and are compacted back to the front when the end is reached, so
+    ``prices``/``returns``/``observed`` are always contiguous views and
+    opening a column costs amortized O(assets). Simple returns are updated
+    alongside the prices on every write, so nothing is recomputed per read.
+    """
+
+    def __init__(self, window: int, interval: Optional[float] = None, asset_capacity: int = 16):
+        if window < 2:
+            raise ValueError("window must be at least 2")
+        self.window = window
+        self.interval = interval
+        self._index: Dict[str, int] = {}
+        self._first_seen: List[int] = []
+        self._prices = np.full((asset_capacity, 2 * window), np.nan)
+        self._returns = np.full((asset_capacity, 2 * window), np.nan)
+        self._observed = np.zeros((asset_capacity, 2 * window), dtype=bool)
+        self._times = np.zeros(2 * window)
+        self._start = 0
+        self._end = 0
+        # Absolute id of storage column 0; ids never change for a column
+        self._base_id = 0
+        # Bumped whenever an already written column is modified
+        self.rewrites = 0
+        # Late prices for buckets that have no column, which are not stored
+        self.dropped = 0
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    @property
+    def tokens(self) -> List[str]:
+        return list(self._index)
+
+    def row(self, token: str) -> Optional[int]:
+        return self._index.get(token)
+
+    @property
+    def start_id(self) -> int:
+        """Absolute id of the oldest live column"""
+        return self._base_id + self._start
+
+    @property
+    def end_id(self) -> int:
+        """Absolute id one past the newest column"""
+        return self._base_id + self._end
+
+    def first_seen_id(self, token: str) -> int:
+        """Absolute id of the column holding the token's first price"""
+        return self._first_seen[self._index[token]]
+
+    @property
+    def times(self) -> np.ndarray:
+        return self._times[self._start:self._end]
+
+    @property
+    def prices(self) -> np.ndarray:
+        """(assets x columns) forward-filled prices; NaN before an asset's first price"""
+        return self._prices[:len(self._index), self._start:self._end]
+
+    @property
+    def observed(self) -> np.ndarray:
+        return self._observed[:len(self._index), self._start:self._end]
+
+    @property
+    def returns(self) -> np.ndarray:
+        """Simple returns into each live column after the first"""
+        return self._returns[:len(self._index), self._start + 1:self._end]
+
+    def returns_between(self, start_id: int, end_id: int) -> np.ndarray:
+        """Returns into columns with absolute ids in [start_id, end_id) as a view"""
+        return self._returns[:len(self._index), start_id - self._base_id:end_id - self._base_id]
+
+    def column_complete(self, column_id: int, rows: Optional[np.ndarray] = None) -> bool:
+        """Whether every asset (or every asset in ``rows``) reported in the column"""
+        observed = self._observed[:len(self._index), column_id - self._base_id]
+        return bool(observed.all() if rows is None else observed[rows].all())
+
+    def write(self, token: str, timestamp: float, price: float) -> bool:
+        """Record a price; returns False if it falls outside the live window"""
+        row = self._index.get(token)
+        if row is None:
+            row = self._add_asset(token)
+        column = self._column_for(row, timestamp)
+        if column is None:
+            self.dropped += 1
+            return False
+
+        if column < self._end - 1 or self._observed[row, column]:
+            self.rewrites += 1
+        self._prices[row, column] = price
+        self._observed[row, column] = True
+        first_seen = self._first_seen[row]
+        if first_seen < 0 or column + self._base_id < first_seen:
+            self._first_seen[row] = column + self._base_id
+
+        if column == self._end - 1:
+            # Common case: the newest column, nothing to carry forward
+            if column > self._start:
+                self._returns[row, column] = price / self._prices[row, column - 1] - 1
+            return True
+
+        # Carry the price forward over later columns the asset skipped
+        later = np.flatnonzero(self._observed[row, column + 1:self._end])
+        stop = column + 1 + later[0] if later.size else self._end
+        self._prices[row, column + 1:stop] = price
+
+        lo = max(column, self._start + 1)
+        hi = min(stop + 1, self._end)
+        if lo < hi:
+            self._returns[row, lo:hi] = (
+                self._prices[row, lo:hi] / self._prices[row, lo - 1:hi - 1] - 1
+            )
+        return True
+
+    def _column_for(self, row: int, timestamp: float) -> Optional[int]:
+        if self._end == self._start:
+            return self._open_column(self._bucket(timestamp))
+        last = self._end - 1
+
+        if self.interval is None:
+            return self._open_column(timestamp) if self._observed[row, last] else last
+
+        bucket = self._bucket(timestamp)
+        if bucket > self._times[last]:
+            return self._open_column(bucket)
+        column = self._start + int(np.searchsorted(self.times, bucket))
+        if column < self._end and self._times[column] == bucket:
+            return column
+        return None
+
+    def _bucket(self, timestamp: float) -> float:
+        if self.interval is None:
+            return timestamp
+        return math.floor(timestamp / self.interval) * self.interval
+
+    def _open_column(self, timestamp: float) -> int:
+        if self._end - self._start == self.window:
+            self._start += 1
+        if self._end == self._prices.shape[1]:
+            live = slice(self._start, self._end)
+            count = self._end - self._start
+            for array in (self._prices, self._returns, self._observed):
+                array[:, :count] = array[:, live]
+            self._times[:count] = self._times[live]
+            self._base_id += self._start
+            self._start, self._end = 0, count
+
+        column = self._end
+        n_assets = len(self._index)
+        self._times[column] = timestamp
+        self._observed[:n_assets, column] = False
+        if column > self._start:
+            self._prices[:n_assets, column] = self._prices[:n_assets, column - 1]
+            # Forward-filled prices have a zero return (NaN before the first price)
+            self._returns[:n_assets, column] = np.where(
+                np.isnan(self._prices[:n_assets, column]), np.nan, 0.0
+            )
+        else:
+            self._prices[:n_assets, column] = np.nan
+            self._returns[:n_assets, column] = np.nan
+        self._end += 1
+        return column
+
+    def _add_asset(self, token: str) -> int:
+        row = len(self._index)
+        if row == self._prices.shape[0]:
+            extra = self._prices.shape[0]
+            self._prices = np.vstack([self._prices, np.full((extra, self._prices.shape[1]), np.nan)])
+            self._returns = np.vstack([self._returns, np.full((extra, self._returns.shape[1]), np.nan)])
+            self._observed = np.vstack([self._observed, np.zeros((extra, self._observed.shape[1]), dtype=bool)])
+        self._index[token] = row
+        self._first_seen.append(-1)
+        self._prices[row] = np.nan
+        self._returns[row] = np.nan
+        self._observed[row] = False
+        return row
@@ -1,10 +1,13 @@
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, Optional, Union
 from datetime import datetime, timedelta
 import numpy as np
 from dataclasses import dataclass
 
+from .stats import RollingSlope
+
 @dataclass
 class RiskMetrics:
+    __slots__ = ("token", "volatility", "var", "expected_shortfall", "liquidity_score", "timestamp")
     token: str
     volatility: float
     var: float  # Value at Risk
@@ -12,31 +15,221 @@ class RiskMetrics:
     liquidity_score: float
     timestamp: datetime
 
+# Rows of the columnar history; timestamps are stored as epoch seconds
+RISK_FIELDS = ("timestamp", "volatility", "var", "expected_shortfall", "liquidity_score", "composite")
+_TIMESTAMP, _VOLATILITY, _VAR, _SHORTFALL, _LIQUIDITY, _COMPOSITE = range(len(RISK_FIELDS))
+
+DEFAULT_RISK_WEIGHTS = {
+    "volatility": 0.3,
+    "var": 0.3,
+    "expected_shortfall": 0.2,
+    "liquidity": 0.2
+}
+
+def composite_risk(
+    volatility: Union[float, np.ndarray],
+    var: Union[float, np.ndarray],
+    expected_shortfall: Union[float, np.ndarray],
+    liquidity_score: Union[float, np.ndarray],
+    weights: Optional[Dict[str, float]] = None
+) -> Union[float, np.ndarray]:
+    """Weighted composite of metrics normalized to 0-1, element-wise over arrays"""
+    weights = weights or DEFAULT_RISK_WEIGHTS
+    normalized = {
+        "volatility": np.minimum(np.multiply(volatility, 10), 1),
+        "var": np.minimum(np.abs(var) * 5, 1),
+        "expected_shortfall": np.minimum(np.abs(expected_shortfall) * 5, 1),
+        "liquidity": np.subtract(1, liquidity_score)
+    }
+    return sum(normalized[key] * weight for key, weight in weights.items())
+
+class TokenRiskHistory:
+    """Time-ordered columnar risk metrics for one token
+
+    Metrics live in one (fields x capacity) float array, one contiguous
+    row per field in ``RISK_FIELDS``, with live entries in ``[start, end)``.
+    Appends write one column, expiry advances ``start`` and a late metric
+    shifts only the entries after it. Callers get ``RiskMetrics`` views
+    through ``record``/``latest``/iteration, built on demand.
+
+    Composite risk is stored next to each metric. Least-squares trends of
+    volatility, VaR and composite risk are rolling slopes updated on insert
+    and expiry, and are rebuilt exactly, along with the composite column,
+    once the updates since the last rebuild reach the larger of
+    ``recompute_interval`` and the history length, which keeps the rebuild
+    cost amortized O(1).
+    """
+
+    def __init__(
+        self,
+        token: str,
+        recompute_interval: int = 1000,
+        weights: Optional[Dict[str, float]] = None,
+        capacity: int = 64
+    ):
+        self.token = token
+        self.weights = weights
+        self._data = np.empty((len(RISK_FIELDS), max(int(capacity), 1)))
+        self._start = 0
+        self._end = 0
+        self.volatility_trend = RollingSlope()
+        self.var_trend = RollingSlope()
+        self.risk_trend = RollingSlope()
+        self.recompute_interval = max(int(recompute_interval), 1)
+        self._updates = 0
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    def __iter__(self) -> Iterator[RiskMetrics]:
+        for index in range(len(self)):
+            yield self.record(index)
+
+    def column(self, name: str) -> np.ndarray:
+        """Live values of one field, oldest first, as a view"""
+        return self._data[RISK_FIELDS.index(name), self._start:self._end]
+
+    def record(self, index: int) -> RiskMetrics:
+        """Entry ``index`` (negative counts from the newest) as a RiskMetrics"""
+        if index < 0:
+            index += len(self)
+        values = self._data[:, self._start + index].tolist()
+        return RiskMetrics(
+            token=self.token,
+            volatility=values[_VOLATILITY],
+            var=values[_VAR],
+            expected_shortfall=values[_SHORTFALL],
+            liquidity_score=values[_LIQUIDITY],
+            timestamp=datetime.fromtimestamp(values[_TIMESTAMP])
+        )
+
+    def latest(self) -> RiskMetrics:
+        return self.record(-1)
+
+    @property
+    def latest_composite(self) -> float:
+        return float(self._data[_COMPOSITE, self._end - 1])
+
+    def insert(self, metrics: RiskMetrics, composite: float) -> None:
+        """Add a metric, shifting newer entries along if it arrives late"""
+        timestamp = metrics.timestamp.timestamp()
+        values = (timestamp, metrics.volatility, metrics.var,
+                  metrics.expected_shortfall, metrics.liquidity_score, composite)
+        self._reserve()
+        end = self._end
+        if end == self._start or timestamp >= self._data[_TIMESTAMP, end - 1]:
+            self._data[:, end] = values
+            self.volatility_trend.push(metrics.volatility)
+            self.var_trend.push(metrics.var)
+            self.risk_trend.push(composite)
+        else:
+            position = self._start + int(np.searchsorted(
+                self._data[_TIMESTAMP, self._start:end], timestamp, side="right"
+            ))
+            tail = self._data[:, position:end].sum(axis=1)
+            index = position - self._start
+            self.volatility_trend.insert(index, metrics.volatility, tail[_VOLATILITY])
+            self.var_trend.insert(index, metrics.var, tail[_VAR])
+            self.risk_trend.insert(index, composite, tail[_COMPOSITE])
+            self._data[:, position + 1:end + 1] = self._data[:, position:end]
+            self._data[:, position] = values
+        self._end += 1
+
+        self._updates += 1
+        if self._updates >= max(self.recompute_interval, len(self)):
+            self.recompute()
+
+    def expire(self, cutoff: datetime) -> None:
+        """Drop metrics at or before ``cutoff``"""
+        if self._end == self._start:
+            return
+        cutoff = cutoff.timestamp()
+        timestamps = self._data[_TIMESTAMP, self._start:self._end]
+        if timestamps[0] > cutoff:
+            return
+        if len(timestamps) == 1 or timestamps[1] > cutoff:
+            # Steady state: one metric in, one metric out
+            oldest = self._data[:, self._start].tolist()
+            self.volatility_trend.popleft(oldest[_VOLATILITY])
+            self.var_trend.popleft(oldest[_VAR])
+            self.risk_trend.popleft(oldest[_COMPOSITE])
+            self._start += 1
+            return
+        count = int(np.searchsorted(timestamps, cutoff, side="right"))
+        expired = self._data[:, self._start:self._start + count]
+        self.volatility_trend.popleft_many(expired[_VOLATILITY])
+        self.var_trend.popleft_many(expired[_VAR])
+        self.risk_trend.popleft_many(expired[_COMPOSITE])
+        self._start += count
+
+    def recompute(self) -> None:
+        """Rebuild the composite column and trend statistics exactly"""
+        live = self._data[:, self._start:self._end]
+        live[_COMPOSITE] = composite_risk(
+            live[_VOLATILITY], live[_VAR], live[_SHORTFALL], live[_LIQUIDITY], self.weights
+        )
+        self.volatility_trend.reset(live[_VOLATILITY])
+        self.var_trend.reset(live[_VAR])
+        self.risk_trend.reset(live[_COMPOSITE])
+        self._updates = 0
+
+    def momentum(self, short_window: int = 5, long_window: int = 20) -> float:
+        """Mean of the last ``short_window`` composites minus the last ``long_window``"""
+        if len(self) < 2:
+            return 0.0
+        composite = self._data[_COMPOSITE, self._start:self._end]
+        return float(composite[-short_window:].mean() - composite[-long_window:].mean())
+
+    def _reserve(self) -> None:
+        """Make room for one more entry at ``end``, compacting or doubling"""
+        capacity = self._data.shape[1]
+        if self._end < capacity:
+            return
+        count = len(self)
+        if 2 * count > capacity:
+            data = np.empty((len(RISK_FIELDS), 2 * capacity))
+            data[:, :count] = self._data[:, self._start:self._end]
+            self._data = data
+        else:
+            self._data[:, :count] = self._data[:, self._start:self._end]
+        self._start, self._end = 0, count
+
+
 class RiskManager:
     """Advanced risk management and monitoring system"""
     
     def __init__(self, config: Optional[Dict] = None):
         self.config = config or {}
-        self._risk_metrics: Dict[str, List[RiskMetrics]] = {}
+        # Per-token history ordered by timestamp, oldest first
+        self._risk_metrics: Dict[str, TokenRiskHistory] = {}
         self._risk_limits: Dict[str, float] = {}
         self._last_update: Optional[datetime] = None
         
     def update_metrics(self, metrics: RiskMetrics) -> None:
-        """Update risk metrics for a token"""
-        if metrics.token not in self._risk_metrics:
-            self._risk_metrics[metrics.token] = []
-            
-        self._risk_metrics[metrics.token].append(metrics)
-        self._last_update = datetime.now()
+        """Update risk metrics for a token
+        
+        In-order metrics are appended and expired ones popped from the left,
+        so updates are amortized O(1); a late metric's position is found by
+        binary search and newer entries shift along to make room for it.
+        Composite risk is scored here, once.
+        """
+        history = self._risk_metrics.get(metrics.token)
+        if history is None:
+            history = self._risk_metrics[metrics.token] = TokenRiskHistory(
+                metrics.token,
+                self.config.get("trend_recompute_interval", 1000),
+                self.config.get("risk_weights")
+            )
+        now = datetime.now()
+        self._last_update = now
         
         # Maintain history window
         window_days = self.config.get("risk_window_days", 30)
-        cutoff = datetime.now() - timedelta(days=window_days)
+        cutoff = now - timedelta(days=window_days)
         
-        self._risk_metrics[metrics.token] = [
-            m for m in self._risk_metrics[metrics.token]
-            if m.timestamp > cutoff
-        ]
+        if metrics.timestamp > cutoff:
+            history.insert(metrics, self._calculate_composite_risk(metrics))
+        history.expire(cutoff)
     
     def set_risk_limit(self, token: str, limit: float) -> None:
         """Set risk limit for a token"""
@@ -47,13 +240,12 @@ class RiskManager:
         if token not in self._risk_metrics or not self._risk_metrics[token]:
             return None
             
-        current_metrics = self._risk_metrics[token][-1]
         limit = self._risk_limits.get(token)
         
         if limit is None:
             return None
             
-        composite_risk = self._calculate_composite_risk(current_metrics)
+        composite_risk = self._risk_metrics[token].latest_composite
         
         if composite_risk > limit:
             return {
@@ -80,51 +272,35 @@ class RiskManager:
             if not self._risk_metrics[token]:
                 continue
                 
-            metrics = self._risk_metrics[token]
-            report["token_metrics"][token] = self._calculate_token_metrics(metrics)
+            history = self._risk_metrics[token]
+            report["token_metrics"][token] = self._calculate_token_metrics(history)
             
             breach = self.check_risk_breach(token)
             if breach:
                 report["risk_breaches"].append(breach)
                 
-            report["trend_analysis"][token] = self._analyze_risk_trends(metrics)
+            report["trend_analysis"][token] = self._analyze_risk_trends(history)
             
         return report
     
     def _calculate_composite_risk(self, metrics: RiskMetrics) -> float:
         """Calculate composite risk score from multiple metrics"""
-        weights = self.config.get("risk_weights", {
-            "volatility": 0.3,
-            "var": 0.3,
-            "expected_shortfall": 0.2,
-            "liquidity": 0.2
-        })
-        
-        # Normalize metrics to 0-1 scale
-        normalized = {
-            "volatility": min(metrics.volatility * 10, 1),
-            "var": min(abs(metrics.var) * 5, 1),
-            "expected_shortfall": min(abs(metrics.expected_shortfall) * 5, 1),
-            "liquidity": 1 - metrics.liquidity_score
-        }
-        
-        return sum(
-            normalized[key] * weight
-            for key, weight in weights.items()
-        )
+        return float(composite_risk(
+            metrics.volatility,
+            metrics.var,
+            metrics.expected_shortfall,
+            metrics.liquidity_score,
+            self.config.get("risk_weights")
+        ))
     
     def _calculate_global_metrics(self) -> Dict:
         """Calculate system-wide risk metrics"""
-        all_risks = []
-        
-        for token_metrics in self._risk_metrics.values():
-            if not token_metrics:
-                continue
-            all_risks.append(
-                self._calculate_composite_risk(token_metrics[-1])
-            )
+        all_risks = np.fromiter(
+            (history.latest_composite for history in self._risk_metrics.values() if history),
+            dtype=np.float64
+        )
             
-        if not all_risks:
+        if not all_risks.size:
             return {
                 "average_risk": 0,
                 "max_risk": 0,
@@ -137,60 +313,27 @@ class RiskManager:
             "risk_concentration": float(np.std(all_risks))
         }
     
-    def _calculate_token_metrics(self, metrics: List[RiskMetrics]) -> Dict:
+    def _calculate_token_metrics(self, history: TokenRiskHistory) -> Dict:
         """Calculate detailed metrics for a token"""
-        recent = metrics[-1]
+        recent = history.latest()
         
         return {
-            "current_risk": self._calculate_composite_risk(recent),
-            "volatility_trend": self._calculate_metric_trend(
-                [m.volatility for m in metrics]
-            ),
-            "var_trend": self._calculate_metric_trend(
-                [m.var for m in metrics]
-            ),
+            "current_risk": history.latest_composite,
+            "volatility_trend": history.volatility_trend.slope,
+            "var_trend": history.var_trend.slope,
             "liquidity_score": recent.liquidity_score,
             "metrics_timestamp": recent.timestamp
         }
     
-    def _analyze_risk_trends(self, metrics: List[RiskMetrics]) -> Dict:
+    def _analyze_risk_trends(self, history: TokenRiskHistory) -> Dict:
         """Analyze trends in risk metrics"""
-        if len(metrics) < 2:
+        if len(history) < 2:
             return {"trend": "insufficient_data"}
             
-        risk_scores = [
-            self._calculate_composite_risk(m)
-            for m in metrics
-        ]
-        
-        trend = self._calculate_metric_trend(risk_scores)
+        trend = history.risk_trend.slope
         
         return {
             "trend_direction": "increasing" if trend > 0 else "decreasing",
             "trend_strength": abs(trend),
-            "current_momentum": self._calculate_momentum(risk_scores)
+            "current_momentum": history.momentum()
         }
-    
-    def _calculate_metric_trend(self, values: List[float]) -> float:
-        """Calculate trend in a metric using linear regression"""
-        if len(values) < 2:
-            return 0.0
-            
-        x = np.arange(len(values))
-        y = np.array(values)
-        z = np.polyfit(x, y, 1)
-        return float(z[0])
-    
-    def _calculate_momentum(self, values: List[float]) -> float:
-        """Calculate momentum indicator for risk metrics"""
-        if len(values) < 2:
-            return 0.0
-            
-        short_window = min(5, len(values))
-        long_window = min(20, len(values))
-        
-        short_avg = np.mean(values[-short_window:])
-        long_avg = np.mean(values[-long_window:])
-        
-        return float(short_avg - long_avg)
-
@@ -0,0 +1,172 @@
+from typing import Dict, Iterable, List, Optional, Union
+import math
+import numpy as np
+
+
+class TDigest:
+    """Mergeable t-digest of a stream of values for approximate quantiles
+
+    Values are buffered and folded into fewer than ``compression`` weighted
+    centroids. A compression pass sorts the buffer together with the
+    centroids and groups neighbours with ``np.add.reduceat`` wherever the
+    log-odds scale function k(q) = compression / Z * log(q / (1 - q)),
+    Z = 4 log(n / compression) + 24, crosses an integer, so centroids are
+    tiny in the tails (where VaR and expected shortfall are read) and large
+    in the middle. Larger ``compression`` trades memory for accuracy; memory
+    is bounded by the centroid count plus the buffer, independent of how
+    many values were added. Two digests merge by folding one's centroids into
+    the other, so shard-level digests can be combined without the raw
+    values; ``to_dict``/``from_dict`` serialize a digest for shipping.
+    """
+
+    def __init__(self, compression: float = 200, buffer_size: Optional[int] = None):
+        if compression < 10:
+            raise ValueError("compression must be at least 10")
+        self.compression = float(compression)
+        self._buffer = np.empty(buffer_size or int(5 * compression))
+        self._buffered = 0
+        self._pending: List[np.ndarray] = []
+        self._means = np.empty(0)
+        self._weights = np.empty(0)
+        self.count = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def __len__(self) -> int:
+        """Number of centroids after compression"""
+        self._compress()
+        return len(self._means)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the centroid arrays and the input buffer"""
+        return self._means.nbytes + self._weights.nbytes + self._buffer.nbytes
+
+    def update(self, value: float) -> None:
+        """Add one value"""
+        if self._buffered == len(self._buffer):
+            self._compress()
+        self._buffer[self._buffered] = value
+        self._buffered += 1
+        self.count += 1
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def update_many(self, values: Iterable[float]) -> "TDigest":
+        """Add a block of values"""
+        values = np.asarray(values, dtype=np.float64).ravel()
+        if not values.size:
+            return self
+        self._pending.append(np.stack([values, np.ones_like(values)]))
+        self.count += values.size
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        if sum(block.shape[1] for block in self._pending) >= len(self._buffer):
+            self._compress()
+        return self
+
+    def merge(self, other: "TDigest") -> "TDigest":
+        """Fold another digest's centroids into this one"""
+        other._compress()
+        if other.count:
+            self._pending.append(np.stack([other._means, other._weights]))
+            self.count += other.count
+            self.min = min(self.min, other.min)
+            self.max = max(self.max, other.max)
+            self._compress()
+        return self
+
+    @classmethod
+    def merge_all(cls, digests: Iterable["TDigest"], compression: Optional[float] = None) -> "TDigest":
+        """Combine digests (for example one per shard) into a new digest"""
+        digests = list(digests)
+        merged = cls(compression or max((d.compression for d in digests), default=200))
+        for digest in digests:
+            merged.merge(digest)
+        return merged
+
+    def quantile(self, q: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+        """Approximate value at quantile ``q`` in [0, 1]"""
+        knots, values = self._knots()
+        result = np.interp(np.asarray(q, dtype=np.float64) * self.count, knots, values)
+        return float(result) if np.ndim(result) == 0 else result
+
+    def tail_mean(self, q: float) -> float:
+        """Approximate mean of the values below quantile ``q``
+
+        Integrates the same piecewise-linear quantile function ``quantile``
+        interpolates, from rank 0 to ``q * count``.
+        """
+        knots, values = self._knots()
+        rank = q * self.count
+        if rank <= 0:
+            return float(values[0])
+        areas = np.concatenate([[0.0], np.cumsum(np.diff(knots) * (values[1:] + values[:-1]) / 2)])
+        i = min(int(np.searchsorted(knots, rank, side="right")) - 1, len(knots) - 2)
+        at_rank = np.interp(rank, knots, values)
+        partial = (rank - knots[i]) * (values[i] + at_rank) / 2
+        return float((areas[i] + partial) / rank)
+
+    def value_at_risk(self, confidence: float = 0.95) -> float:
+        """Approximate historical VaR of returns at ``confidence``"""
+        return self.quantile(1 - confidence)
+
+    def expected_shortfall(self, confidence: float = 0.95) -> float:
+        """Approximate mean return in the worst ``1 - confidence`` of outcomes"""
+        return self.tail_mean(1 - confidence)
+
+    def to_dict(self) -> Dict:
+        self._compress()
+        return {
+            "compression": self.compression,
+            "means": self._means.tolist(),
+            "weights": self._weights.tolist(),
+            "min": self.min,
+            "max": self.max
+        }
+
+    @classmethod
+    def from_dict(cls, state: Dict) -> "TDigest":
+        digest = cls(state["compression"])
+        digest._means = np.asarray(state["means"], dtype=np.float64)
+        digest._weights = np.asarray(state["weights"], dtype=np.float64)
+        digest.count = float(digest._weights.sum())
+        digest.min = state["min"]
+        digest.max = state["max"]
+        return digest
+
+    def _knots(self):
+        """Rank/value knots: min at rank 0, centroid means at their mid ranks, max at count"""
+        self._compress()
+        if not self.count:
+            raise ValueError("digest is empty")
+        centers = np.cumsum(self._weights) - self._weights / 2
+        knots = np.concatenate([[0.0], centers, [self.count]])
+        values = np.concatenate([[self.min], self._means, [self.max]])
+        return knots, values
+
+    def _compress(self) -> None:
+        if not self._buffered and not self._pending:
+            return
+        blocks = [np.stack([self._means, self._weights])] + self._pending
+        if self._buffered:
+            values = self._buffer[:self._buffered]
+            blocks.append(np.stack([values, np.ones_like(values)]))
+        items = np.concatenate(blocks, axis=1)
+        order = np.argsort(items[0], kind="stable")
+        means, weights = items[0, order], items[1, order]
+
+        total = weights.sum()
+        left = (np.cumsum(weights) - weights) / total
+        normalizer = 4 * math.log(max(total / self.compression, 1.0)) + 24
+        with np.errstate(divide="ignore"):
+            scale = self.compression / normalizer * np.log(left / (1 - left))
+        group = np.floor(np.clip(scale, -1e9, 1e9))
+        starts = np.flatnonzero(np.concatenate([[True], group[1:] != group[:-1]]))
+
+        self._weights = np.add.reduceat(weights, starts)
+        self._means = np.add.reduceat(means * weights, starts) / self._weights
+        self._pending = []
+        self._buffered = 0
@@ -0,0 +1,344 @@
+from typing import Optional
+import math
+import numpy as np
+
+from .buffers import MarketRingBuffer
+
+
+class RollingVariance:
+    """Welford-style mean/variance over a sliding window of values
+
+    Values can be pushed, removed or replaced in O(1). The variance is the
+    population variance (ddof=0), matching ``np.var``/``np.std`` defaults.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def push(self, value: float) -> None:
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+
+    def remove(self, value: float) -> None:
+        if self.count <= 1:
+            self.count, self.mean, self._m2 = 0, 0.0, 0.0
+            return
+        delta = value - self.mean
+        self.count -= 1
+        self.mean -= delta / self.count
+        self._m2 = max(self._m2 - delta * (value - self.mean), 0.0)
+
+    def replace(self, new_value: float, old_value: float) -> None:
+        """Swap an outgoing value for an incoming one at constant count"""
+        if not self.count:
+            self.push(new_value)
+            return
+        delta = new_value - old_value
+        old_mean = self.mean
+        self.mean += delta / self.count
+        self._m2 = max(self._m2 + delta * (new_value - self.mean + old_value - old_mean), 0.0)
+
+    def update_many(self, added: np.ndarray, removed: np.ndarray) -> None:
+        """Remove then add blocks of values using pairwise (Chan) merges"""
+        if len(removed):
+            n_b = len(removed)
+            n_a = self.count - n_b
+            if n_a <= 0:
+                self.count, self.mean, self._m2 = 0, 0.0, 0.0
+            else:
+                mean_b = float(np.mean(removed))
+                m2_b = float(np.sum((removed - mean_b) ** 2))
+                mean_a = (self.count * self.mean - n_b * mean_b) / n_a
+                delta = mean_b - mean_a
+                self._m2 = max(self._m2 - m2_b - delta * delta * n_a * n_b / self.count, 0.0)
+                self.count, self.mean = n_a, mean_a
+        if len(added):
+            n_a, n_b = self.count, len(added)
+            mean_b = float(np.mean(added))
+            m2_b = float(np.sum((added - mean_b) ** 2))
+            self.count = n_a + n_b
+            delta = mean_b - self.mean
+            self.mean += delta * n_b / self.count
+            self._m2 += m2_b + delta * delta * n_a * n_b / self.count
+
+    def reset(self, values: np.ndarray) -> None:
+        """Recompute the state exactly from the current window"""
+        self.count = len(values)
+        if not self.count:
+            self.mean, self._m2 = 0.0, 0.0
+            return
+        self.mean = float(np.mean(values))
+        self._m2 = float(np.sum((values - self.mean) ** 2))
+
+    @property
+    def variance(self) -> float:
+        return self._m2 / self.count if self.count else 0.0
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+
+class RollingSlope:
+    """Least-squares slope of a sliding window against x = 0..n-1
+
+    Keeps the running sums of y and i*y. Evicting the oldest value shifts
+    every remaining index down by one, which is a single subtraction of the
+    running sum of y, so both ends of the window update in O(1). Values are
+    stored relative to a reference level (reset on every exact recompute) to
+    keep the sums small and limit cancellation.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self._ref = 0.0
+        self._sum_y = 0.0
+        self._sum_iy = 0.0
+
+    def push(self, value: float) -> None:
+        y = value - self._ref
+        self._sum_iy += self.count * y
+        self._sum_y += y
+        self.count += 1
+
+    def popleft(self, value: float) -> None:
+        if self.count <= 1:
+            self.count, self._sum_y, self._sum_iy = 0, 0.0, 0.0
+            return
+        self._sum_y -= value - self._ref
+        self._sum_iy -= self._sum_y
+        self.count -= 1
+
+    def insert(self, index: int, value: float, tail_sum: float) -> None:
+        """Insert a value at ``index``; ``tail_sum`` is the sum of the values after it
+
+        The values from ``index`` onwards each move up one position, which
+        adds their sum to the index-weighted sum, so a value k places from
+        the end costs O(k) to find the tail sum and O(1) to fold in.
+        """
+        y = value - self._ref
+        tail = tail_sum - (self.count - index) * self._ref
+        self._sum_iy += index * y + tail
+        self._sum_y += y
+        self.count += 1
+
+    def extend(self, values: np.ndarray) -> None:
+        """Push a block of values, oldest first"""
+        y = values - self._ref
+        index = np.arange(self.count, self.count + len(values), dtype=np.float64)
+        self._sum_iy += float(np.dot(index, y))
+        self._sum_y += float(np.sum(y))
+        self.count += len(values)
+
+    def popleft_many(self, values: np.ndarray) -> None:
+        """Evict a block of the oldest values, oldest first"""
+        m = len(values)
+        if m >= self.count:
+            self.count, self._sum_y, self._sum_iy = 0, 0.0, 0.0
+            return
+        y = values - self._ref
+        self._sum_y -= float(np.sum(y))
+        self._sum_iy -= float(np.dot(np.arange(m, dtype=np.float64), y)) + m * self._sum_y
+        self.count -= m
+
+    def reset(self, values: np.ndarray) -> None:
+        """Recompute the state exactly from the current window"""
+        self.count = len(values)
+        if not self.count:
+            self._ref, self._sum_y, self._sum_iy = 0.0, 0.0, 0.0
+            return
+        self._ref = float(np.mean(values))
+        centered = values - self._ref
+        self._sum_y = float(np.sum(centered))
+        self._sum_iy = float(np.dot(np.arange(self.count, dtype=np.float64), centered))
+
+    @property
+    def slope(self) -> float:
+        n = self.count
+        if n < 2:
+            return 0.0
+        sum_x = n * (n - 1) / 2
+        denom = n * n * (n * n - 1) / 12
+        return (n * self._sum_iy - sum_x * self._sum_y) / denom
+
+
+class OnlineMarketStats:
+    """Incremental price volatility and volume trend for one token's window
+
+    Tracks the std of simple price returns and the first-degree polyfit
+    slope of volumes over the token's ring buffer, updated in O(1) per tick. To bound floating point
+    drift the state is rebuilt exactly from the buffer views every
+    ``recompute_interval`` updates, and immediately if it turns non-finite.
+    """
+
+    def __init__(self, recompute_interval: int):
+        self.recompute_interval = max(int(recompute_interval), 1)
+        self.returns = RollingVariance()
+        self.volume_trend = RollingSlope()
+        self._updates = 0
+
+    @property
+    def volatility(self) -> float:
+        return self.returns.std
+
+    @property
+    def trend(self) -> float:
+        return self.volume_trend.slope
+
+    def update(
+        self,
+        history: MarketRingBuffer,
+        evicted_price: Optional[float] = None,
+        evicted_volume: Optional[float] = None
+    ) -> None:
+        """Fold in the tick just appended to ``history``
+
+        ``evicted_price``/``evicted_volume`` are the values that the append
+        overwrote, or None while the buffer was still filling up.
+        """
+        prices = history.prices
+        n = len(prices)
+        new_return = (prices[-1] - prices[-2]) / prices[-2] if n >= 2 else None
+
+        if evicted_price is not None:
+            if new_return is not None:
+                old_return = (prices[0] - evicted_price) / evicted_price
+                self.returns.replace(new_return, old_return)
+            self.volume_trend.popleft(evicted_volume)
+        elif new_return is not None:
+            self.returns.push(new_return)
+        self.volume_trend.push(history.volumes[-1])
+
+        self._updates += 1
+        self._check_drift(history)
+
+    def update_many(
+        self,
+        history: MarketRingBuffer,
+        count: int,
+        evicted_prices: np.ndarray,
+        evicted_volumes: np.ndarray
+    ) -> None:
+        """Fold in ``count`` ticks just written to ``history`` with ``extend``
+
+        ``evicted_prices``/``evicted_volumes`` are the oldest values the
+        write overwrote, oldest first.
+        """
+        prices = history.prices
+        kept = len(prices) - count
+        if kept < 1:
+            # The whole window was replaced, or this is the first block
+            self.recompute(history)
+            return
+
+        tail = prices[-count - 1:]
+        removed = prices[:0]
+        if len(evicted_prices):
+            chain = np.append(evicted_prices, prices[0])
+            removed = np.diff(chain) / chain[:-1]
+            self.volume_trend.popleft_many(evicted_volumes)
+        self.returns.update_many(np.diff(tail) / tail[:-1], removed)
+        self.volume_trend.extend(history.volumes[-count:])
+
+        self._updates += count
+        self._check_drift(history)
+
+    def _check_drift(self, history: MarketRingBuffer) -> None:
+        if (
+            self._updates >= self.recompute_interval
+            or not math.isfinite(self.returns.mean)
+            or not math.isfinite(self.volume_trend.slope)
+        ):
+            self.recompute(history)
+
+    def recompute(self, history: MarketRingBuffer) -> None:
+        """Rebuild the statistics exactly from the buffer contents"""
+        prices = history.prices
+        if len(prices) >= 2:
+            self.returns.reset(np.diff(prices) / prices[:-1])
+        else:
+            self.returns.reset(prices[:0])
+        self.volume_trend.reset(history.volumes)
+        self._updates = 0
+
+
+class RollingCovariance:
+    """Sliding-window mean and covariance of multivariate return rows
+
+    Keeps the last ``window`` rows in a ring together with their column sums
+    and the sum of outer products. Adding k rows (and evicting as many old
+    ones) is a rank-k update of those sums, O(k * n^2) instead of the
+    O(window * n^2) full ``np.cov``. The sums are rebuilt from the stored
+    rows every ``window`` added rows to bound floating point drift.
+    """
+
+    def __init__(self, n_assets: int, window: int):
+        self.window = max(int(window), 1)
+        self._rows = np.zeros((self.window, n_assets), dtype=np.float64)
+        self._pos = 0
+        self.count = 0
+        self._sum = np.zeros(n_assets)
+        self._outer = np.zeros((n_assets, n_assets))
+        self._added = 0
+
+    def add(self, rows: np.ndarray) -> None:
+        """Append return rows (oldest first), evicting the oldest as needed"""
+        rows = np.atleast_2d(np.asarray(rows, dtype=np.float64))[-self.window:]
+        k = len(rows)
+        if not k:
+            return
+        slots = (self._pos + np.arange(k)) % self.window
+
+        evicted = max(self.count + k - self.window, 0)
+        if evicted:
+            old = self._rows[slots[k - evicted:]]
+            self._sum -= old.sum(axis=0)
+            self._outer -= old.T @ old
+        self._rows[slots] = rows
+        self._sum += rows.sum(axis=0)
+        self._outer += rows.T @ rows
+
+        self._pos = (self._pos + k) % self.window
+        self.count = min(self.count + k, self.window)
+        self._added += k
+        if self._added >= self.window:
+            self.recompute()
+
+    def trim(self, count: int) -> None:
+        """Drop the oldest rows so that at most ``count`` remain"""
+        excess = self.count - max(count, 0)
+        if excess <= 0:
+            return
+        slots = (self._pos - self.count + np.arange(excess)) % self.window
+        old = self._rows[slots]
+        self._sum -= old.sum(axis=0)
+        self._outer -= old.T @ old
+        self.count -= excess
+
+    def recompute(self) -> None:
+        """Rebuild the sums exactly from the stored rows"""
+        rows = self.rows
+        self._sum = rows.sum(axis=0)
+        self._outer = rows.T @ rows
+        self._added = 0
+
+    @property
+    def rows(self) -> np.ndarray:
+        """Stored rows, oldest first"""
+        return self._rows[(self._pos - self.count + np.arange(self.count)) % self.window]
+
+    @property
+    def mean(self) -> np.ndarray:
+        return self._sum / max(self.count, 1)
+
+    @property
+    def covariance(self) -> np.ndarray:
+        """Sample covariance (ddof=1), matching ``np.cov`` of the columns"""
+        if self.count < 2:
+            return np.full(self._outer.shape, np.nan)
+        mean = self.mean
+        return (self._outer - self.count * np.outer(mean, mean)) / (self.count - 1)
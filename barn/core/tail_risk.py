@@ -0,0 +1,232 @@
+from typing import Deque, Dict, List, Optional, Sequence, Tuple
+from bisect import bisect_left, insort
+from collections import deque
+from datetime import datetime
+import math
+import numpy as np
+
+from .risk_manager import RiskMetrics
+from .stats import RollingVariance
+
+
+def tail_risk(
+    sorted_returns: np.ndarray,
+    confidence: float,
+    count: Optional[int] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Historical VaR and expected shortfall from ascending returns (last axis)
+
+    VaR interpolates linearly between order statistics like
+    ``np.percentile(returns, (1 - confidence) * 100)``; expected shortfall
+    is the mean of the returns at or below the lower of those two order
+    statistics. With ``count`` given, ``sorted_returns`` only needs to hold
+    the lowest ``tail_size(count, confidence)`` of ``count`` returns.
+    """
+    sorted_returns = np.asarray(sorted_returns, dtype=np.float64)
+    count = sorted_returns.shape[-1] if count is None else count
+    position = (count - 1) * (1 - confidence)
+    index = int(math.floor(position))
+    lower = sorted_returns[..., index]
+    upper = sorted_returns[..., min(index + 1, count - 1)]
+    var = lower + (position - index) * (upper - lower)
+    return var, sorted_returns[..., :index + 1].mean(axis=-1)
+
+
+def tail_size(count: int, confidence: float) -> int:
+    """Number of lowest returns ``tail_risk`` reads from a sample of ``count``"""
+    return min(int(math.floor((count - 1) * (1 - confidence))) + 2, count)
+
+
+class SortedWindow:
+    """Sliding window of the last ``capacity`` values, also kept in sorted order
+
+    Sorted values live in buckets of at most ``2 * load`` entries with a
+    list of bucket maxima and running bucket sums, so locating a value is
+    a bisect over buckets and then within one, and an insert or evict moves
+    at most ``2 * load`` entries: O(log n) for a fixed load. Arrival order
+    is kept in a deque to know which value to evict. Order statistics and
+    sums of the k smallest values walk whole buckets from the left, about
+    k / load steps for the lower-tail ranks VaR and ES need.
+    """
+
+    def __init__(self, capacity: int, load: int = 256):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self._load = max(int(load), 2)
+        self._arrivals: Deque[float] = deque()
+        self._buckets: List[List[float]] = []
+        self._maxes: List[float] = []
+        self._sums: List[float] = []
+        self._pushes = 0
+
+    def __len__(self) -> int:
+        return len(self._arrivals)
+
+    @property
+    def values(self) -> List[float]:
+        """Window contents, oldest first"""
+        return list(self._arrivals)
+
+    def push(self, value: float) -> Optional[float]:
+        """Add a value; returns the evicted oldest value once the window is full"""
+        evicted = None
+        if len(self._arrivals) == self.capacity:
+            evicted = self._arrivals.popleft()
+            self._remove(evicted)
+        self._arrivals.append(value)
+        self._insert(value)
+        self._pushes += 1
+        # Re-add the bucket sums exactly once per window to bound drift
+        if self._pushes >= self.capacity:
+            self._sums = [math.fsum(bucket) for bucket in self._buckets]
+            self._pushes = 0
+        return evicted
+
+    def order_statistic(self, rank: int) -> float:
+        """The value with ``rank`` smaller values before it (0 is the minimum)"""
+        for bucket in self._buckets:
+            if rank < len(bucket):
+                return bucket[rank]
+            rank -= len(bucket)
+        raise IndexError("rank out of range")
+
+    def sum_smallest(self, count: int) -> float:
+        """Sum of the ``count`` smallest values"""
+        total = 0.0
+        for bucket, bucket_sum in zip(self._buckets, self._sums):
+            if count <= len(bucket):
+                return total + (bucket_sum if count == len(bucket) else math.fsum(bucket[:count]))
+            total += bucket_sum
+            count -= len(bucket)
+        return total
+
+    def smallest(self, count: int) -> List[float]:
+        """The ``count`` smallest values in ascending order"""
+        result: List[float] = []
+        for bucket in self._buckets:
+            needed = count - len(result)
+            if needed <= 0:
+                break
+            result.extend(bucket[:needed])
+        return result
+
+    def _insert(self, value: float) -> None:
+        if not self._buckets:
+            self._buckets.append([value])
+            self._maxes.append(value)
+            self._sums.append(value)
+            return
+        i = min(bisect_left(self._maxes, value), len(self._buckets) - 1)
+        bucket = self._buckets[i]
+        insort(bucket, value)
+        self._maxes[i] = bucket[-1]
+        self._sums[i] += value
+        if len(bucket) > 2 * self._load:
+            half = bucket[self._load:]
+            del bucket[self._load:]
+            self._buckets.insert(i + 1, half)
+            self._maxes[i] = bucket[-1]
+            self._maxes.insert(i + 1, half[-1])
+            self._sums[i] = math.fsum(bucket)
+            self._sums.insert(i + 1, math.fsum(half))
+
+    def _remove(self, value: float) -> None:
+        i = bisect_left(self._maxes, value)
+        bucket = self._buckets[i]
+        del bucket[bisect_left(bucket, value)]
+        if bucket:
+            self._maxes[i] = bucket[-1]
+            self._sums[i] -= value
+        else:
+            del self._buckets[i]
+            del self._maxes[i]
+            del self._sums[i]
+
+
+class RollingTailRisk:
+    """Historical VaR and expected shortfall over a sliding window of returns
+
+    Returns are kept in a ``SortedWindow``, so each tick costs one sorted
+    insert and evict and each confidence level reads only its lower tail;
+    nothing is re-sorted. Volatility (population std of the same returns)
+    is tracked alongside so ``to_metrics`` can produce a complete
+    ``RiskMetrics`` for ``RiskManager.update_metrics``.
+    """
+
+    def __init__(self, window: int, confidences: Sequence[float] = (0.95, 0.99)):
+        self.confidences = tuple(confidences)
+        self._window = SortedWindow(window)
+        self._variance = RollingVariance()
+        self._last_price: Optional[float] = None
+        self._pushes = 0
+
+    def __len__(self) -> int:
+        return len(self._window)
+
+    @property
+    def volatility(self) -> float:
+        return self._variance.std
+
+    def push(self, value: float) -> None:
+        """Add one return, evicting the oldest once the window is full"""
+        evicted = self._window.push(value)
+        if evicted is None:
+            self._variance.push(value)
+        else:
+            self._variance.replace(value, evicted)
+        self._pushes += 1
+        # Rebuild the variance exactly once per window to bound drift
+        if self._pushes >= self._window.capacity:
+            self._variance.reset(np.array(self._window.values))
+            self._pushes = 0
+
+    def push_price(self, price: float) -> None:
+        """Add the simple return from the previous price, if there is one"""
+        if self._last_price is not None:
+            self.push((price - self._last_price) / self._last_price)
+        self._last_price = price
+
+    def value_at_risk(self, confidence: float = 0.95) -> float:
+        return self._tail(confidence)[0]
+
+    def expected_shortfall(self, confidence: float = 0.95) -> float:
+        return self._tail(confidence)[1]
+
+    def levels(self) -> Dict[float, Dict[str, float]]:
+        """VaR and expected shortfall at every configured confidence level"""
+        result = {}
+        for confidence in self.confidences:
+            var, shortfall = self._tail(confidence)
+            result[confidence] = {"var": var, "expected_shortfall": shortfall}
+        return result
+
+    def to_metrics(
+        self,
+        token: str,
+        liquidity_score: float,
+        confidence: Optional[float] = None,
+        timestamp: Optional[datetime] = None
+    ) -> RiskMetrics:
+        """Current window as a RiskMetrics record at ``confidence``"""
+        var, shortfall = self._tail(confidence if confidence is not None else self.confidences[0])
+        return RiskMetrics(
+            token=token,
+            volatility=self.volatility,
+            var=var,
+            expected_shortfall=shortfall,
+            liquidity_score=liquidity_score,
+            timestamp=timestamp or datetime.now()
+        )
+
+    def _tail(self, confidence: float) -> Tuple[float, float]:
+        """VaR and expected shortfall with the same definitions as ``tail_risk``"""
+        count = len(self._window)
+        if not count:
+            return float("nan"), float("nan")
+        position = (count - 1) * (1 - confidence)
+        index = int(math.floor(position))
+        lower = self._window.order_statistic(index)
+        upper = self._window.order_statistic(min(index + 1, count - 1))
+        var = lower + (position - index) * (upper - lower)
+        return var, self._window.sum_smallest(index + 1) / (index + 1)
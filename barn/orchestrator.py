@@ -1,18 +1,28 @@
-from typing import Dict, List, Type
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Dict, Iterable, List, Optional, Tuple, Union
 from .agents.base import BaseAgent, AgentPool
 from .agents.risk_analyzer import RiskAnalyzerAgent
 from .agents.trading_agent import TradingAgent
 from .agents.portfolio_manager import PortfolioManagerAgent
+from .streaming import StreamingPipeline, StreamResult
 import asyncio
 import logging
 
 class BarnOrchestrator:
-    """Orchestrates the interaction between different agents in the Barn System."""
+    """Orchestrates the interaction between different agents in the Barn System.
+    
+    Agents declare the context entries they read (``inputs``) and produce
+    (``outputs``). The dependency graph between them is built when agents
+    are registered, and each market update runs every agent as soon as
+    its producers have finished, so independent agents run concurrently.
+    """
     
     def __init__(self, config: Dict = None):
         self.config = config or {}
         self.agent_pool = AgentPool()
+        self.agents: Dict[str, BaseAgent] = {}
         self.logger = logging.getLogger(__name__)
+        # (agent, names of agents it waits for) in dependency order
+        self._stages: List[Tuple[BaseAgent, Tuple[str, ...]]] = []
         
     def initialize_agents(self) -> None:
         """Initialize and register all required agents."""
@@ -23,41 +33,113 @@ class BarnOrchestrator:
         }
         
         for agent_class, params in agent_configs.items():
-            agent = agent_class(**params)
-            self.agent_pool.add_agent(agent)
+            self.add_agent(agent_class(**params))
             self.logger.info(f"Initialized agent: {params['name']}")
     
+    def add_agent(self, agent: BaseAgent) -> None:
+        """Register an agent and reschedule the dependency graph."""
+        if agent.name in self.agents:
+            raise ValueError(f"Agent already registered: {agent.name}")
+        agents = {**self.agents, agent.name: agent}
+        self._stages = self._build_stages(agents)
+        self.agents = agents
+        self.agent_pool.add_agent(agent)
+    
+    def get_agent(self, name: str) -> BaseAgent:
+        """Look up a registered agent by name."""
+        return self.agents[name]
+    
+    @staticmethod
+    def _build_stages(agents: Dict[str, BaseAgent]) -> List[Tuple[BaseAgent, Tuple[str, ...]]]:
+        """Order agents so every agent follows the producers of its inputs."""
+        producers: Dict[str, str] = {}
+        for agent in agents.values():
+            for output in agent.outputs:
+                if output in producers:
+                    raise ValueError(f"Output {output!r} produced by both {producers[output]} and {agent.name}")
+                producers[output] = agent.name
+        
+        # Inputs nobody produces (such as market_data) come from the caller
+        dependencies = {
+            name: tuple(dict.fromkeys(producers[key] for key in agent.inputs if key in producers))
+            for name, agent in agents.items()
+        }
+        stages = []
+        scheduled = set()
+        pending = list(agents)
+        while pending:
+            ready = [name for name in pending if scheduled.issuperset(dependencies[name])]
+            if not ready:
+                raise ValueError(f"Agent dependency cycle among: {', '.join(pending)}")
+            for name in ready:
+                stages.append((agents[name], dependencies[name]))
+                scheduled.add(name)
+            pending = [name for name in pending if name not in scheduled]
+        return stages
+    
     async def process_market_data(self, market_data: Dict) -> Dict:
         """Process new market data through all agents."""
-        results = {}
+        context: Dict[str, Any] = {"market_data": market_data}
+        tasks: Dict[str, asyncio.Task] = {}
         
-        # Update all agents with new market data
-        for agent in self.agent_pool.agents:
+        async def run_stage(agent: BaseAgent, dependencies: Tuple[str, ...]) -> None:
+            if dependencies:
+                await asyncio.gather(*(tasks[name] for name in dependencies))
             agent.update_state({"market_data": market_data})
+            agent.prepare(context)
+            result = await agent.run()
+            if len(agent.outputs) == 1:
+                context[agent.outputs[0]] = result
+            else:
+                context.update({key: result[key] for key in agent.outputs})
         
-        # Run risk analysis
-        risk_analyzer = next(a for a in self.agent_pool.agents if isinstance(a, RiskAnalyzerAgent))
-        risk_analysis = await risk_analyzer.run()
-        results["risk_analysis"] = risk_analysis
-        
-        # Update trading agent with risk analysis
-        trader = next(a for a in self.agent_pool.agents if isinstance(a, TradingAgent))
-        trader.update_state({"signal_data": {"risk_score": risk_analysis.get("risk_score", 1.0)}})
-        trade_decision = await trader.run()
-        results["trade_decision"] = trade_decision
+        for agent, dependencies in self._stages:
+            tasks[agent.name] = asyncio.ensure_future(run_stage(agent, dependencies))
+        try:
+            await asyncio.gather(*tasks.values())
+        except BaseException:
+            for task in tasks.values():
+                task.cancel()
+            raise
         
-        # Update portfolio manager
-        portfolio_manager = next(a for a in self.agent_pool.agents if isinstance(a, PortfolioManagerAgent))
-        portfolio_manager.update_state({
-            "portfolio_data": {
-                "current_allocation": market_data.get("portfolio", {}),
-                "historical_returns": market_data.get("historical_returns", {})
-            }
-        })
-        portfolio_update = await portfolio_manager.run()
-        results["portfolio_update"] = portfolio_update
+        del context["market_data"]
+        return context
+    
+    async def stream(
+        self,
+        updates: Union[AsyncIterable[Tuple[str, Dict]], Iterable[Tuple[str, Dict]]],
+        pipeline_factory: Optional[Callable[[], "BarnOrchestrator"]] = None
+    ) -> AsyncIterator[StreamResult]:
+        """Stream (token, market_data) updates through per-token pipelines.
         
-        return results
+        Each token is processed by its own orchestrator from
+        ``pipeline_factory`` (by default a fresh one with this config), so
+        agent state stays isolated per token. Results are yielded as they
+        complete, in order within each token. ``stream_workers`` and
+        ``stream_queue_size`` in the config set the worker count and the
+        bound on every queue; ``stream_max_pipelines`` caps how many token
+        pipelines are kept, evicting the least recently updated.
+        """
+        pipeline = StreamingPipeline(
+            pipeline_factory or self._new_pipeline,
+            workers=self.config.get("stream_workers", 4),
+            queue_size=self.config.get("stream_queue_size", 100),
+            max_pipelines=self.config.get("stream_max_pipelines")
+        )
+        async with pipeline:
+            feeder = asyncio.ensure_future(pipeline.feed(updates))
+            try:
+                async for result in pipeline:
+                    yield result
+                # Surface errors raised by the update source
+                await feeder
+            finally:
+                feeder.cancel()
+    
+    def _new_pipeline(self) -> "BarnOrchestrator":
+        pipeline = BarnOrchestrator(self.config)
+        pipeline.initialize_agents()
+        return pipeline
     
     async def run(self, market_data: Dict) -> Dict:
         """Main execution loop for the Barn System."""
@@ -69,4 +151,3 @@ class BarnOrchestrator:
         except Exception as e:
             self.logger.error(f"Error in Barn System execution: {str(e)}")
             raise
-
@@ -0,0 +1,178 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Dict, Iterable, List, Optional, Set, Tuple, Union
+import asyncio
+import logging
+import time
+import zlib
+
+# Queue markers: _STOP ends a shard worker, _DONE reports a worker finished
+_STOP = object()
+_DONE = object()
+
+Update = Tuple[str, Dict]
+
+
+@dataclass
+class StreamResult:
+    """Outcome of one market update pushed through a token's pipeline."""
+
+    token: str
+    sequence: int
+    results: Optional[Dict] = None
+    error: Optional[BaseException] = None
+    latency: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class StreamingPipeline:
+    """Push a continuous multi-token feed through isolated per-token pipelines.
+
+    Every token gets its own pipeline from ``pipeline_factory`` (an object
+    with an async ``process_market_data``, normally a BarnOrchestrator), so
+    agent state never crosses tokens. Tokens are sharded by a stable hash
+    over ``workers`` worker tasks, each with a queue of ``queue_size``
+    updates; a shard runs its updates one at a time, which keeps every
+    token's updates in order while different shards overlap. ``submit``
+    waits while the token's shard queue is full and workers wait while the
+    result queue is full, so a slow consumer throttles ingestion instead of
+    growing memory. A failing update is reported in its StreamResult and
+    the stream carries on. With ``max_pipelines`` set, the pipelines of the
+    least recently updated tokens are evicted beyond that many (a token seen
+    again starts from a fresh pipeline); ``drop`` releases one explicitly.
+
+        async with StreamingPipeline(factory) as pipeline:
+            feeder = asyncio.ensure_future(pipeline.feed(updates))
+            async for result in pipeline:
+                ...
+    """
+
+    def __init__(
+        self,
+        pipeline_factory: Callable[[], Any],
+        workers: int = 4,
+        queue_size: int = 100,
+        max_pipelines: Optional[int] = None
+    ):
+        self.pipeline_factory = pipeline_factory
+        self.workers = max(int(workers), 1)
+        self.queue_size = max(int(queue_size), 1)
+        self.max_pipelines = None if max_pipelines is None else max(int(max_pipelines), 1)
+        # Least recently updated token first
+        self.pipelines: "OrderedDict[str, Any]" = OrderedDict()
+        self.evicted = 0
+        self._active: Set[str] = set()
+        self.logger = logging.getLogger("barn.streaming")
+        self._shards: List[asyncio.Queue] = []
+        self._results: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._sequence = 0
+        self._closed = False
+
+    async def __aenter__(self) -> "StreamingPipeline":
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def start(self) -> None:
+        """Create the queues and worker tasks on the running event loop."""
+        if self._tasks:
+            return
+        self._shards = [asyncio.Queue(self.queue_size) for _ in range(self.workers)]
+        self._results = asyncio.Queue(self.queue_size)
+        self._tasks = [asyncio.ensure_future(self._work(shard)) for shard in self._shards]
+
+    async def submit(self, token: str, market_data: Dict) -> int:
+        """Queue one update for ``token``, waiting while its shard is full."""
+        if self._closed:
+            raise RuntimeError("pipeline is closed")
+        self.start()
+        sequence = self._sequence
+        self._sequence += 1
+        await self._shards[self._shard(token)].put((sequence, token, market_data))
+        return sequence
+
+    async def feed(self, updates: Union[AsyncIterable[Update], Iterable[Update]]) -> None:
+        """Submit every (token, market_data) pair, then close the pipeline."""
+        try:
+            if hasattr(updates, "__aiter__"):
+                async for token, market_data in updates:
+                    await self.submit(token, market_data)
+            else:
+                for token, market_data in updates:
+                    await self.submit(token, market_data)
+        finally:
+            await self.close()
+
+    async def close(self) -> None:
+        """Stop accepting updates; iteration ends once queued ones finish."""
+        if self._closed:
+            return
+        self.start()
+        self._closed = True
+        for shard in self._shards:
+            await shard.put(_STOP)
+
+    async def __aiter__(self) -> AsyncIterator[StreamResult]:
+        self.start()
+        running = len(self._tasks)
+        while running:
+            item = await self._results.get()
+            if item is _DONE:
+                running -= 1
+            else:
+                yield item
+
+    def drop(self, token: str) -> bool:
+        """Release ``token``'s pipeline; its next update starts a fresh one."""
+        return self.pipelines.pop(token, None) is not None
+
+    def _shard(self, token: str) -> int:
+        # crc32 rather than hash() so placement is stable across processes
+        return zlib.crc32(token.encode()) % self.workers
+
+    async def _work(self, shard: asyncio.Queue) -> None:
+        while True:
+            item = await shard.get()
+            if item is _STOP:
+                break
+            sequence, token, market_data = item
+            await self._results.put(await self._process(sequence, token, market_data))
+        await self._results.put(_DONE)
+
+    async def _process(self, sequence: int, token: str, market_data: Dict) -> StreamResult:
+        pipeline = self.pipelines.get(token)
+        if pipeline is None:
+            pipeline = self.pipelines[token] = self.pipeline_factory()
+        else:
+            self.pipelines.move_to_end(token)
+        self._active.add(token)
+        self._evict()
+        start = time.perf_counter()
+        try:
+            results = await pipeline.process_market_data(market_data)
+        except Exception as e:
+            self.logger.warning(f"Update {sequence} for {token} failed: {e}")
+            return StreamResult(token, sequence, error=e, latency=time.perf_counter() - start)
+        finally:
+            self._active.discard(token)
+            self._evict()
+        return StreamResult(token, sequence, results, latency=time.perf_counter() - start)
+
+    def _evict(self) -> None:
+        # Pipelines with an update in flight on another shard are kept until
+        # it finishes, so the bound can be exceeded by up to workers - 1
+        if self.max_pipelines is None:
+            return
+        excess = len(self.pipelines) - self.max_pipelines
+        idle = (token for token in self.pipelines if token not in self._active)
+        for token in [token for _, token in zip(range(excess), idle)]:
+            del self.pipelines[token]
+            self.evicted += 1
@@ -0,0 +1,61 @@
+"""AgentPool.run_all wall time against a sequential await loop.
+
+Each agent awaits a random I/O-like delay. The sequential loop is how
+run_all used to work: wall time is the sum of the delays, while the
+concurrent pool should approach the slowest agent (or the sum over
+waves when max_concurrency caps it).
+
+    python benchmarks/bench_agent_pool.py --agents 50 --limits 0,10
+"""
+import argparse
+import asyncio
+import time
+
+import numpy as np
+
+from barn.agents.base import AgentPool, BaseAgent
+
+
+class DelayAgent(BaseAgent):
+    async def process(self, input_data):
+        return input_data
+
+    async def run(self):
+        await asyncio.sleep(self.config["delay"])
+        return self.name
+
+
+async def sequential(pool):
+    return [await agent.run() for agent in pool.agents]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--agents", type=int, default=50)
+    parser.add_argument("--mean-delay", type=float, default=0.02)
+    parser.add_argument("--limits", default="0,10", help="max_concurrency values, 0 for unbounded")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    pool = AgentPool()
+    for i, delay in enumerate(rng.exponential(args.mean_delay, args.agents)):
+        pool.add_agent(DelayAgent(f"agent_{i}", {"delay": float(delay)}))
+    slowest = max(agent.config["delay"] for agent in pool.agents)
+
+    start = time.perf_counter()
+    asyncio.run(sequential(pool))
+    serial = time.perf_counter() - start
+
+    print(f"agents={args.agents} mean_delay={args.mean_delay}s slowest={slowest:.3f}s")
+    print(f"{'mode':<20}{'seconds':>10}{'speedup':>10}")
+    print(f"{'sequential':<20}{serial:10.3f}{1.0:10.2f}")
+    for limit in (int(l) for l in args.limits.split(",")):
+        start = time.perf_counter()
+        asyncio.run(pool.run_all(max_concurrency=limit or None))
+        elapsed = time.perf_counter() - start
+        label = f"run_all limit={limit or 'none'}"
+        print(f"{label:<20}{elapsed:10.3f}{serial / elapsed:10.2f}")
+
+
+if __name__ == "__main__":
+    main()
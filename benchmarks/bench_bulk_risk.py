@@ -0,0 +1,71 @@
+"""Bulk columnar risk endpoint against per-token /risk-assessment calls.
+
+Runs the FastAPI backend in-process through its test client, so numbers
+include request parsing, validation, scoring and response encoding but
+not the network. Payload sizes are the request bodies as sent.
+
+    python benchmarks/bench_bulk_risk.py --series 2000 --length 250
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.main import app  # noqa: E402
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--series", type=int, default=2000)
+    parser.add_argument("--length", type=int, default=250)
+    parser.add_argument("--single-sample", type=int, default=200,
+                        help="per-token requests timed for the single-route rate")
+    args = parser.parse_args()
+
+    client = TestClient(app)
+    rng = np.random.default_rng(0)
+    prices = 100 * np.cumprod(1 + rng.normal(0, 0.01, (args.series, args.length)), axis=1)
+    tokens = [f"T{i}" for i in range(args.series)]
+
+    single_bodies = [json.dumps([{"price": p} for p in row]).encode() for row in prices[:args.single_sample].tolist()]
+    start = time.perf_counter()
+    for body in single_bodies:
+        client.post("/risk-assessment", content=body, headers={"content-type": "application/json"})
+    single = (time.perf_counter() - start) / len(single_bodies)
+    single_bytes = np.mean([len(body) for body in single_bodies]) * args.series
+
+    modes = [("bulk json", "application/json", json.dumps({"tokens": tokens, "prices": prices.tolist()}).encode())]
+    if msgpack is not None:
+        modes.append(("bulk msgpack", "application/msgpack",
+                      msgpack.packb({"tokens": tokens, "prices": prices.tolist()})))
+        modes.append(("bulk msgpack f8", "application/msgpack",
+                      msgpack.packb({"tokens": tokens, "prices": [row.astype("<f8").tobytes() for row in prices]})))
+
+    print(f"series={args.series} length={args.length}")
+    print(f"{'mode':<18}{'seconds':>10}{'series/s':>12}{'request MB':>12}{'speedup':>10}")
+    total = single * args.series
+    print(f"{'per-token json':<18}{total:10.3f}{args.series / total:12.0f}{single_bytes / 2 ** 20:12.2f}{1.0:10.2f}")
+    for label, content_type, body in modes:
+        start = time.perf_counter()
+        response = client.post("/risk-assessment/bulk", content=body, headers={"content-type": content_type})
+        elapsed = time.perf_counter() - start
+        assert response.status_code == 200 and response.text.count("\n") == args.series
+        print(f"{label:<18}{elapsed:10.3f}{args.series / elapsed:12.0f}{len(body) / 2 ** 20:12.2f}{total / elapsed:10.2f}")
+    if msgpack is None:
+        print("(msgpack not installed; binary modes skipped)")
+
+
+if __name__ == "__main__":
+    main()
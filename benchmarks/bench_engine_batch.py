@@ -0,0 +1,98 @@
+"""Signals/second for batched versus per-signal TokenAnalysisEngine ingestion.
+
+Feeds the same randomly interleaved multi-token tick stream through
+``process_market_signal`` one tick at a time and through
+``process_market_signals`` in bursts (both as MarketSignal lists and as
+columnar arrays).
+
+    python benchmarks/bench_engine_batch.py --tokens 1000 --burst 5000
+"""
+import argparse
+import asyncio
+import time
+from datetime import datetime
+
+import numpy as np
+
+from barn.core import TokenAnalysisEngine, MarketSignal
+
+
+def make_feed(n_ticks, n_tokens, seed=0):
+    rng = np.random.default_rng(seed)
+    tokens = np.array([f"TOK{i}" for i in range(n_tokens)])[rng.integers(0, n_tokens, n_ticks)]
+    prices = 100 * (1 + rng.normal(0, 0.01, n_ticks))
+    volumes = rng.uniform(1e3, 1e4, n_ticks)
+    rsi = rng.uniform(0, 100, n_ticks)
+    timestamps = datetime.now().timestamp() + np.arange(n_ticks) * 1e-3
+    return {
+        "token": tokens,
+        "timestamp": timestamps,
+        "price": prices,
+        "volume": volumes,
+        "indicators": {"rsi": rsi}
+    }
+
+
+def to_signals(feed):
+    return [
+        MarketSignal(datetime.fromtimestamp(ts), str(token), float(price), float(volume), {"rsi": float(rsi)})
+        for token, ts, price, volume, rsi in zip(
+            feed["token"], feed["timestamp"], feed["price"], feed["volume"], feed["indicators"]["rsi"]
+        )
+    ]
+
+
+def slice_feed(feed, start, stop):
+    batch = {key: feed[key][start:stop] for key in ("token", "timestamp", "price", "volume")}
+    batch["indicators"] = {"rsi": feed["indicators"]["rsi"][start:stop]}
+    return batch
+
+
+async def run(args):
+    config = {"market_window_size": args.window}
+    warmup = make_feed(args.window * args.tokens // 4 or 1, args.tokens, seed=1)
+    feed = make_feed(args.ticks, args.tokens)
+    signals = to_signals(feed)
+
+    async def fresh_engine():
+        engine = TokenAnalysisEngine(config)
+        await engine.process_market_signals(warmup)
+        return engine
+
+    engine = await fresh_engine()
+    start = time.perf_counter()
+    for signal in signals[:args.single_ticks]:
+        await engine.process_market_signal(signal)
+    single = args.single_ticks / (time.perf_counter() - start)
+
+    engine = await fresh_engine()
+    start = time.perf_counter()
+    for i in range(0, len(signals), args.burst):
+        await engine.process_market_signals(signals[i:i + args.burst])
+    batch_signals = len(signals) / (time.perf_counter() - start)
+
+    engine = await fresh_engine()
+    start = time.perf_counter()
+    for i in range(0, args.ticks, args.burst):
+        await engine.process_market_signals(slice_feed(feed, i, i + args.burst))
+    batch_columns = args.ticks / (time.perf_counter() - start)
+
+    print(f"tokens={args.tokens} window={args.window} burst={args.burst}")
+    print(f"{'mode':<28} {'signals/s':>12}")
+    print(f"{'single process_market_signal':<28} {single:>12,.0f}")
+    print(f"{'batch (MarketSignal list)':<28} {batch_signals:>12,.0f}")
+    print(f"{'batch (columnar arrays)':<28} {batch_columns:>12,.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tokens", type=int, default=1000)
+    parser.add_argument("--window", type=int, default=100)
+    parser.add_argument("--ticks", type=int, default=50000)
+    parser.add_argument("--burst", type=int, default=5000)
+    parser.add_argument("--single-ticks", type=int, default=5000)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
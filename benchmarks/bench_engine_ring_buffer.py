@@ -0,0 +1,92 @@
+"""Per-tick cost of TokenAnalysisEngine market state updates.
+
+Compares the ring-buffer market state against the previous list-of-dicts
+implementation (append, then re-slice to the window) for window sizes from
+100 to 100k ticks, and reports the cost of a full ``process_market_signal``.
+
+    python benchmarks/bench_engine_ring_buffer.py
+"""
+import argparse
+import asyncio
+import time
+from datetime import datetime
+
+import numpy as np
+
+from barn.core import TokenAnalysisEngine, MarketSignal
+
+
+def legacy_update(state, signal, window_size):
+    if signal.token not in state:
+        state[signal.token] = []
+    state[signal.token].append({
+        "timestamp": signal.timestamp,
+        "price": signal.price,
+        "volume": signal.volume,
+        "indicators": signal.indicators
+    })
+    state[signal.token] = state[signal.token][-window_size:]
+    # Every analysis pass rebuilt the columns from the dicts
+    prices = [h["price"] for h in state[signal.token]]
+    volumes = [h["volume"] for h in state[signal.token]]
+    return prices, volumes
+
+
+def make_signals(n, seed=0):
+    rng = np.random.default_rng(seed)
+    prices = 100 * np.cumprod(1 + rng.normal(0, 0.001, n))
+    volumes = rng.uniform(1e3, 1e4, n)
+    now = datetime.now()
+    return [
+        MarketSignal(now, "ETH", float(p), float(v), {"rsi": 50.0, "macd": 1.0})
+        for p, v in zip(prices, volumes)
+    ]
+
+
+def per_tick(func, signals):
+    start = time.perf_counter()
+    for signal in signals:
+        func(signal)
+    return (time.perf_counter() - start) / len(signals)
+
+
+async def per_tick_async(func, signals):
+    start = time.perf_counter()
+    for signal in signals:
+        await func(signal)
+    return (time.perf_counter() - start) / len(signals)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--windows", type=int, nargs="+", default=[100, 1000, 10000, 100000])
+    parser.add_argument("--ticks", type=int, default=2000, help="timed ticks after warm-up")
+    args = parser.parse_args()
+
+    print(f"{'window':>8} {'legacy us/tick':>15} {'ring us/tick':>13} {'process us/tick':>16}")
+    for window in args.windows:
+        warmup = make_signals(window)
+        timed = make_signals(args.ticks, seed=1)
+
+        legacy_state = {}
+        for signal in warmup:
+            legacy_state.setdefault(signal.token, []).append({"price": signal.price, "volume": signal.volume})
+        legacy = per_tick(lambda s: legacy_update(legacy_state, s, window), timed)
+
+        engine = TokenAnalysisEngine({"market_window_size": window})
+        for signal in warmup:
+            engine._update_market_state(signal)
+
+        def ring_update(signal):
+            engine._update_market_state(signal)
+            history = engine._market_state[signal.token]
+            return history.prices, history.volumes
+
+        ring = per_tick(ring_update, timed)
+        process = asyncio.run(per_tick_async(engine.process_market_signal, timed[:200]))
+
+        print(f"{window:>8} {legacy * 1e6:>15.2f} {ring * 1e6:>13.2f} {process * 1e6:>16.2f}")
+
+
+if __name__ == "__main__":
+    main()
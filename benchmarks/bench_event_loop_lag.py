@@ -0,0 +1,81 @@
+"""Event-loop lag while agents run heavy work, inline versus offloaded.
+
+A probe coroutine sleeps --tick-ms in a loop and records how late each
+wake-up is, while the risk analyzer and portfolio manager process large
+inputs. With executor=inline every step runs on the loop, the defaults
+move risk analysis to a thread, and the opt-in process executor for the
+portfolio manager frees the loop for large solves too.
+
+    python benchmarks/bench_event_loop_lag.py --assets 150 --rounds 5
+"""
+import argparse
+import asyncio
+import time
+
+import numpy as np
+
+from barn.agents.base import shutdown_executors
+from barn.agents.portfolio_manager import PortfolioManagerAgent
+from barn.agents.risk_analyzer import RiskAnalyzerAgent
+
+
+async def probe(tick, lags, stop):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(tick)
+        lags.append(time.perf_counter() - start - tick)
+
+
+async def measure(risk_config, portfolio_config, portfolio_data, prices, rounds, tick):
+    risk = RiskAnalyzerAgent("risk", dict(risk_config))
+    portfolio = PortfolioManagerAgent("portfolio", dict(portfolio_config, solver="slsqp"))
+    # Warm the pools so their start-up is not charged to the loop
+    await asyncio.gather(risk.process(prices[:, :10]), portfolio.process(portfolio_data))
+
+    lags, stop = [], asyncio.Event()
+    probe_task = asyncio.ensure_future(probe(tick, lags, stop))
+    start = time.perf_counter()
+    for _ in range(rounds):
+        await asyncio.gather(risk.process(prices), portfolio.process(portfolio_data))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await probe_task
+    return elapsed, np.array(lags) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--assets", type=int, default=150)
+    parser.add_argument("--history", type=int, default=250)
+    parser.add_argument("--series", type=int, default=500, help="risk analyzer price series")
+    parser.add_argument("--length", type=int, default=5000, help="prices per series")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--tick-ms", type=float, default=1.0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    portfolio_data = {
+        "current_allocation": {f"T{i}": float(rng.uniform(1, 10)) for i in range(args.assets)},
+        "historical_returns": {f"T{i}": list(rng.normal(0.001, 0.02, args.history)) for i in range(args.assets)}
+    }
+    prices = 100 * np.cumprod(1 + rng.normal(0, 0.01, (args.series, args.length)), axis=1)
+
+    print(f"assets={args.assets} series={args.series}x{args.length} rounds={args.rounds} tick={args.tick_ms}ms")
+    print(f"{'mode':<12}{'seconds':>10}{'ticks':>8}{'p50 lag ms':>12}{'p99 lag ms':>12}{'max lag ms':>12}")
+    inline = {"executor": "inline"}
+    modes = (
+        ("inline", inline, inline),
+        ("defaults", {}, {}),
+        ("offloaded", {}, {"executor": "process"})
+    )
+    for label, risk_config, portfolio_config in modes:
+        elapsed, lags = asyncio.run(
+            measure(risk_config, portfolio_config, portfolio_data, prices, args.rounds, args.tick_ms / 1000)
+        )
+        print(f"{label:<12}{elapsed:10.3f}{len(lags):8d}{np.percentile(lags, 50):12.2f}"
+              f"{np.percentile(lags, 99):12.2f}{lags.max():12.2f}")
+    shutdown_executors()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Cold-start import time per public barn symbol.
+
+Each measurement runs in a fresh interpreter so module caches never carry
+over. Reports the median wall time of ``from <package> import <symbol>``
+and whether NumPy / SciPy ended up loaded.
+
+    python benchmarks/bench_import_time.py --repeat 7
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+from {package} import {symbol}
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    "seconds": elapsed,
+    "numpy": "numpy" in sys.modules,
+    "scipy": "scipy.optimize" in sys.modules
+}}))
+"""
+
+
+def measure(package, symbol, repeat):
+    samples = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", PROBE.format(package=package, symbol=symbol)],
+            check=True, capture_output=True, text=True
+        ).stdout
+        samples.append(json.loads(output))
+    return statistics.median(s["seconds"] for s in samples), samples[-1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    import barn
+    import barn.core
+    targets = [("barn", "__version__")]
+    targets += [("barn", name) for name in barn.__all__]
+    targets += [("barn.core", name) for name in barn.core.__all__]
+
+    print(f"{'import':<42} {'ms':>8} {'numpy':>6} {'scipy':>6}")
+    for package, symbol in targets:
+        seconds, loaded = measure(package, symbol, args.repeat)
+        print(f"{f'from {package} import {symbol}':<42} {seconds * 1e3:>8.1f} "
+              f"{str(loaded['numpy']):>6} {str(loaded['scipy']):>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""WebSocket market-signal stream against polling /risk-assessment.
+
+Polling clients resend each token's last --window prices to
+/risk-assessment on every tick. Streaming clients send only the new tick
+to /ws/market-signals and read back analysis deltas. Both run in-process
+through the backend's test client.
+
+    python benchmarks/bench_market_stream.py --tokens 20 --ticks 200 --window 100
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.main import app  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tokens", type=int, default=20)
+    parser.add_argument("--ticks", type=int, default=200, help="ticks per token")
+    parser.add_argument("--window", type=int, default=100)
+    args = parser.parse_args()
+
+    client = TestClient(app)
+    rng = np.random.default_rng(0)
+    prices = 100 * np.cumprod(1 + rng.normal(0, 0.01, (args.ticks, args.tokens)), axis=0)
+    tokens = [f"T{i}" for i in range(args.tokens)]
+    updates = args.ticks * args.tokens
+
+    sent = 0
+    start = time.perf_counter()
+    for t in range(args.ticks):
+        for i in range(args.tokens):
+            history = prices[max(0, t - args.window + 1):t + 1, i]
+            if len(history) < 2:
+                continue
+            body = json.dumps([{"price": p} for p in history.tolist()]).encode()
+            sent += len(body)
+            client.post("/risk-assessment", content=body, headers={"content-type": "application/json"})
+    polling = time.perf_counter() - start
+    polling_bytes = sent
+
+    sent = received = replies = 0
+    start = time.perf_counter()
+    with client.websocket_connect("/ws/market-signals") as websocket:
+        for t in range(args.ticks):
+            for i, token in enumerate(tokens):
+                frame = json.dumps({"token": token, "price": float(prices[t, i]), "volume": 1.0, "timestamp": float(t)})
+                sent += len(frame)
+                websocket.send_text(frame)
+        # Replies coalesce frames that queued up while a batch was analyzed
+        last = {token: float(prices[-1, i]) for i, token in enumerate(tokens)}
+        seen = {}
+        while seen != last:
+            message = websocket.receive_text()
+            received += len(message)
+            replies += 1
+            for token, delta in json.loads(message)["tokens"].items():
+                if "current_price" in delta:
+                    seen[token] = delta["current_price"]
+    streaming = time.perf_counter() - start
+
+    print(f"tokens={args.tokens} ticks={args.ticks} window={args.window}")
+    print(f"{'mode':<12}{'seconds':>10}{'updates/s':>12}{'bytes/update up':>18}{'replies':>10}")
+    print(f"{'polling':<12}{polling:10.3f}{updates / polling:12.0f}{polling_bytes / updates:18.0f}{updates:10d}")
+    print(f"{'websocket':<12}{streaming:10.3f}{updates / streaming:12.0f}{sent / updates:18.0f}{replies:10d}")
+    print(f"websocket reply bytes per update: {received / updates:.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Monte Carlo portfolio VaR throughput across chunk sizes and pool sizes.
+
+The baseline materializes every path at once and sorts all portfolio
+returns; MonteCarloVaR simulates bounded chunks (one SeedSequence child
+each) and keeps only the worst returns the confidence levels need.
+
+    python benchmarks/bench_montecarlo_var.py --paths 2000000 --workers 1,2,4,8
+"""
+import argparse
+import time
+
+import numpy as np
+
+from barn.core.montecarlo import MonteCarloVaR
+from barn.core.tail_risk import tail_risk
+
+
+def naive_var(mu, cov, weights, horizon, paths, confidence, seed):
+    rng = np.random.default_rng(seed)
+    steps = rng.multivariate_normal(mu, cov, (paths, horizon))
+    portfolio = (np.prod(1 + steps, axis=1) - 1) @ weights
+    return tail_risk(np.sort(portfolio), confidence)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--paths", type=int, default=2_000_000)
+    parser.add_argument("--assets", type=int, default=20)
+    parser.add_argument("--horizon", type=int, default=10)
+    parser.add_argument("--chunk-size", type=int, default=50_000)
+    parser.add_argument("--workers", default="1,2,4,8")
+    parser.add_argument("--skip-naive", action="store_true")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    loadings = rng.normal(0, 0.01, (args.assets, args.assets))
+    mu = rng.normal(0.0005, 0.0005, args.assets)
+    cov = loadings @ loadings.T + np.eye(args.assets) * 1e-4
+    weights = rng.dirichlet(np.ones(args.assets))
+
+    print(f"paths={args.paths} assets={args.assets} horizon={args.horizon} "
+          f"chunk={args.chunk_size}")
+    print(f"{'mode':<16}{'seconds':>10}{'paths/s':>14}{'peak MB':>10}{'VaR 99%':>12}")
+    if not args.skip_naive:
+        start = time.perf_counter()
+        var, _ = naive_var(mu, cov, weights, args.horizon, args.paths, 0.99, 0)
+        elapsed = time.perf_counter() - start
+        peak = args.paths * args.horizon * args.assets * 8 * 2 / 2 ** 20
+        print(f"{'all paths':<16}{elapsed:10.3f}{args.paths / elapsed:14.0f}{peak:10.0f}{var:12.5f}")
+    chunk_mb = args.chunk_size * args.horizon * args.assets * 8 * 2 / 2 ** 20
+    for workers in (int(w) for w in args.workers.split(",")):
+        engine = MonteCarloVaR(
+            mu, cov, weights,
+            horizon=args.horizon,
+            chunk_size=args.chunk_size,
+            seed=0,
+            max_workers=workers
+        )
+        result = engine.run(args.paths)
+        label = f"chunked x{workers}"
+        print(f"{label:<16}{result.elapsed:10.3f}{result.paths_per_second:14.0f}"
+              f"{chunk_mb * workers:10.0f}{result.value_at_risk[0.99]:12.5f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Per-update latency of BarnOrchestrator's dependency-graph scheduling.
+
+The default agents get an added await of --io-ms per run, standing in for
+exchange or data-provider round trips. The sequential baseline runs risk,
+trader and portfolio manager one after another as process_market_data
+used to; the scheduled path overlaps the portfolio manager with the
+risk -> trader chain.
+
+    python benchmarks/bench_orchestrator.py --updates 50 --io-ms 20
+"""
+import argparse
+import asyncio
+import time
+
+import numpy as np
+
+from barn.orchestrator import BarnOrchestrator
+from barn.agents.risk_analyzer import RiskAnalyzerAgent
+from barn.agents.trading_agent import TradingAgent
+from barn.agents.portfolio_manager import PortfolioManagerAgent
+
+
+def with_io(agent_class, delay):
+    class Agent(agent_class):
+        async def run(self):
+            await asyncio.sleep(delay)
+            return await super().run()
+    return Agent
+
+
+async def sequential(barn, market_data):
+    results = {}
+    context = {"market_data": market_data}
+    for name in ("risk_analyzer", "trader", "portfolio_manager"):
+        agent = barn.get_agent(name)
+        agent.prepare(context)
+        context[agent.outputs[0]] = results[agent.outputs[0]] = await agent.run()
+    return results
+
+
+async def measure(run, barn, updates):
+    start = time.perf_counter()
+    for market_data in updates:
+        await run(barn, market_data)
+    return (time.perf_counter() - start) / len(updates)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--updates", type=int, default=50)
+    parser.add_argument("--io-ms", type=float, default=20.0)
+    parser.add_argument("--tokens", type=int, default=10)
+    args = parser.parse_args()
+
+    delay = args.io_ms / 1000
+    barn = BarnOrchestrator()
+    for agent_class, name in (
+        (RiskAnalyzerAgent, "risk_analyzer"),
+        (TradingAgent, "trader"),
+        (PortfolioManagerAgent, "portfolio_manager")
+    ):
+        barn.add_agent(with_io(agent_class, delay)(name, {}))
+
+    rng = np.random.default_rng(0)
+    updates = [
+        {
+            "price_data": list(100 * np.cumprod(1 + rng.normal(0, 0.01, 100))),
+            "portfolio": {f"T{i}": float(rng.uniform(1, 10)) for i in range(args.tokens)},
+            "historical_returns": {f"T{i}": list(rng.normal(0.001, 0.02, 60)) for i in range(args.tokens)}
+        }
+        for _ in range(args.updates)
+    ]
+
+    serial = asyncio.run(measure(sequential, barn, updates))
+    scheduled = asyncio.run(measure(lambda b, m: b.process_market_data(m), barn, updates))
+    print(f"updates={args.updates} io={args.io_ms}ms tokens={args.tokens}")
+    print(f"{'mode':<12}{'ms/update':>12}{'speedup':>10}")
+    print(f"{'sequential':<12}{serial * 1000:12.2f}{1.0:10.2f}")
+    print(f"{'scheduled':<12}{scheduled * 1000:12.2f}{serial / scheduled:10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Batch optimization of many portfolios across process pool sizes.
+
+Every portfolio holds a random subset of a shared token universe. The
+serial baseline runs PortfolioManagerAgent._optimize_portfolio per
+portfolio, re-estimating its moments each time; the batch path estimates
+them once and fans the solves out with optimize_portfolios.
+
+    python benchmarks/bench_portfolio_batch.py --portfolios 2000 --workers 1,2,4,8
+"""
+import argparse
+import time
+
+import numpy as np
+
+from barn.agents.portfolio_manager import PortfolioManagerAgent
+from barn.core.parallel import PortfolioRequest, optimize_portfolios
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--portfolios", type=int, default=2000)
+    parser.add_argument("--universe", type=int, default=200)
+    parser.add_argument("--assets", type=int, default=20, help="tokens per portfolio")
+    parser.add_argument("--history", type=int, default=250)
+    parser.add_argument("--workers", default="1,2,4,8")
+    parser.add_argument("--solver", default="projected_gradient")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    returns = rng.normal(0.0005, 0.02, (args.universe, args.history)) + rng.normal(0, 0.01, args.history)
+    historical = {f"T{i}": list(row) for i, row in enumerate(returns)}
+    requests = [
+        PortfolioRequest(
+            portfolio_id=p,
+            allocation={
+                f"T{i}": float(rng.uniform(1, 10))
+                for i in rng.choice(args.universe, args.assets, replace=False)
+            },
+            risk_tolerance=float(rng.uniform())
+        )
+        for p in range(args.portfolios)
+    ]
+    config = {"solver": args.solver}
+
+    agent = PortfolioManagerAgent("bench", config)
+    start = time.perf_counter()
+    for request in requests:
+        agent._update_portfolio_data({
+            "current_allocation": request.allocation,
+            "historical_returns": historical
+        })
+        agent._calculate_rebalancing_trades(agent._optimize_portfolio())
+    serial = time.perf_counter() - start
+
+    print(f"portfolios={args.portfolios} universe={args.universe} assets={args.assets} "
+          f"solver={args.solver}")
+    print(f"{'mode':<16}{'seconds':>10}{'portfolios/s':>14}{'speedup':>10}")
+    print(f"{'agent loop':<16}{serial:10.3f}{args.portfolios / serial:14.0f}{1.0:10.2f}")
+    for workers in (int(w) for w in args.workers.split(",")):
+        start = time.perf_counter()
+        optimize_portfolios(requests, historical, config, max_workers=workers)
+        elapsed = time.perf_counter() - start
+        label = f"batch x{workers}"
+        print(f"{label:<16}{elapsed:10.3f}{args.portfolios / elapsed:14.0f}{serial / elapsed:10.2f}")
+
+
+if __name__ == "__main__":
+    main()
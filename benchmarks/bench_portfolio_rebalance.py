@@ -0,0 +1,75 @@
+"""Timer-driven rebalancing across many PortfolioOptimizer instances.
+
+Each round, every portfolio receives price updates for a random subset of
+its tokens and is then re-optimized. The incremental path uses the rolling
+covariance, warm starts and the solve cache; the baseline rebuilds returns
+and covariance from the full history and solves from equal weights.
+
+    python benchmarks/bench_portfolio_rebalance.py --portfolios 50 --assets 50
+"""
+import argparse
+import time
+from datetime import datetime
+
+import numpy as np
+
+from barn.core import PortfolioOptimizer, Position
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--portfolios", type=int, default=50)
+    parser.add_argument("--assets", type=int, default=50)
+    parser.add_argument("--history", type=int, default=500)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--updates-per-round", type=int, default=10,
+                        help="price updates each portfolio receives between rebalances")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    config = {"max_history_length": args.history, "min_position_size": 0.0}
+    optimizers = []
+    prices = 100 * np.cumprod(1 + rng.normal(0.0005, 0.02, (args.history, args.assets)), axis=0)
+    for _ in range(args.portfolios):
+        optimizer = PortfolioOptimizer(config)
+        for row in prices:
+            for i, price in enumerate(row):
+                optimizer.update_position(Position(f"T{i}", 1.0, 100.0, float(price), datetime.now()))
+        optimizer.optimize_portfolio()
+        optimizers.append(optimizer)
+
+    last = prices[-1].copy()
+    incremental = baseline = 0.0
+    for _ in range(args.rounds):
+        for optimizer in optimizers:
+            for i in rng.integers(0, args.assets, args.updates_per_round):
+                last[i] *= 1 + rng.normal(0.0005, 0.02)
+                optimizer.update_position(Position(f"T{i}", 1.0, 100.0, float(last[i]), datetime.now()))
+
+        start = time.perf_counter()
+        for optimizer in optimizers:
+            optimizer.optimize_portfolio()
+        incremental += time.perf_counter() - start
+
+        start = time.perf_counter()
+        for optimizer in optimizers:
+            returns_data = optimizer._calculate_returns_data()
+            optimizer._solver.solve(
+                returns_data.mean(axis=1),
+                np.cov(returns_data),
+                np.full(args.assets, 1 / args.assets),
+                min_weight=0.0
+            )
+        baseline += time.perf_counter() - start
+
+    solves = sum(o.solve_stats["solves"] for o in optimizers) - args.portfolios
+    hits = sum(o.solve_stats["cache_hits"] for o in optimizers)
+    per_call = args.portfolios * args.rounds
+    print(f"portfolios={args.portfolios} assets={args.assets} rounds={args.rounds}")
+    print(f"baseline    {baseline / per_call * 1e3:8.3f} ms per rebalance")
+    print(f"incremental {incremental / per_call * 1e3:8.3f} ms per rebalance "
+          f"({solves} solves, {hits} cache hits)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Write and read cost of the PortfolioOptimizer price store at scale.
+
+Compares the time-aligned PriceMatrix (in-place writes, returns read as a
+view) with the previous per-token price lists, from which every optimization
+rebuilt a returns array with np.diff and np.array.
+
+    python benchmarks/bench_price_matrix.py --assets 2000 --window 1000
+"""
+import argparse
+import time
+
+import numpy as np
+
+from barn.core.prices import PriceMatrix
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--assets", type=int, default=2000)
+    parser.add_argument("--window", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=1200)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    tokens = [f"T{i}" for i in range(args.assets)]
+    steps = 1 + rng.normal(0, 0.01, (args.rounds, args.assets))
+
+    matrix = PriceMatrix(args.window)
+    lists = {token: [] for token in tokens}
+    prices = np.full(args.assets, 100.0)
+    matrix_write = list_write = 0.0
+    for t in range(args.rounds):
+        prices = prices * steps[t]
+        row = prices.tolist()
+        start = time.perf_counter()
+        for token, price in zip(tokens, row):
+            matrix.write(token, float(t), price)
+        matrix_write += time.perf_counter() - start
+
+        start = time.perf_counter()
+        for token, price in zip(tokens, row):
+            history = lists[token]
+            history.append(price)
+            if len(history) > args.window:
+                lists[token] = history[-args.window:]
+        list_write += time.perf_counter() - start
+
+    start = time.perf_counter()
+    returns = matrix.returns
+    matrix_read = time.perf_counter() - start
+
+    start = time.perf_counter()
+    legacy = np.array([np.diff(lists[t]) / np.array(lists[t][:-1]) for t in tokens])
+    list_read = time.perf_counter() - start
+    assert np.allclose(returns, legacy)
+
+    writes = args.assets * args.rounds
+    print(f"assets={args.assets} window={args.window} rounds={args.rounds}")
+    print(f"{'store':<14} {'us/write':>9} {'returns read ms':>16}")
+    print(f"{'price lists':<14} {list_write / writes * 1e6:>9.2f} {list_read * 1e3:>16.3f}")
+    print(f"{'PriceMatrix':<14} {matrix_write / writes * 1e6:>9.2f} {matrix_read * 1e3:>16.3f}")
+
+
+if __name__ == "__main__":
+    main()
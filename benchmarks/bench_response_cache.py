@@ -0,0 +1,63 @@
+"""Backend response cache: repeated /risk-assessment payloads, cold versus cached.
+
+Runs the FastAPI backend in-process through its test client. The cold run
+clears the cache before every request; the cached run sends a small set of
+distinct payloads over and over, as dashboards polling the same tokens do.
+
+    python benchmarks/bench_response_cache.py --requests 500 --distinct 10 --length 5000
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.main import app  # noqa: E402
+from app.api.routes import response_cache  # noqa: E402
+
+
+def timed(client, bodies, clear_each):
+    asyncio.run(response_cache.clear())
+    start = time.perf_counter()
+    for body in bodies:
+        if clear_each:
+            asyncio.run(response_cache.clear())
+        client.post("/risk-assessment", content=body, headers={"content-type": "application/json"})
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--distinct", type=int, default=10)
+    parser.add_argument("--length", type=int, default=5000, help="prices per payload")
+    args = parser.parse_args()
+
+    client = TestClient(app)
+    rng = np.random.default_rng(0)
+    payloads = [
+        json.dumps([{"price": p} for p in (100 * np.cumprod(1 + rng.normal(0, 0.01, args.length))).tolist()]).encode()
+        for _ in range(args.distinct)
+    ]
+    bodies = [payloads[i % args.distinct] for i in range(args.requests)]
+
+    cold = timed(client, bodies, clear_each=True)
+    cached = timed(client, bodies, clear_each=False)
+    stats = client.get("/cache/stats").json()
+
+    print(f"requests={args.requests} distinct={args.distinct} length={args.length}")
+    print(f"{'mode':<10}{'seconds':>10}{'req/s':>10}{'speedup':>10}")
+    print(f"{'cold':<10}{cold:10.3f}{args.requests / cold:10.0f}{1.0:10.2f}")
+    print(f"{'cached':<10}{cached:10.3f}{args.requests / cached:10.0f}{cold / cached:10.2f}")
+    print(f"cache stats: {stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""RiskAnalyzerAgent across a token universe: per-token calls against the batch kernel.
+
+The legacy path calls process() once per token and recomputes returns for
+each of the three metrics; the batch path passes the (tokens x time)
+price matrix once and derives every metric from one returns array.
+
+    python benchmarks/bench_risk_analyzer.py --tokens 1000 --ticks 500
+"""
+import argparse
+import asyncio
+import time
+
+import numpy as np
+
+from barn.agents.risk_analyzer import RiskAnalyzerAgent
+
+
+def legacy_metrics(prices):
+    """RiskAnalyzerAgent.process as it was before the fused kernel"""
+    returns = np.diff(prices) / prices[:-1]
+    volatility = float(np.std(returns))
+    returns = np.diff(prices) / prices[:-1]
+    excess = returns - 0.01
+    sharpe = float(np.mean(excess) / np.std(excess))
+    returns = np.diff(prices) / prices[:-1]
+    var = float(np.percentile(returns, 5))
+    return {"volatility": volatility, "sharpe_ratio": sharpe, "value_at_risk": var}
+
+
+async def run(args):
+    rng = np.random.default_rng(0)
+    matrix = 100 * np.cumprod(1 + rng.normal(0, 0.02, (args.tokens, args.ticks)), axis=1)
+    series = [list(row) for row in matrix]
+    agent = RiskAnalyzerAgent("bench")
+
+    timings = {}
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        for row in series:
+            legacy_metrics(row)
+    timings["legacy per token"] = (time.perf_counter() - start) / args.repeat
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        for row in series:
+            await agent.process(row)
+    timings["fused per token"] = (time.perf_counter() - start) / args.repeat
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        await agent.process(matrix)
+    timings["fused batch"] = (time.perf_counter() - start) / args.repeat
+
+    baseline = timings["legacy per token"]
+    print(f"tokens={args.tokens} ticks={args.ticks}")
+    print(f"{'mode':<20}{'ms per tick':>12}{'speedup':>10}")
+    for label, elapsed in timings.items():
+        print(f"{label:<20}{elapsed * 1e3:12.2f}{baseline / elapsed:10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tokens", type=int, default=1000)
+    parser.add_argument("--ticks", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=3)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
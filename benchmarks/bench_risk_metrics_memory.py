@@ -0,0 +1,94 @@
+"""Memory per million stored risk metrics, object history against columnar.
+
+The object layout is one RiskMetrics dataclass instance (with a
+``__dict__``, its own datetime and float objects) per metric held in a
+list; the columnar layout is TokenRiskHistory, six float64 values per
+metric plus growth slack. Object allocations are measured with
+tracemalloc; the columnar size is the allocated array capacity, since
+tracing numpy's per-insert temporaries would dominate the build time.
+
+    python benchmarks/bench_risk_metrics_memory.py --records 1000000
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from barn.core import RiskMetrics
+from barn.core.risk_manager import TokenRiskHistory, composite_risk
+
+
+@dataclass
+class DictRiskMetrics:
+    """RiskMetrics as it was before ``__slots__``"""
+    token: str
+    volatility: float
+    var: float
+    expected_shortfall: float
+    liquidity_score: float
+    timestamp: datetime
+
+
+def measure(build, traced):
+    gc.collect()
+    if traced:
+        tracemalloc.start()
+    start = time.perf_counter()
+    store = build()
+    elapsed = time.perf_counter() - start
+    if traced:
+        size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    else:
+        size = store._data.nbytes
+    return store, size, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    values = rng.uniform([0, -0.1, -0.15, 0.5], [0.2, 0, 0, 1], (args.records, 4)).tolist()
+    start = datetime.now() - timedelta(seconds=args.records)
+
+    def objects():
+        return [
+            DictRiskMetrics("ETH", v, var, es, liq, start + timedelta(seconds=i))
+            for i, (v, var, es, liq) in enumerate(values)
+        ]
+
+    def columnar():
+        history = TokenRiskHistory("ETH")
+        for i, (v, var, es, liq) in enumerate(values):
+            history.insert(
+                RiskMetrics("ETH", v, var, es, liq, start + timedelta(seconds=i)),
+                float(composite_risk(v, var, es, liq))
+            )
+        return history
+
+    scale = 1_000_000 / args.records
+    print(f"records={args.records}")
+    print(f"{'layout':<12}{'MB per 1M':>12}{'bytes/record':>14}{'build s':>10}")
+    for label, build in (("objects", objects), ("columnar", columnar)):
+        store, size, elapsed = measure(build, traced=label == "objects")
+        print(f"{label:<12}{size * scale / 2 ** 20:12.1f}{size / args.records:14.1f}{elapsed:10.2f}")
+        if label == "columnar":
+            # Vectorized composite over the full history, for reference
+            start_score = time.perf_counter()
+            composite_risk(
+                store.column("volatility"), store.column("var"),
+                store.column("expected_shortfall"), store.column("liquidity_score")
+            )
+            print(f"vectorized composite over all records: "
+                  f"{(time.perf_counter() - start_score) * 1e3:.1f} ms")
+        del store
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""RiskManager.update_metrics cost against per-token history depth.
+
+Each token's history is prefilled to a steady-state window of ``depth``
+entries spread over ``risk_window_days``, then every token receives
+``--updates`` new metrics (a fraction arriving out of order). The legacy
+path rebuilds the whole list on every insert; the deque path appends and
+expires from the left, keeping composite risk and trend slopes current. At 30 days of per-second metrics the depth is
+2,592,000 per token, where the legacy cost grows linearly.
+
+    python benchmarks/bench_risk_metrics_window.py --tokens 1000 --depths 100,1000,10000
+"""
+import argparse
+import time
+import copy
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from barn.core import RiskManager, RiskMetrics
+from barn.core.risk_manager import TokenRiskHistory
+
+
+class LegacyRiskManager(RiskManager):
+    """update_metrics as it was before the deque history"""
+
+    def update_metrics(self, metrics):
+        if metrics.token not in self._risk_metrics:
+            self._risk_metrics[metrics.token] = []
+        self._risk_metrics[metrics.token].append(metrics)
+        self._last_update = datetime.now()
+        window_days = self.config.get("risk_window_days", 30)
+        cutoff = datetime.now() - timedelta(days=window_days)
+        self._risk_metrics[metrics.token] = [
+            m for m in self._risk_metrics[metrics.token]
+            if m.timestamp > cutoff
+        ]
+
+
+def metric(token, timestamp):
+    return RiskMetrics(token, 0.1, -0.05, -0.08, 0.7, timestamp)
+
+
+def prefilled_history(manager, token, prefill):
+    history = TokenRiskHistory(token, capacity=2 * len(prefill))
+    for item in prefill:
+        history.insert(item, manager._calculate_composite_risk(item))
+    return history
+
+
+def clone(history, token):
+    copied = copy.copy(history)
+    copied.token = token
+    copied._data = history._data.copy()
+    for name in ("volatility_trend", "var_trend", "risk_trend"):
+        setattr(copied, name, copy.copy(getattr(history, name)))
+    return copied
+
+
+def run(manager_cls, tokens, depth, updates, late_fraction, window_days, seed):
+    rng = np.random.default_rng(seed)
+    now = datetime.now()
+    spacing = timedelta(days=window_days) / depth
+    prefill = [metric("prefill", now - (depth - i) * spacing) for i in range(depth)]
+    manager = manager_cls({"risk_window_days": window_days})
+    if manager_cls is LegacyRiskManager:
+        for token in tokens:
+            manager._risk_metrics[token] = list(prefill)
+    else:
+        template = prefilled_history(manager, "prefill", prefill)
+        for token in tokens:
+            manager._risk_metrics[token] = clone(template, token)
+
+    batch = []
+    for step in range(updates):
+        for token in tokens:
+            timestamp = now + (step + 1) * spacing
+            if rng.random() < late_fraction:
+                timestamp -= int(rng.integers(1, 10)) * spacing
+            batch.append(metric(token, timestamp))
+
+    start = time.perf_counter()
+    for item in batch:
+        manager.update_metrics(item)
+    return (time.perf_counter() - start) / len(batch)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tokens", type=int, default=1000)
+    parser.add_argument("--depths", default="100,1000,10000")
+    parser.add_argument("--updates", type=int, default=3, help="updates per token")
+    parser.add_argument("--late-fraction", type=float, default=0.05)
+    parser.add_argument("--window-days", type=int, default=30)
+    args = parser.parse_args()
+
+    tokens = [f"T{i}" for i in range(args.tokens)]
+    print(f"tokens={args.tokens} updates/token={args.updates} late={args.late_fraction:.0%}")
+    print(f"{'depth':>10}{'legacy us/update':>20}{'current us/update':>20}{'speedup':>10}")
+    for depth in (int(d) for d in args.depths.split(",")):
+        legacy = run(LegacyRiskManager, tokens, depth, args.updates,
+                     args.late_fraction, args.window_days, 0)
+        current = run(RiskManager, tokens, depth, args.updates,
+                      args.late_fraction, args.window_days, 0)
+        print(f"{depth:>10}{legacy * 1e6:20.2f}{current * 1e6:20.2f}{legacy / current:10.1f}")
+
+
+if __name__ == "__main__":
+    main()
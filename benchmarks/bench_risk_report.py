@@ -0,0 +1,103 @@
+"""RiskManager.get_risk_report latency against history depth.
+
+The legacy report re-scores every stored metric and fits np.polyfit over
+each token's full volatility, VaR and composite histories on every call.
+The current report reads the composite scored at ingest and the rolling
+trend slopes, so it is O(tokens).
+
+    python benchmarks/bench_risk_report.py --tokens 500 --depths 100,1000,5000
+"""
+import argparse
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from barn.core import RiskManager, RiskMetrics
+
+
+def legacy_trend(values):
+    if len(values) < 2:
+        return 0.0
+    return float(np.polyfit(np.arange(len(values)), np.array(values), 1)[0])
+
+
+def legacy_momentum(values):
+    if len(values) < 2:
+        return 0.0
+    return float(np.mean(values[-min(5, len(values)):]) - np.mean(values[-min(20, len(values)):]))
+
+
+def legacy_report(manager):
+    """get_risk_report as it was before composites were stored at ingest"""
+    score = manager._calculate_composite_risk
+    report = {"token_metrics": {}, "risk_breaches": [], "trend_analysis": {}}
+    latest = [score(history.latest()) for history in manager._risk_metrics.values()]
+    report["global_metrics"] = {
+        "average_risk": float(np.mean(latest)),
+        "max_risk": float(np.max(latest)),
+        "risk_concentration": float(np.std(latest))
+    }
+    for token, history in manager._risk_metrics.items():
+        metrics = list(history)
+        recent = metrics[-1]
+        report["token_metrics"][token] = {
+            "current_risk": score(recent),
+            "volatility_trend": legacy_trend([m.volatility for m in metrics]),
+            "var_trend": legacy_trend([m.var for m in metrics]),
+            "liquidity_score": recent.liquidity_score,
+            "metrics_timestamp": recent.timestamp
+        }
+        limit = manager._risk_limits.get(token)
+        if limit is not None and score(recent) > limit:
+            report["risk_breaches"].append(token)
+        risk_scores = [score(m) for m in metrics]
+        trend = legacy_trend(risk_scores)
+        report["trend_analysis"][token] = {
+            "trend_direction": "increasing" if trend > 0 else "decreasing",
+            "trend_strength": abs(trend),
+            "current_momentum": legacy_momentum(risk_scores)
+        }
+    return report
+
+
+def build(tokens, depth, seed=0):
+    rng = np.random.default_rng(seed)
+    manager = RiskManager()
+    now = datetime.now()
+    for token in tokens:
+        values = rng.uniform([0, -0.1, -0.15, 0.5], [0.2, 0, 0, 1], (depth, 4))
+        for i, (volatility, var, shortfall, liquidity) in enumerate(values):
+            manager.update_metrics(RiskMetrics(
+                token, volatility, var, shortfall, liquidity, now - timedelta(seconds=depth - i)
+            ))
+        manager.set_risk_limit(token, 0.5)
+    return manager
+
+
+def timed(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tokens", type=int, default=500)
+    parser.add_argument("--depths", default="100,1000,5000")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    tokens = [f"T{i}" for i in range(args.tokens)]
+    print(f"tokens={args.tokens}")
+    print(f"{'depth':>8}{'legacy ms':>12}{'current ms':>12}{'speedup':>10}")
+    for depth in (int(d) for d in args.depths.split(",")):
+        manager = build(tokens, depth)
+        legacy = timed(lambda: legacy_report(manager), args.repeat)
+        current = timed(manager.get_risk_report, args.repeat)
+        print(f"{depth:>8}{legacy * 1e3:12.2f}{current * 1e3:12.2f}{legacy / current:10.1f}")
+
+
+if __name__ == "__main__":
+    main()
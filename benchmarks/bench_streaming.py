@@ -0,0 +1,94 @@
+"""Multi-token streaming throughput of BarnOrchestrator.stream by worker count.
+
+Each token's pipeline runs the default agents with an added await of
+--io-ms per agent, standing in for exchange round trips. The baseline
+awaits one update at a time through per-token orchestrators; stream()
+overlaps tokens across shard workers behind bounded queues.
+
+    python benchmarks/bench_streaming.py --tokens 32 --updates 10 --workers 1,4,16
+"""
+import argparse
+import asyncio
+import time
+
+import numpy as np
+
+from barn.orchestrator import BarnOrchestrator
+from barn.agents.risk_analyzer import RiskAnalyzerAgent
+from barn.agents.trading_agent import TradingAgent
+from barn.agents.portfolio_manager import PortfolioManagerAgent
+
+
+def factory(delay):
+    def with_io(agent_class):
+        class Agent(agent_class):
+            async def run(self):
+                await asyncio.sleep(delay)
+                return await super().run()
+        return Agent
+
+    def build():
+        barn = BarnOrchestrator()
+        for agent_class, name in (
+            (RiskAnalyzerAgent, "risk_analyzer"),
+            (TradingAgent, "trader"),
+            (PortfolioManagerAgent, "portfolio_manager")
+        ):
+            barn.add_agent(with_io(agent_class)(name, {}))
+        return barn
+    return build
+
+
+async def one_at_a_time(build, updates):
+    pipelines = {}
+    for token, market_data in updates:
+        if token not in pipelines:
+            pipelines[token] = build()
+        await pipelines[token].process_market_data(market_data)
+
+
+async def streamed(build, updates, workers, queue_size):
+    barn = BarnOrchestrator({"stream_workers": workers, "stream_queue_size": queue_size})
+    latencies = [result.latency async for result in barn.stream(updates, pipeline_factory=build)]
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tokens", type=int, default=32)
+    parser.add_argument("--updates", type=int, default=10, help="updates per token")
+    parser.add_argument("--io-ms", type=float, default=10.0)
+    parser.add_argument("--workers", default="1,4,16")
+    parser.add_argument("--queue-size", type=int, default=64)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    updates = [
+        (f"T{t}", {
+            "price_data": list(100 * np.cumprod(1 + rng.normal(0, 0.01, 100))),
+            "portfolio": {f"T{t}": 1.0, "USDC": 100.0},
+            "historical_returns": {f"T{t}": list(rng.normal(0.001, 0.02, 60)), "USDC": list(rng.normal(0, 0.001, 60))}
+        })
+        for _ in range(args.updates)
+        for t in range(args.tokens)
+    ]
+    build = factory(args.io_ms / 1000)
+
+    start = time.perf_counter()
+    asyncio.run(one_at_a_time(build, updates))
+    serial = time.perf_counter() - start
+
+    print(f"tokens={args.tokens} updates={len(updates)} io={args.io_ms}ms queue={args.queue_size}")
+    print(f"{'mode':<16}{'seconds':>10}{'updates/s':>12}{'p50 ms':>10}{'speedup':>10}")
+    print(f"{'one at a time':<16}{serial:10.3f}{len(updates) / serial:12.0f}{'':>10}{1.0:10.2f}")
+    for workers in (int(w) for w in args.workers.split(",")):
+        start = time.perf_counter()
+        latencies = asyncio.run(streamed(build, updates, workers, args.queue_size))
+        elapsed = time.perf_counter() - start
+        label = f"stream x{workers}"
+        print(f"{label:<16}{elapsed:10.3f}{len(updates) / elapsed:12.0f}"
+              f"{np.median(latencies) * 1000:10.2f}{serial / elapsed:10.2f}")
+
+
+if __name__ == "__main__":
+    main()
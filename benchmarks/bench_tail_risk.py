@@ -0,0 +1,56 @@
+"""Per-tick rolling VaR/ES: sorted window against re-sorting the window.
+
+Each tick pushes one return and reads VaR and expected shortfall at every
+confidence level. The baseline keeps the window as an array and calls
+np.sort on it each tick (as np.percentile would) before reading the tail.
+
+    python benchmarks/bench_tail_risk.py --windows 1000,10000,100000
+"""
+import argparse
+import time
+
+import numpy as np
+
+from barn.core.tail_risk import RollingTailRisk, tail_risk
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--windows", default="1000,10000,100000")
+    parser.add_argument("--ticks", type=int, default=2000)
+    parser.add_argument("--confidences", default="0.95,0.99")
+    args = parser.parse_args()
+
+    confidences = tuple(float(c) for c in args.confidences.split(","))
+    rng = np.random.default_rng(0)
+    print(f"ticks={args.ticks} confidences={confidences}")
+    print(f"{'window':>8}{'re-sort us/tick':>18}{'sorted window us/tick':>24}{'speedup':>10}")
+    for window in (int(w) for w in args.windows.split(",")):
+        warmup = rng.standard_t(3, window) * 0.01
+        ticks = (rng.standard_t(3, args.ticks) * 0.01).tolist()
+
+        values = np.array(warmup)
+        position = 0
+        start = time.perf_counter()
+        for value in ticks:
+            values[position] = value
+            position = (position + 1) % window
+            ordered = np.sort(values)
+            for confidence in confidences:
+                tail_risk(ordered, confidence)
+        baseline = (time.perf_counter() - start) / args.ticks
+
+        tail = RollingTailRisk(window, confidences)
+        for value in warmup.tolist():
+            tail.push(value)
+        start = time.perf_counter()
+        for value in ticks:
+            tail.push(value)
+            tail.levels()
+        current = (time.perf_counter() - start) / args.ticks
+
+        print(f"{window:>8}{baseline * 1e6:18.1f}{current * 1e6:24.1f}{baseline / current:10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""t-digest accuracy and memory against exact VaR/ES on heavy-tailed returns.
+
+For each compression, the returns are fed in blocks to one digest and, in
+the sharded case, split across shards whose digests are merged. Errors are
+relative to the exact sort-based VaR/ES; memory is the digest's centroid
+and buffer arrays against the raw float64 returns.
+
+    python benchmarks/bench_tdigest.py --returns 1000000 --compressions 50,100,200,400
+"""
+import argparse
+import time
+
+import numpy as np
+
+from barn.core.sketches import TDigest
+from barn.core.tail_risk import tail_risk
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--returns", type=int, default=1_000_000)
+    parser.add_argument("--compressions", default="50,100,200,400")
+    parser.add_argument("--confidences", default="0.95,0.99,0.999")
+    parser.add_argument("--shards", type=int, default=16)
+    parser.add_argument("--block", type=int, default=10_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    returns = rng.standard_t(3, args.returns) * 0.01
+    confidences = [float(c) for c in args.confidences.split(",")]
+
+    start = time.perf_counter()
+    ordered = np.sort(returns)
+    exact = {c: tail_risk(ordered, c) for c in confidences}
+    exact_time = time.perf_counter() - start
+
+    print(f"returns={args.returns} raw={returns.nbytes / 2 ** 20:.1f} MB "
+          f"exact sort {exact_time * 1e3:.0f} ms")
+    header = "".join(f"{'VaR/ES err % @' + str(c):>24}" for c in confidences)
+    print(f"{'digest':<14}{'centroids':>10}{'KB':>8}{'build ms':>10}{header}")
+    for compression in (float(c) for c in args.compressions.split(",")):
+        start = time.perf_counter()
+        digest = TDigest(compression)
+        for offset in range(0, args.returns, args.block):
+            digest.update_many(returns[offset:offset + args.block])
+        single_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        merged = TDigest.merge_all(
+            TDigest(compression).update_many(part)
+            for part in np.array_split(returns, args.shards)
+        )
+        merged_time = time.perf_counter() - start
+
+        for label, sketch, elapsed in (
+            (f"d={compression:g}", digest, single_time),
+            (f"  {args.shards} shards", merged, merged_time)
+        ):
+            errors = ""
+            for c in confidences:
+                var, shortfall = exact[c]
+                errors += (f"{100 * abs(sketch.value_at_risk(c) / var - 1):>13.2f}"
+                           f"{100 * abs(sketch.expected_shortfall(c) / shortfall - 1):>11.2f}")
+            print(f"{label:<14}{len(sketch):>10}{sketch.nbytes / 1024:8.1f}{elapsed * 1e3:10.0f}{errors}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""Warm-start load time and memory for a year of ticks: tick archive vs eager loads.
+
+Each mode runs in a fresh interpreter and reports the resident memory it
+adds (Linux /proc/self/statm). ``signals`` rebuilds MarketSignal objects
+for the year and ingests them (the path a restart takes today), ``eager``
+reads the raw columns fully into memory before warming, and ``archive``
+memory-maps TickArchive files and warms the engine and optimizer from
+views. ``scan`` maps the archive and reduces every price of the year, the
+case where every page of a column is touched.
+
+    python benchmarks/bench_tick_archive.py --tokens 4 --interval 60
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+
+from barn.core import PortfolioOptimizer, TokenAnalysisEngine
+from barn.core.archive import TickArchive
+from barn.core.engine import MarketSignal
+
+YEAR = 365 * 24 * 3600
+MODES = ("signals", "eager", "archive", "scan")
+
+
+def build(root, tokens, interval):
+    archive = TickArchive(root)
+    count = YEAR // interval
+    rng = np.random.default_rng(0)
+    timestamps = 1_600_000_000.0 + np.arange(count) * float(interval)
+    for i in range(tokens):
+        prices = 100 * np.cumprod(1 + rng.normal(0, 0.001, count))
+        volumes = rng.uniform(1_000, 5_000, count)
+        archive.append(f"T{i}", timestamps, prices, volumes, {"rsi": rng.uniform(0, 100, count)})
+    return count
+
+
+def run_mode(mode, root):
+    archive = TickArchive(root)
+    engine = TokenAnalysisEngine({"market_window_size": 1000})
+    optimizer = PortfolioOptimizer({"max_history_length": 1000})
+    rss_before = resident_mb()
+    start = time.perf_counter()
+
+    if mode == "archive":
+        archive.warm_engine(engine)
+        archive.warm_optimizer(optimizer)
+    elif mode == "scan":
+        total = sum(float(archive.read(token).prices.sum()) for token in archive.tokens())
+        assert total > 0
+    else:
+        history = {}
+        for token in archive.tokens():
+            directory = os.path.join(root, token)
+            columns = {
+                name: np.fromfile(os.path.join(directory, name + ".f8"), dtype="<f8")
+                for name in ("timestamp", "price", "volume", "indicator-rsi")
+            }
+            history[token] = columns
+        if mode == "signals":
+            signals = [
+                MarketSignal(datetime.fromtimestamp(ts), token, price, volume, {"rsi": rsi})
+                for token, columns in history.items()
+                for ts, price, volume, rsi in zip(
+                    columns["timestamp"].tolist(),
+                    columns["price"].tolist(),
+                    columns["volume"].tolist(),
+                    columns["indicator-rsi"].tolist()
+                )
+            ]
+            engine.ingest(signals)
+        else:
+            for token, columns in history.items():
+                engine.load_history(
+                    token, columns["timestamp"], columns["price"], columns["volume"], {"rsi": columns["indicator-rsi"]}
+                )
+        optimizer.load_price_history({
+            token: (columns["timestamp"], columns["price"]) for token, columns in history.items()
+        })
+
+    elapsed = time.perf_counter() - start
+    # Measured while the loaded state is still referenced; mapped archive
+    # pages that were touched count as resident too
+    print(json.dumps({"seconds": elapsed, "rss_mb": resident_mb() - rss_before}))
+
+
+def resident_mb():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * resource.getpagesize() / 2**20
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tokens", type=int, default=4)
+    parser.add_argument("--interval", type=int, default=60, help="seconds between ticks")
+    parser.add_argument("--modes", default=",".join(MODES))
+    parser.add_argument("--run-mode", help=argparse.SUPPRESS)
+    parser.add_argument("--root", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_mode:
+        run_mode(args.run_mode, args.root)
+        return
+
+    with tempfile.TemporaryDirectory() as root:
+        start = time.perf_counter()
+        count = build(root, args.tokens, args.interval)
+        size = sum(
+            os.path.getsize(os.path.join(directory, name))
+            for directory, _, names in os.walk(root) for name in names
+        )
+        print(f"{args.tokens} tokens x {count:,} ticks, {size / 2**20:.0f} MiB archive "
+              f"written in {time.perf_counter() - start:.2f}s\n")
+        print(f"{'mode':<10} {'load s':>10} {'RSS +MiB':>14}")
+        for mode in args.modes.split(","):
+            output = subprocess.run(
+                [sys.executable, __file__, "--run-mode", mode, "--root", root],
+                check=True, capture_output=True, text=True
+            ).stdout
+            result = json.loads(output.splitlines()[-1])
+            print(f"{mode:<10} {result['seconds']:>10.3f} {result['rss_mb']:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Tick persistence rows/s: per-row ORM commits, one bulk ORM commit, BatchWriter.
+
+Each mode writes --rows ticks to a fresh SQLite file created with the
+backend's tuned engine (WAL, synchronous=NORMAL), then reads one token's
+range back through the (token, timestamp) index.
+
+    python benchmarks/bench_timeseries_writes.py --rows 200000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.db.database import Base, create_db_engine  # noqa: E402
+from app.db.queries import time_range  # noqa: E402
+from app.db.writer import BatchWriter  # noqa: E402
+from app.models.timeseries import Tick  # noqa: E402
+
+
+def make_rows(n, tokens):
+    return [
+        {"token": f"T{i % tokens}", "timestamp": float(i // tokens), "price": 100.0 + i % 97,
+         "volume": 1.0 + i % 13, "indicators": None}
+        for i in range(n)
+    ]
+
+
+def orm_per_row(engine, rows):
+    with Session(engine) as session:
+        for row in rows:
+            session.add(Tick(**row))
+            session.commit()
+
+
+def orm_bulk(engine, rows):
+    with Session(engine) as session:
+        session.add_all([Tick(**row) for row in rows])
+        session.commit()
+
+
+def batch_writer(engine, rows, batch_size):
+    with BatchWriter(engine, batch_size=batch_size) as writer:
+        for start in range(0, len(rows), 100):
+            writer.add_many(Tick, rows[start:start + 100])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--tokens", type=int, default=50)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--per-row-sample", type=int, default=2000,
+                        help="rows timed for the per-row commit mode")
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows, args.tokens)
+    modes = [
+        ("orm per-row", lambda engine: orm_per_row(engine, rows[:args.per_row_sample]), args.per_row_sample),
+        ("orm bulk", lambda engine: orm_bulk(engine, rows), args.rows),
+        ("batch writer", lambda engine: batch_writer(engine, rows, args.batch_size), args.rows)
+    ]
+    print(f"rows={args.rows} tokens={args.tokens} batch={args.batch_size}")
+    print(f"{'mode':<14}{'rows':>9}{'seconds':>10}{'rows/s':>12}{'range query ms':>16}")
+    for label, write, count in modes:
+        with tempfile.TemporaryDirectory() as directory:
+            engine = create_db_engine(f"sqlite:///{os.path.join(directory, 'bench.db')}")
+            Base.metadata.create_all(engine)
+            start = time.perf_counter()
+            write(engine)
+            elapsed = time.perf_counter() - start
+            start = time.perf_counter()
+            found = time_range(engine, Tick, "T7", 100, 200)
+            query = (time.perf_counter() - start) * 1000
+            assert found or count < 200 * args.tokens
+            engine.dispose()
+        print(f"{label:<14}{count:9d}{elapsed:10.3f}{count / elapsed:12.0f}{query:16.2f}")
+
+
+if __name__ == "__main__":
+    main()
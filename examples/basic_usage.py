@@ -22,6 +22,7 @@ async def main():
     
     # Sample market data
     market_data = {
+        "price_data": [100.0, 101.0, 99.0, 102.0, 103.0, 101.0],
         "portfolio": {
             "BTC": 1.5,
             "ETH": 10.0,
@@ -0,0 +1,65 @@
+import asyncio
+import time
+import pytest
+from barn.agents.base import AgentPool, AgentResult, BaseAgent
+
+class SleepyAgent(BaseAgent):
+    """Agent whose run sleeps for config['delay'] seconds."""
+    
+    async def process(self, input_data):
+        return input_data
+    
+    async def run(self):
+        await asyncio.sleep(self.config.get("delay", 0.05))
+        if self.config.get("fail"):
+            raise RuntimeError(f"{self.name} failed")
+        return self.name
+
+def make_pool(*configs, **kwargs):
+    pool = AgentPool(**kwargs)
+    for i, config in enumerate(configs):
+        pool.add_agent(SleepyAgent(f"agent_{i}", config))
+    return pool
+
+@pytest.mark.asyncio
+async def test_run_all_is_concurrent_and_ordered():
+    pool = make_pool(*[{"delay": 0.1}] * 10)
+    
+    start = time.perf_counter()
+    results = await pool.run_all()
+    elapsed = time.perf_counter() - start
+    
+    assert elapsed < 0.5
+    assert [r.result for r in results] == [f"agent_{i}" for i in range(10)]
+    assert all(isinstance(r, AgentResult) and r.ok and r.latency >= 0.09 for r in results)
+
+@pytest.mark.asyncio
+async def test_failures_and_timeouts_do_not_block_others():
+    pool = make_pool({"delay": 0.01}, {"delay": 0.01, "fail": True}, {"delay": 5.0})
+    
+    start = time.perf_counter()
+    ok, failed, slow = await pool.run_all(timeout=0.1)
+    
+    assert time.perf_counter() - start < 1.0
+    assert ok.ok and ok.result == "agent_0"
+    assert isinstance(failed.error, RuntimeError) and failed.result is None
+    assert isinstance(slow.error, asyncio.TimeoutError) and slow.latency >= 0.09
+
+@pytest.mark.asyncio
+async def test_agent_timeout_config_overrides_pool_default():
+    pool = make_pool({"delay": 0.15, "timeout": 1.0}, timeout=0.05)
+    
+    (result,) = await pool.run_all()
+    
+    assert result.ok
+
+@pytest.mark.asyncio
+async def test_max_concurrency_limits_parallel_runs():
+    pool = make_pool(*[{"delay": 0.05}] * 6, max_concurrency=2)
+    
+    start = time.perf_counter()
+    results = await pool.run_all()
+    
+    # Three waves of two agents
+    assert time.perf_counter() - start >= 0.15
+    assert all(r.ok for r in results)
@@ -0,0 +1,128 @@
+import pytest
+import numpy as np
+from datetime import datetime
+from barn.core import PortfolioOptimizer, Position, TokenAnalysisEngine
+from barn.core.archive import TickArchive
+
+def make_ticks(count, start=1_600_000_000.0, seed=0):
+    rng = np.random.default_rng(seed)
+    timestamps = start + np.arange(count) * 60.0
+    prices = 100 * np.cumprod(1 + rng.normal(0, 0.01, count))
+    volumes = rng.uniform(1_000, 5_000, count)
+    return timestamps, prices, volumes
+
+def test_round_trip_and_zero_copy_views(tmp_path):
+    archive = TickArchive(str(tmp_path))
+    timestamps, prices, volumes = make_ticks(500)
+    archive.append("ETH/USD", timestamps[:300], prices[:300], volumes[:300], {"rsi": prices[:300] / 2})
+    assert archive.append("ETH/USD", timestamps[300:], prices[300:], volumes[300:], {"rsi": prices[300:] / 2}) == 500
+
+    ticks = TickArchive(str(tmp_path)).read("ETH/USD")
+
+    assert archive.tokens() == ["ETH/USD"]
+    np.testing.assert_array_equal(ticks.timestamps, timestamps)
+    np.testing.assert_array_equal(ticks.prices, prices)
+    np.testing.assert_array_equal(ticks.volumes, volumes)
+    np.testing.assert_array_equal(ticks.indicators["rsi"], prices / 2)
+    assert isinstance(ticks.prices.base, np.memmap)
+    assert not ticks.prices.flags.writeable
+
+    index = archive.index("ETH/USD")
+    assert index["first"] == timestamps[0] and index["last"] == timestamps[-1]
+
+def test_time_range_and_last(tmp_path):
+    archive = TickArchive(str(tmp_path))
+    timestamps, prices, volumes = make_ticks(100)
+    archive.append("BTC", timestamps, prices, volumes)
+
+    ticks = archive.read("BTC", start=timestamps[10], end=timestamps[20])
+    np.testing.assert_array_equal(ticks.prices, prices[10:20])
+
+    tail = archive.read("BTC", end=timestamps[50], last=5)
+    np.testing.assert_array_equal(tail.timestamps, timestamps[45:50])
+
+    assert len(archive.read("BTC", start=timestamps[-1] + 1)) == 0
+    assert len(archive.read("missing")) == 0
+
+def test_indicators_backfilled_with_nan(tmp_path):
+    archive = TickArchive(str(tmp_path))
+    timestamps, prices, volumes = make_ticks(6)
+    archive.append("SOL", timestamps[:3], prices[:3], volumes[:3], {"rsi": [1.0, 2.0, 3.0]})
+    archive.append("SOL", timestamps[3:], prices[3:], volumes[3:], {"macd": [4.0, 5.0, 6.0]})
+
+    ticks = archive.read("SOL")
+
+    np.testing.assert_array_equal(ticks.indicators["rsi"], [1, 2, 3, np.nan, np.nan, np.nan])
+    np.testing.assert_array_equal(ticks.indicators["macd"], [np.nan, np.nan, np.nan, 4, 5, 6])
+
+def test_rejects_out_of_order_ticks(tmp_path):
+    archive = TickArchive(str(tmp_path))
+    timestamps, prices, volumes = make_ticks(10)
+    archive.append("BTC", timestamps[5:], prices[5:], volumes[5:])
+
+    with pytest.raises(ValueError):
+        archive.append("BTC", timestamps[:5], prices[:5], volumes[:5])
+    with pytest.raises(ValueError):
+        archive.append("ETH", timestamps[::-1], prices, volumes)
+    with pytest.raises(ValueError):
+        archive.append("ETH", timestamps, prices[:3], volumes)
+    assert archive.index("BTC")["count"] == 5
+
+def test_bytes_past_the_index_are_ignored_and_overwritten(tmp_path):
+    archive = TickArchive(str(tmp_path))
+    timestamps, prices, volumes = make_ticks(20)
+    archive.append("BTC", timestamps[:10], prices[:10], volumes[:10])
+    # An append that crashed before committing its index
+    with open(tmp_path / "BTC" / "price.f8", "ab") as f:
+        f.write(np.full(4, -1.0).tobytes())
+
+    assert len(archive.read("BTC")) == 10
+    archive.append("BTC", timestamps[10:], prices[10:], volumes[10:])
+    np.testing.assert_array_equal(archive.read("BTC").prices, prices)
+
+def test_warm_engine_matches_ingesting_the_ticks(tmp_path):
+    archive = TickArchive(str(tmp_path))
+    config = {"market_window_size": 50}
+    columns = {"token": [], "timestamp": [], "price": [], "volume": [], "indicators": {"rsi": []}}
+    for seed, token in enumerate(["BTC", "ETH"]):
+        timestamps, prices, volumes = make_ticks(400, seed=seed)
+        archive.append(token, timestamps, prices, volumes, {"rsi": prices / 3})
+        columns["token"] += [token] * 300
+        columns["timestamp"] += list(timestamps[:300])
+        columns["price"] += list(prices[:300])
+        columns["volume"] += list(volumes[:300])
+        columns["indicators"]["rsi"] += list(prices[:300] / 3)
+
+    warm = TokenAnalysisEngine(config)
+    archive.warm_engine(warm, end=timestamps[300])
+    direct = TokenAnalysisEngine(config)
+    direct.ingest(columns)
+
+    for token in ("BTC", "ETH"):
+        expected = direct.token_analysis(token)
+        actual = warm.token_analysis(token)
+        assert actual["token_metrics"] == expected["token_metrics"]
+        for key, value in expected["risk_analysis"].items():
+            assert actual["risk_analysis"][key] == pytest.approx(value)
+
+def test_warm_optimizer_matches_position_updates(tmp_path):
+    archive = TickArchive(str(tmp_path))
+    history = {token: make_ticks(80, seed=seed) for seed, token in enumerate(["BTC", "ETH", "SOL"])}
+    for token, (timestamps, prices, volumes) in history.items():
+        archive.append(token, timestamps, prices, volumes)
+
+    warm = PortfolioOptimizer({"max_history_length": 50})
+    direct = PortfolioOptimizer({"max_history_length": 50})
+    # The final tick of each token arrives as a live position update
+    archive.warm_optimizer(warm, end=history["BTC"][0][-1])
+    for i in range(79):
+        for token, (timestamps, prices, _) in history.items():
+            direct.update_position(Position(token, 1.0, 100.0, float(prices[i]), datetime.fromtimestamp(timestamps[i])))
+    for optimizer in (warm, direct):
+        for token, (timestamps, prices, _) in history.items():
+            optimizer.update_position(Position(token, 1.0, 100.0, float(prices[-1]), datetime.fromtimestamp(timestamps[-1])))
+
+    _, warm_mu, warm_cov = warm.return_moments()
+    _, direct_mu, direct_cov = direct.return_moments()
+    np.testing.assert_allclose(warm_mu, direct_mu)
+    np.testing.assert_allclose(warm_cov, direct_cov)
@@ -0,0 +1,150 @@
+import pytest
+import numpy as np
+from datetime import datetime, timedelta
+from barn.core.buffers import MarketRingBuffer
+from barn.core.engine import TokenAnalysisEngine, MarketSignal
+
+def make_signals(token, n, seed=0):
+    rng = np.random.default_rng(seed)
+    prices = 100 * np.cumprod(1 + rng.normal(0, 0.01, n))
+    volumes = rng.uniform(1e3, 1e4, n)
+    start = datetime(2024, 1, 1)
+    return [
+        MarketSignal(
+            timestamp=start + timedelta(seconds=i),
+            token=token,
+            price=float(prices[i]),
+            volume=float(volumes[i]),
+            indicators={"rsi": float(i)}
+        )
+        for i in range(n)
+    ]
+
+def test_ring_buffer_wraps_in_order():
+    buffer = MarketRingBuffer(4)
+    for i in range(10):
+        buffer.append(float(i), float(i), float(i * 10), {"rsi": float(i)})
+        
+    assert buffer.is_full
+    np.testing.assert_array_equal(buffer.prices, [6, 7, 8, 9])
+    np.testing.assert_array_equal(buffer.volumes, [60, 70, 80, 90])
+    np.testing.assert_array_equal(buffer.indicators[:, 0], [6, 7, 8, 9])
+    assert buffer.prices.base is not None  # view, not a copy
+    assert buffer.latest_indicators() == {"rsi": 9.0}
+
+def test_ring_buffer_new_indicator_mid_stream():
+    buffer = MarketRingBuffer(3)
+    buffer.append(0.0, 1.0, 1.0, {"rsi": 50.0})
+    buffer.append(1.0, 2.0, 1.0, {"rsi": 55.0, "macd": 1.5})
+    
+    assert buffer.indicator_names == ["rsi", "macd"]
+    assert buffer.latest_indicators() == {"rsi": 55.0, "macd": 1.5}
+    assert np.isnan(buffer.indicators[0, 1])
+
+@pytest.mark.asyncio
+async def test_engine_matches_full_window_computation():
+    window = 16
+    engine = TokenAnalysisEngine({"market_window_size": window})
+    signals = make_signals("ETH", 50)
+    for signal in signals:
+        result = await engine.process_market_signal(signal)
+        
+    prices = [s.price for s in signals[-window:]]
+    volumes = [s.volume for s in signals[-window:]]
+    risk = result["risk_analysis"]["ETH"]
+    
+    returns = np.diff(prices) / np.array(prices[:-1])
+    assert risk["price_volatility"] == pytest.approx(np.std(returns))
+    assert risk["volume_trend"] == pytest.approx(
+        np.polyfit(np.arange(window), volumes, 1)[0]
+    )
+    metrics = result["token_metrics"]["ETH"]
+    assert metrics["current_price"] == signals[-1].price
+    assert metrics["rsi"] == 49.0
+
+@pytest.mark.asyncio
+async def test_only_touched_tokens_are_reanalyzed():
+    engine = TokenAnalysisEngine({"market_window_size": 8, "risk_threshold": 1.1})
+    for eth, btc in zip(make_signals("ETH", 5), make_signals("BTC", 5, seed=1)):
+        await engine.process_market_signal(eth)
+        first = await engine.process_market_signal(btc)
+        
+    second = await engine.process_market_signal(make_signals("BTC", 1, seed=2)[0])
+    
+    assert second["risk_analysis"]["ETH"] is first["risk_analysis"]["ETH"]
+    assert second["risk_analysis"]["BTC"] is not first["risk_analysis"]["BTC"]
+    assert [s["token"] for s in second["trading_signals"]] == ["ETH", "BTC"]
+    assert second["trading_signals"][0]["confidence"] == pytest.approx(
+        1 - second["risk_analysis"]["ETH"]["risk_score"]
+    )
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("burst", [3, 40])
+async def test_batch_matches_sequential_processing(burst):
+    signals = [
+        s for pair in zip(make_signals("ETH", 60), make_signals("BTC", 60, seed=1))
+        for s in pair
+    ]
+    sequential = TokenAnalysisEngine({"market_window_size": 16})
+    for signal in signals:
+        expected = await sequential.process_market_signal(signal)
+        
+    batched = TokenAnalysisEngine({"market_window_size": 16})
+    for i in range(0, len(signals), burst):
+        result = await batched.process_market_signals(signals[i:i + burst])
+        
+    assert list(result["risk_analysis"]) == ["ETH", "BTC"]
+    for token in ("ETH", "BTC"):
+        for key, value in expected["risk_analysis"][token].items():
+            assert result["risk_analysis"][token][key] == pytest.approx(value, rel=1e-9)
+        assert result["token_metrics"][token] == pytest.approx(expected["token_metrics"][token])
+    np.testing.assert_array_equal(
+        batched._market_state["BTC"].prices, sequential._market_state["BTC"].prices
+    )
+
+@pytest.mark.asyncio
+async def test_batch_accepts_columnar_arrays():
+    engine = TokenAnalysisEngine({"market_window_size": 4, "risk_threshold": 1.1})
+    result = await engine.process_market_signals({
+        "token": np.array(["SOL", "ETH", "SOL", "SOL"]),
+        "timestamp": np.array(["2024-01-01T00:00:00"] * 4, dtype="datetime64[s]"),
+        "price": np.array([10.0, 2000.0, 11.0, 12.0]),
+        "volume": np.array([5.0, 1.0, 6.0, 7.0]),
+        "indicators": {"rsi": np.array([40.0, 50.0, 60.0, np.nan])}
+    })
+    
+    assert list(result["token_metrics"]) == ["SOL", "ETH"]
+    assert result["token_metrics"]["SOL"]["current_price"] == 12.0
+    assert "rsi" not in result["token_metrics"]["SOL"]
+    assert result["token_metrics"]["ETH"]["rsi"] == 50.0
+    assert [s["token"] for s in result["trading_signals"]] == ["SOL", "ETH"]
+    np.testing.assert_array_equal(engine._market_state["SOL"].prices, [10.0, 11.0, 12.0])
+
+@pytest.mark.asyncio
+async def test_token_analysis_returns_copies_of_the_caches():
+    engine = TokenAnalysisEngine({"risk_threshold": 1.1})
+    await engine.process_market_signals(make_signals("BTC", 5))
+    
+    analysis = engine.token_analysis("BTC")
+    analysis["risk_analysis"]["risk_score"] = 99
+    analysis["token_metrics"]["current_price"] = -1
+    analysis["trading_signal"]["action"] = "SELL"
+    
+    again = engine.token_analysis("BTC")
+    assert again["risk_analysis"]["risk_score"] != 99
+    assert again["token_metrics"]["current_price"] > 0
+    assert again["trading_signal"]["action"] == "ANALYZE"
+
+@pytest.mark.parametrize("field, values", [
+    ("price", [1.0, 2.0, 3.0]),
+    ("volume", [1.0]),
+    ("timestamp", [1.0, 2.0, 3.0]),
+    ("indicators", {"rsi": [50.0]})
+])
+def test_batch_rejects_mismatched_column_lengths(field, values):
+    engine = TokenAnalysisEngine()
+    columns = {"token": ["BTC", "ETH"], "price": [1.0, 2.0], "volume": [1.0, 1.0], field: values}
+    
+    with pytest.raises(ValueError):
+        engine.ingest(columns)
+    assert not engine._market_state
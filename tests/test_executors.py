@@ -0,0 +1,63 @@
+import os
+import threading
+import numpy as np
+import pytest
+from barn.agents.base import BaseAgent, get_executor, shutdown_executors
+from barn.agents.portfolio_manager import PortfolioManagerAgent
+from barn.agents.risk_analyzer import RiskAnalyzerAgent
+from barn.agents.trading_agent import TradingAgent
+
+class EchoAgent(BaseAgent):
+    async def process(self, input_data):
+        return await self.offload(where, input_data)
+    
+    async def run(self):
+        return await self.process(None)
+
+def where(_):
+    return os.getpid(), threading.get_ident()
+
+@pytest.fixture(scope="module", autouse=True)
+def pools():
+    yield
+    shutdown_executors()
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("kind, same_pid, same_thread", [
+    ("inline", True, True),
+    ("thread", True, False),
+    ("process", False, False)
+])
+async def test_offload_runs_on_configured_executor(kind, same_pid, same_thread):
+    pid, thread = await EchoAgent("echo", {"executor": kind}).run()
+    
+    assert (pid == os.getpid()) is same_pid
+    if same_pid:
+        assert (thread == threading.get_ident()) is same_thread
+
+def test_default_executors_and_validation():
+    assert RiskAnalyzerAgent("risk").executor == "thread"
+    assert PortfolioManagerAgent("portfolio").executor == "inline"
+    assert TradingAgent("trader").executor == "inline"
+    assert get_executor("thread", 2) is get_executor("thread", 2)
+    with pytest.raises(ValueError, match="Unknown executor"):
+        get_executor("gpu")
+
+@pytest.mark.asyncio
+async def test_offloaded_agents_match_inline_results():
+    rng = np.random.default_rng(0)
+    portfolio_data = {
+        "current_allocation": {f"T{i}": 1.0 for i in range(5)},
+        "historical_returns": {f"T{i}": list(rng.normal(0.001, 0.02, 60)) for i in range(5)}
+    }
+    prices = 100 * np.cumprod(1 + rng.normal(0, 0.01, (3, 50)), axis=1)
+    
+    offloaded = await PortfolioManagerAgent("p", {"executor": "process"}).process(portfolio_data)
+    inline = await PortfolioManagerAgent("p", {"executor": "inline"}).process(portfolio_data)
+    risk = await RiskAnalyzerAgent("r").process(prices)
+    risk_inline = await RiskAnalyzerAgent("r", {"executor": "inline"}).process(prices)
+    
+    assert offloaded["optimal_weights"].keys() == inline["optimal_weights"].keys()
+    np.testing.assert_allclose(list(offloaded["optimal_weights"].values()), list(inline["optimal_weights"].values()))
+    for metric in risk:
+        np.testing.assert_allclose(risk[metric], risk_inline[metric])
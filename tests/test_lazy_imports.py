@@ -0,0 +1,29 @@
+import json
+import subprocess
+import sys
+
+def loaded_after(statement):
+    probe = (
+        f"import json, sys; {statement}; "
+        "print(json.dumps(sorted(m for m in ('numpy', 'scipy.optimize', "
+        "'barn.orchestrator', 'barn.agents.portfolio_manager') if m in sys.modules)))"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", probe], check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output)
+
+def test_import_barn_is_lazy():
+    assert loaded_after("import barn") == []
+    assert loaded_after("from barn import TradingAgent") == []
+
+def test_scipy_deferred_until_optimization():
+    assert "scipy.optimize" not in loaded_after("from barn import BarnOrchestrator")
+    assert "scipy.optimize" not in loaded_after("from barn.core import PortfolioOptimizer")
+
+def test_lazy_attributes_resolve():
+    import barn
+    import barn.core
+    from barn.agents.base import AgentPool
+    assert barn.AgentPool is AgentPool
+    assert set(barn.core.__all__) <= set(dir(barn.core))
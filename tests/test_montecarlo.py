@@ -0,0 +1,76 @@
+import pytest
+import numpy as np
+from datetime import datetime
+from scipy.stats import norm
+from barn.core import PortfolioOptimizer, Position
+from barn.core.montecarlo import MonteCarloVaR
+
+def make_moments(n_assets=4, seed=0):
+    rng = np.random.default_rng(seed)
+    loadings = rng.normal(0, 0.01, (n_assets, n_assets))
+    return rng.normal(0.0005, 0.0005, n_assets), loadings @ loadings.T + np.eye(n_assets) * 1e-4
+
+def test_single_step_matches_normal_quantiles():
+    mu, cov = make_moments()
+    weights = np.array([0.4, 0.3, 0.2, 0.1])
+    engine = MonteCarloVaR(mu, cov, weights, confidences=(0.95, 0.99), chunk_size=40_000, seed=1)
+    
+    result = engine.run(400_000)
+    
+    mean, std = mu @ weights, np.sqrt(weights @ cov @ weights)
+    for confidence in (0.95, 0.99):
+        z = norm.ppf(1 - confidence)
+        assert result.value_at_risk[confidence] == pytest.approx(mean + z * std, rel=0.02)
+        # Normal expected shortfall: mean - std * pdf(z) / (1 - confidence)
+        expected = mean - std * norm.pdf(z) / (1 - confidence)
+        assert result.expected_shortfall[confidence] == pytest.approx(expected, rel=0.02)
+    assert result.paths == 400_000 and result.chunks == 10
+
+def test_results_reproducible_across_workers_and_streamed():
+    mu, cov = make_moments()
+    weights = np.full(4, 0.25)
+    kwargs = dict(horizon=5, chunk_size=5_000, seed=7)
+    
+    serial = MonteCarloVaR(mu, cov, weights, max_workers=1, **kwargs).run(23_000)
+    pooled = MonteCarloVaR(mu, cov, weights, max_workers=2, **kwargs).run(23_000)
+    partial = list(MonteCarloVaR(mu, cov, weights, **kwargs).stream(23_000))
+    
+    assert pooled.value_at_risk == serial.value_at_risk
+    assert pooled.expected_shortfall == serial.expected_shortfall
+    assert [p.paths for p in partial] == [5_000, 10_000, 15_000, 20_000, 23_000]
+    assert [p.complete for p in partial] == [False] * 4 + [True]
+    assert partial[-1].value_at_risk == serial.value_at_risk
+
+def test_from_optimizer_uses_optimizer_moments():
+    optimizer = PortfolioOptimizer()
+    rng = np.random.default_rng(3)
+    prices = 100 * np.cumprod(1 + rng.normal(0.001, 0.02, (60, 3)), axis=0)
+    for row in prices:
+        for i, price in enumerate(row):
+            optimizer.update_position(Position(f"T{i}", float(i + 1), 100.0, float(price), datetime.now()))
+            
+    engine = MonteCarloVaR.from_optimizer(optimizer, seed=0)
+    
+    tokens, mu, cov = optimizer.return_moments()
+    np.testing.assert_allclose(engine.factor @ engine.factor.T, cov)
+    np.testing.assert_allclose(engine.weights, [optimizer.current_weights()[t] for t in tokens])
+    assert engine.run(10_000).value_at_risk[0.95] < 0
+
+def test_interleaved_streams_keep_their_own_scenario():
+    mu, cov = make_moments()
+    weights = np.full(4, 0.25)
+    kwargs = dict(chunk_size=2_000, seed=5)
+    scenarios = [(mu, cov), (mu * 10, cov * 0.01)]
+    alone = [MonteCarloVaR(m, c, weights, **kwargs).run(10_000) for m, c in scenarios]
+    
+    streams = [MonteCarloVaR(m, c, weights, **kwargs).stream(10_000) for m, c in scenarios]
+    for interleaved in zip(*streams):
+        pass
+    
+    for result, expected in zip(interleaved, alone):
+        assert result.value_at_risk == expected.value_at_risk
+
+def test_run_requires_paths():
+    mu, cov = make_moments()
+    with pytest.raises(ValueError):
+        MonteCarloVaR(mu, cov, np.full(4, 0.25)).run(0)
@@ -0,0 +1,96 @@
+import asyncio
+import time
+import pytest
+from barn.orchestrator import BarnOrchestrator
+from barn.agents.base import BaseAgent
+
+class StageAgent(BaseAgent):
+    """Agent that sleeps, then records which inputs it saw."""
+    
+    def __init__(self, name, inputs, outputs, delay=0.05, log=None):
+        super().__init__(name, {})
+        self.inputs = inputs
+        self.outputs = outputs
+        self.delay = delay
+        self.log = log if log is not None else []
+    
+    async def process(self, input_data):
+        return input_data
+    
+    async def run(self):
+        self.log.append(("start", self.name))
+        await asyncio.sleep(self.delay)
+        self.log.append(("end", self.name))
+        return {key: self.state.get(key) for key in self.inputs}
+
+@pytest.fixture
+def market_data():
+    return {
+        "price_data": [100.0, 101.0, 99.0, 102.0, 103.0, 101.0],
+        "portfolio": {"BTC": 1.5, "ETH": 10.0},
+        "historical_returns": {
+            "BTC": [0.01, -0.02, 0.03, 0.01, -0.01],
+            "ETH": [0.02, -0.01, 0.02, -0.02, 0.01]
+        }
+    }
+
+@pytest.mark.asyncio
+async def test_default_agents_process_market_data(market_data):
+    barn = BarnOrchestrator()
+    barn.initialize_agents()
+    
+    results = await barn.run(market_data)
+    
+    assert set(results) == {"risk_analysis", "trade_decision", "portfolio_update"}
+    assert results["risk_analysis"]["volatility"] > 0
+    assert "action" in results["trade_decision"]
+    assert set(results["portfolio_update"]["optimal_weights"]) == {"BTC", "ETH"}
+    assert barn.get_agent("trader").state["signal_data"] == {"risk_score": 1.0}
+
+@pytest.mark.asyncio
+async def test_independent_stages_run_concurrently():
+    log = []
+    barn = BarnOrchestrator()
+    barn.add_agent(StageAgent("risk", ("market_data",), ("risk",), 0.1, log))
+    barn.add_agent(StageAgent("trade", ("risk",), ("trade",), 0.1, log))
+    barn.add_agent(StageAgent("portfolio", ("market_data",), ("portfolio",), 0.15, log))
+    
+    start = time.perf_counter()
+    results = await barn.process_market_data({"price": 1})
+    elapsed = time.perf_counter() - start
+    
+    # Critical path risk -> trade is 0.2 s; sequential would be 0.35 s
+    assert elapsed < 0.3
+    assert log.index(("start", "trade")) > log.index(("end", "risk"))
+    assert log.index(("start", "portfolio")) < log.index(("end", "risk"))
+    assert results["trade"] == {"risk": {"market_data": {"price": 1}}}
+
+def test_graph_errors():
+    barn = BarnOrchestrator()
+    barn.add_agent(StageAgent("a", ("b_out",), ("a_out",)))
+    with pytest.raises(ValueError, match="cycle"):
+        barn.add_agent(StageAgent("b", ("a_out",), ("b_out",)))
+    assert list(barn.agents) == ["a"] and len(barn.agent_pool.agents) == 1
+    
+    barn = BarnOrchestrator()
+    barn.add_agent(StageAgent("a", (), ("out",)))
+    with pytest.raises(ValueError, match="produced by both"):
+        barn.add_agent(StageAgent("b", (), ("out",)))
+    with pytest.raises(ValueError, match="already registered"):
+        barn.add_agent(StageAgent("a", (), ("other",)))
+
+@pytest.mark.asyncio
+async def test_failing_stage_cancels_dependents():
+    class Failing(StageAgent):
+        async def run(self):
+            raise RuntimeError("boom")
+    
+    log = []
+    barn = BarnOrchestrator()
+    barn.add_agent(Failing("risk", ("market_data",), ("risk",)))
+    barn.add_agent(StageAgent("trade", ("risk",), ("trade",), 0.01, log))
+    
+    with pytest.raises(RuntimeError, match="boom"):
+        await barn.run({})
+    await asyncio.sleep(0.02)
+    assert log == []
@@ -0,0 +1,248 @@
+import asyncio
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from datetime import datetime
+from scipy.optimize import check_grad
+from barn.agents.base import get_executor, shutdown_executors
+from barn.agents.portfolio_manager import PortfolioManagerAgent
+from barn.core import PortfolioOptimizer, Position
+from barn.core.parallel import PortfolioRequest, optimize_portfolios
+from barn.core.solvers import (
+    SLSQPSolver,
+    ProjectedGradientSolver,
+    get_solver,
+    negative_sharpe,
+    project_to_bounded_simplex
+)
+
+def make_moments(n_assets, seed=0):
+    rng = np.random.default_rng(seed)
+    returns = rng.normal(0.001, 0.02, (n_assets, 250)) + rng.normal(0, 0.01, (1, 250))
+    return returns.mean(axis=1), np.cov(returns)
+
+def feed_prices(optimizer, n_assets, n_ticks, seed=0):
+    rng = np.random.default_rng(seed)
+    prices = 100 * np.cumprod(1 + rng.normal(0.001, 0.02, (n_ticks, n_assets)), axis=0)
+    for row in prices:
+        for i, price in enumerate(row):
+            optimizer.update_position(Position(
+                token=f"T{i}",
+                amount=1.0,
+                entry_price=100.0,
+                current_price=float(price),
+                timestamp=datetime.now()
+            ))
+
+def test_negative_sharpe_gradient():
+    mu, cov = make_moments(8)
+    w = np.random.default_rng(1).dirichlet(np.ones(8))
+    error = check_grad(
+        lambda x: negative_sharpe(x, mu, cov, 0.0005)[0],
+        lambda x: negative_sharpe(x, mu, cov, 0.0005)[1],
+        w
+    )
+    assert error < 1e-6
+
+def test_bounded_simplex_projection():
+    w = project_to_bounded_simplex(np.array([0.9, 0.5, -0.3, 0.1]), 0.1, 0.6)
+    assert w.sum() == pytest.approx(1.0)
+    assert w.min() >= 0.1 - 1e-12 and w.max() <= 0.6 + 1e-12
+
+@pytest.mark.parametrize("min_weight", [0.0, 0.02])
+def test_solver_backends_agree(min_weight):
+    mu, cov = make_moments(30)
+    initial = np.full(30, 1 / 30)
+    slsqp = SLSQPSolver().solve(mu, cov, initial, min_weight=min_weight)
+    projected = ProjectedGradientSolver().solve(mu, cov, initial, min_weight=min_weight)
+    
+    assert slsqp.success and projected.success
+    assert projected.sharpe_ratio == pytest.approx(slsqp.sharpe_ratio, rel=1e-6)
+    np.testing.assert_allclose(projected.weights, slsqp.weights, atol=1e-4)
+    assert projected.weights.min() >= min_weight - 1e-9
+
+def test_get_solver_rejects_unknown_backend():
+    with pytest.raises(ValueError):
+        get_solver("simplex")
+
+@pytest.mark.parametrize("solver", ["slsqp", "projected_gradient"])
+def test_optimize_portfolio_respects_min_position(solver):
+    optimizer = PortfolioOptimizer({"min_position_size": 0.05, "solver": solver})
+    feed_prices(optimizer, 6, 60)
+    
+    weights = optimizer.optimize_portfolio()
+    
+    assert list(weights) == [f"T{i}" for i in range(6)]
+    assert sum(weights.values()) == pytest.approx(1.0)
+    assert min(weights.values()) >= 0.05 - 1e-9
+    assert optimizer.last_result.iterations > 0
+
+def test_rolling_moments_match_full_recompute():
+    optimizer = PortfolioOptimizer({"max_history_length": 40, "min_position_size": 0.0})
+    feed_prices(optimizer, 4, 30)
+    optimizer.optimize_portfolio()
+    feed_prices(optimizer, 4, 25, seed=1)
+    
+    optimizer.optimize_portfolio()
+    
+    returns_data = optimizer._calculate_returns_data()
+    np.testing.assert_allclose(optimizer._moments.mean, returns_data.mean(axis=1))
+    np.testing.assert_allclose(optimizer._moments.covariance, np.cov(returns_data))
+
+def test_unchanged_inputs_skip_the_solver():
+    optimizer = PortfolioOptimizer({"min_position_size": 0.0})
+    feed_prices(optimizer, 5, 50)
+    first = optimizer.optimize_portfolio()
+    
+    # Amount-only updates at the last price leave the moments untouched
+    for token, position in list(optimizer._positions.items()):
+        optimizer._positions[token] = Position(
+            token, 2.0, position.entry_price, position.current_price, position.timestamp
+        )
+    second = optimizer.optimize_portfolio()
+    
+    assert second == first
+    assert optimizer.solve_stats == {"solves": 1, "cache_hits": 1}
+
+def test_new_prices_warm_start_from_previous_weights():
+    optimizer = PortfolioOptimizer({"min_position_size": 0.0})
+    feed_prices(optimizer, 5, 50)
+    first = optimizer.optimize_portfolio()
+    
+    for position in list(optimizer._positions.values()):
+        optimizer.update_position(Position(
+            position.token, 1.0, 100.0, position.current_price * 1.001, datetime.now()
+        ))
+    np.testing.assert_array_equal(optimizer._get_initial_weights(), list(first.values()))
+    second = optimizer.optimize_portfolio()
+    
+    assert optimizer.solve_stats == {"solves": 2, "cache_hits": 0}
+    assert sum(second.values()) == pytest.approx(1.0)
+
+def test_late_token_does_not_produce_ragged_returns():
+    optimizer = PortfolioOptimizer({"min_position_size": 0.0, "max_history_length": 50})
+    feed_prices(optimizer, 3, 40)
+    rng = np.random.default_rng(5)
+    for _ in range(10):
+        for token in ["T0", "T1", "T2", "NEW"]:
+            optimizer.update_position(Position(
+                token, 1.0, 100.0, float(100 * (1 + rng.normal(0, 0.02))), datetime.now()
+            ))
+            
+    returns_data = optimizer._calculate_returns_data()
+    weights = optimizer.optimize_portfolio()
+    
+    assert returns_data.shape == (4, 9)
+    assert np.shares_memory(returns_data, optimizer._price_matrix._returns)
+    assert sum(weights.values()) == pytest.approx(1.0)
+
+def make_batch(n_portfolios, n_tokens=12, seed=0):
+    rng = np.random.default_rng(seed)
+    historical = {
+        f"T{i}": list(rng.normal(0.001 * (i % 4), 0.02, 120)) for i in range(n_tokens)
+    }
+    requests = []
+    for p in range(n_portfolios):
+        tokens = rng.choice(n_tokens, size=4, replace=False)
+        requests.append(PortfolioRequest(
+            portfolio_id=p,
+            allocation={f"T{i}": float(rng.uniform(1, 10)) for i in tokens},
+            risk_tolerance=float(rng.uniform())
+        ))
+    return requests, historical
+
+def test_batch_optimization_pool_matches_serial():
+    requests, historical = make_batch(9)
+    config = {"solver": "projected_gradient"}
+    
+    serial = optimize_portfolios(requests, historical, config, max_workers=1)
+    pooled = optimize_portfolios(requests, historical, config, max_workers=2, chunk_size=2)
+    
+    assert [r.portfolio_id for r in pooled] == list(range(9))
+    for a, b in zip(serial, pooled):
+        assert list(b.optimal_weights) == list(requests[b.portfolio_id].allocation)
+        assert b.optimal_weights == pytest.approx(a.optimal_weights)
+        assert b.rebalancing_trades == a.rebalancing_trades
+
+def test_concurrent_inline_batches_do_not_share_state():
+    batches = [make_batch(6, seed=seed) for seed in range(4)]
+    expected = [optimize_portfolios(requests, historical, max_workers=1) for requests, historical in batches]
+    
+    with ThreadPoolExecutor(4) as pool:
+        futures = [
+            pool.submit(optimize_portfolios, requests, historical, max_workers=1)
+            for requests, historical in batches * 3
+        ]
+        results = [future.result() for future in futures]
+    
+    for i, result in enumerate(results):
+        assert [r.optimal_weights for r in result] == [r.optimal_weights for r in expected[i % 4]]
+
+def test_batch_risk_tolerance_caps_weights():
+    requests, historical = make_batch(1)
+    cautious = PortfolioRequest(0, requests[0].allocation, risk_tolerance=0.0)
+    
+    weights = optimize_portfolios([cautious], historical, max_workers=1)[0].optimal_weights
+    
+    assert list(weights.values()) == pytest.approx([0.25] * 4)
+
+@pytest.mark.asyncio
+async def test_agent_optimize_many_matches_single_process():
+    requests, historical = make_batch(3)
+    agent = PortfolioManagerAgent("pm", {"batch_workers": 1})
+    
+    results = await agent.optimize_many(requests, historical)
+    
+    agent._update_portfolio_data({"current_allocation": requests[0].allocation, "historical_returns": historical})
+    trades = agent._calculate_rebalancing_trades(results[0].optimal_weights)
+    assert results[0].rebalancing_trades == trades
+    assert all(sum(r.optimal_weights.values()) == pytest.approx(1.0) for r in results)
+
+@pytest.mark.asyncio
+async def test_agent_optimize_many_uses_the_shared_process_pool():
+    requests, historical = make_batch(8)
+    config = {"batch_workers": 2, "batch_chunk_size": 3, "solver": "projected_gradient"}
+    agent = PortfolioManagerAgent("pm", config)
+    serial = optimize_portfolios(requests, historical, config, max_workers=1)
+    
+    try:
+        forward, backward = await asyncio.gather(
+            agent.optimize_many(requests, historical),
+            agent.optimize_many(requests[::-1], historical)
+        )
+        pool = get_executor("process", 2)
+        again = await agent.optimize_many(requests, historical)
+        assert get_executor("process", 2) is pool
+    finally:
+        shutdown_executors()
+    
+    for results, expected in ((forward, serial), (backward, serial[::-1]), (again, serial)):
+        assert [r.portfolio_id for r in results] == [r.portfolio_id for r in expected]
+        for a, b in zip(results, expected):
+            assert a.optimal_weights == pytest.approx(b.optimal_weights)
+
+def test_dropped_late_price_is_logged(caplog):
+    optimizer = PortfolioOptimizer({"price_interval": 60})
+    optimizer.update_position(Position("A", 1.0, 100.0, 100.0, datetime.fromtimestamp(0)))
+    optimizer.update_position(Position("A", 1.0, 100.0, 110.0, datetime.fromtimestamp(130)))
+    
+    with caplog.at_level("WARNING", logger="barn.portfolio"):
+        optimizer.update_position(Position("A", 1.0, 100.0, 105.0, datetime.fromtimestamp(70)))
+    
+    assert "Dropped late price for A" in caplog.text
+
+def test_infeasible_min_position_warns_once_per_asset_count(caplog):
+    optimizer = PortfolioOptimizer({"min_position_size": 0.3})
+    feed_prices(optimizer, 4, 20)
+    
+    with caplog.at_level("WARNING", logger="barn.portfolio"):
+        for _ in range(3):
+            optimizer.optimize_portfolio()
+            feed_prices(optimizer, 4, 2, seed=1)
+        feed_prices(optimizer, 5, 20, seed=2)
+        optimizer.optimize_portfolio()
+        optimizer.optimize_portfolio()
+    
+    warnings = [r.getMessage() for r in caplog.records if "infeasible" in r.getMessage()]
+    assert len(warnings) == 2
+    assert "for 4 assets" in warnings[0] and "for 5 assets" in warnings[1]
@@ -0,0 +1,56 @@
+import numpy as np
+from barn.core.prices import PriceMatrix
+
+def test_lockstep_updates_share_columns():
+    matrix = PriceMatrix(window=4)
+    for t, (a, b) in enumerate([(1.0, 10.0), (2.0, 11.0), (4.0, 12.0)]):
+        matrix.write("A", t, a)
+        matrix.write("B", t + 0.5, b)
+        
+    assert len(matrix) == 3
+    np.testing.assert_array_equal(matrix.prices, [[1, 2, 4], [10, 11, 12]])
+    np.testing.assert_allclose(matrix.returns, [[1.0, 1.0], [0.1, 1 / 11]])
+    assert matrix.observed.all()
+
+def test_interval_buckets_forward_fill_and_mask():
+    matrix = PriceMatrix(window=10, interval=60)
+    matrix.write("A", 0, 100.0)
+    matrix.write("B", 10, 50.0)
+    matrix.write("A", 70, 110.0)
+    matrix.write("A", 130, 121.0)
+    matrix.write("B", 150, 55.0)
+    
+    np.testing.assert_array_equal(matrix.times, [0, 60, 120])
+    np.testing.assert_array_equal(matrix.prices, [[100, 110, 121], [50, 50, 55]])
+    np.testing.assert_array_equal(matrix.observed, [[1, 1, 1], [1, 0, 1]])
+    np.testing.assert_allclose(matrix.returns, [[0.1, 0.1], [0.0, 0.1]])
+    
+    # A late price for B in the middle bucket is written in place
+    rewrites = matrix.rewrites
+    matrix.write("B", 61, 52.0)
+    assert matrix.rewrites == rewrites + 1
+    np.testing.assert_allclose(matrix.returns[1], [0.04, 55 / 52 - 1])
+    assert matrix.write("A", -300, 1.0) is False
+
+def test_window_eviction_and_growth_keep_views_contiguous():
+    matrix = PriceMatrix(window=5, asset_capacity=2)
+    for t in range(23):
+        for i in range(3):
+            matrix.write(f"T{i}", t, 100.0 + t + i)
+            
+    assert len(matrix) == 5
+    assert matrix.end_id - matrix.start_id == 5
+    np.testing.assert_array_equal(matrix.prices[0], 100.0 + np.arange(18, 23))
+    assert matrix.returns.flags["C_CONTIGUOUS"] is False
+    assert np.shares_memory(matrix.returns, matrix._returns)
+    assert matrix.first_seen_id("T2") == 0
+
+def test_late_price_without_a_column_is_counted():
+    matrix = PriceMatrix(window=10, interval=60)
+    matrix.write("A", 0, 100.0)
+    matrix.write("A", 130, 110.0)
+    
+    # Bucket 60 never opened a column
+    assert not matrix.write("A", 70, 105.0)
+    assert matrix.dropped == 1
+    np.testing.assert_array_equal(matrix.prices, [[100, 110]])
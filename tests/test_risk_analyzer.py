@@ -26,3 +26,31 @@ async def test_empty_data(risk_analyzer):
     with pytest.raises(ValueError):
         await risk_analyzer.run()
 
+
+@pytest.mark.asyncio
+async def test_batch_matches_single_series(risk_analyzer):
+    rng = np.random.default_rng(0)
+    matrix = 100 * np.cumprod(1 + rng.normal(0, 0.02, (6, 50)), axis=1)
+    
+    batch = await risk_analyzer.process(matrix)
+    
+    for i, row in enumerate(matrix):
+        single = await risk_analyzer.process(list(row))
+        returns = np.diff(row) / row[:-1]
+        assert single["volatility"] == pytest.approx(np.std(returns))
+        assert single["sharpe_ratio"] == pytest.approx(np.mean(returns - 0.01) / np.std(returns - 0.01))
+        assert single["value_at_risk"] == pytest.approx(np.percentile(returns, 5))
+        for name, values in batch.items():
+            assert values.shape == (6,)
+            assert values[i] == pytest.approx(single[name])
+
+@pytest.mark.asyncio
+async def test_expected_shortfall_is_tail_mean(risk_analyzer):
+    rng = np.random.default_rng(4)
+    prices = list(100 * np.cumprod(1 + rng.normal(0, 0.02, 200)))
+    
+    results = await risk_analyzer.process(prices)
+    
+    returns = np.diff(prices) / np.array(prices[:-1])
+    tail = returns[returns <= results["value_at_risk"]]
+    assert results["expected_shortfall"] == pytest.approx(tail.mean())
@@ -0,0 +1,81 @@
+import pytest
+import numpy as np
+from datetime import datetime, timedelta
+from barn.core import RiskManager, RiskMetrics
+from barn.core.risk_manager import composite_risk
+
+def make_metrics(token, timestamp, volatility=0.1):
+    return RiskMetrics(
+        token=token,
+        volatility=volatility,
+        var=-0.05,
+        expected_shortfall=-0.08,
+        liquidity_score=0.7,
+        timestamp=timestamp
+    )
+
+def test_update_metrics_expires_old_entries():
+    manager = RiskManager({"risk_window_days": 1})
+    now = datetime.now()
+    for hours in (30, 20, 10, 1):
+        manager.update_metrics(make_metrics("ETH", now - timedelta(hours=hours)))
+        
+    history = manager._risk_metrics["ETH"]
+    assert [m.timestamp for m in history] == [now - timedelta(hours=h) for h in (20, 10, 1)]
+
+def test_out_of_order_metrics_are_kept_sorted():
+    manager = RiskManager()
+    now = datetime.now()
+    for minutes in (10, 5, 1, 7, 0, 12):
+        manager.update_metrics(make_metrics("BTC", now - timedelta(minutes=minutes), volatility=minutes))
+        
+    history = manager._risk_metrics["BTC"]
+    assert [m.volatility for m in history] == [12, 10, 7, 5, 1, 0]
+    assert manager.get_risk_report()["token_metrics"]["BTC"]["metrics_timestamp"] == now
+
+def test_report_trends_match_full_recompute():
+    manager = RiskManager({"risk_window_days": 1, "trend_recompute_interval": 10 ** 6})
+    rng = np.random.default_rng(0)
+    now = datetime.now()
+    offsets = np.sort(rng.uniform(0, 40, 300))[::-1]
+    # Roughly one in ten metrics arrives a few minutes late
+    order = np.argsort(np.arange(300) + rng.integers(0, 4, 300) * (rng.random(300) < 0.1))
+    for i in order:
+        manager.update_metrics(RiskMetrics(
+            "SOL", rng.uniform(0, 0.2), -rng.uniform(0, 0.1), -rng.uniform(0, 0.15),
+            rng.uniform(0.5, 1), now - timedelta(hours=offsets[i])
+        ))
+        
+    history = manager._risk_metrics["SOL"]
+    metrics = list(history)
+    assert [m.timestamp for m in metrics] == sorted(m.timestamp for m in metrics)
+    composite = [manager._calculate_composite_risk(m) for m in metrics]
+    x = np.arange(len(metrics))
+    report = manager.get_risk_report()
+    token = report["token_metrics"]["SOL"]
+    trend = report["trend_analysis"]["SOL"]
+    assert token["volatility_trend"] == pytest.approx(np.polyfit(x, [m.volatility for m in metrics], 1)[0])
+    assert token["var_trend"] == pytest.approx(np.polyfit(x, [m.var for m in metrics], 1)[0])
+    assert trend["trend_strength"] == pytest.approx(abs(np.polyfit(x, composite, 1)[0]))
+    assert trend["current_momentum"] == pytest.approx(np.mean(composite[-5:]) - np.mean(composite[-20:]))
+
+def test_columnar_history_scores_match_per_record():
+    manager = RiskManager({"risk_weights": {"volatility": 0.5, "var": 0.25, "liquidity": 0.25}})
+    rng = np.random.default_rng(3)
+    now = datetime.now()
+    for i in range(200):
+        manager.update_metrics(RiskMetrics(
+            "ARB", rng.uniform(0, 0.2), -rng.uniform(0, 0.3), -rng.uniform(0, 0.3),
+            rng.uniform(0, 1), now - timedelta(seconds=200 - i)
+        ))
+        
+    history = manager._risk_metrics["ARB"]
+    expected = [manager._calculate_composite_risk(m) for m in history]
+    np.testing.assert_allclose(history.column("composite"), expected)
+    vectorized = composite_risk(
+        history.column("volatility"), history.column("var"),
+        history.column("expected_shortfall"), history.column("liquidity_score"),
+        manager.config["risk_weights"]
+    )
+    np.testing.assert_allclose(vectorized, expected)
+    assert not hasattr(history.latest(), "__dict__")
@@ -0,0 +1,56 @@
+import json
+import pytest
+import numpy as np
+from barn.agents.risk_analyzer import RiskAnalyzerAgent
+from barn.core.sketches import TDigest
+from barn.core.tail_risk import tail_risk
+
+@pytest.fixture
+def heavy_tailed_returns():
+    return np.random.default_rng(0).standard_t(3, 200_000) * 0.01
+
+@pytest.mark.parametrize("confidence", [0.95, 0.99])
+def test_tdigest_tail_matches_exact(heavy_tailed_returns, confidence):
+    digest = TDigest(200)
+    for chunk in np.array_split(heavy_tailed_returns, 40):
+        digest.update_many(chunk)
+        
+    var, shortfall = tail_risk(np.sort(heavy_tailed_returns), confidence)
+    assert digest.value_at_risk(confidence) == pytest.approx(var, rel=0.02)
+    assert digest.expected_shortfall(confidence) == pytest.approx(shortfall, rel=0.02)
+    assert len(digest) < 200
+    assert digest.quantile(0.0) == heavy_tailed_returns.min()
+
+def test_merged_shards_match_single_digest(heavy_tailed_returns):
+    shards = [TDigest(200).update_many(part) for part in np.array_split(heavy_tailed_returns, 8)]
+    # Shards travel as plain JSON, without the raw returns
+    shipped = [TDigest.from_dict(json.loads(json.dumps(s.to_dict()))) for s in shards]
+    
+    merged = TDigest.merge_all(shipped)
+    
+    var, shortfall = tail_risk(np.sort(heavy_tailed_returns), 0.99)
+    assert merged.count == len(heavy_tailed_returns)
+    assert merged.value_at_risk(0.99) == pytest.approx(var, rel=0.03)
+    assert merged.expected_shortfall(0.99) == pytest.approx(shortfall, rel=0.03)
+
+def test_single_value_updates_match_blocks():
+    values = np.random.default_rng(1).normal(0, 1, 5000)
+    streamed = TDigest(100)
+    for value in values:
+        streamed.update(float(value))
+    blocked = TDigest(100).update_many(values)
+    
+    assert streamed.quantile(np.array([0.05, 0.5, 0.95])) == pytest.approx(
+        blocked.quantile(np.array([0.05, 0.5, 0.95])), abs=0.05
+    )
+
+@pytest.mark.asyncio
+async def test_risk_analyzer_tdigest_backend():
+    rng = np.random.default_rng(2)
+    matrix = 100 * np.cumprod(1 + rng.normal(0, 0.02, (3, 5000)), axis=1)
+    exact = await RiskAnalyzerAgent("exact").process(matrix)
+    sketched = await RiskAnalyzerAgent("sketch", {"quantile_backend": "tdigest"}).process(matrix)
+    
+    for name in ("value_at_risk", "expected_shortfall"):
+        np.testing.assert_allclose(sketched[name], exact[name], rtol=0.03)
+    np.testing.assert_array_equal(sketched["volatility"], exact["volatility"])
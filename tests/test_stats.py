@@ -0,0 +1,83 @@
+import pytest
+import numpy as np
+from barn.core.buffers import MarketRingBuffer
+from barn.core.stats import RollingVariance, RollingSlope, OnlineMarketStats
+
+def test_rolling_variance_matches_numpy():
+    rng = np.random.default_rng(1)
+    values = rng.normal(0, 0.02, 500)
+    window = 50
+    rolling = RollingVariance()
+    for i, value in enumerate(values):
+        if i >= window:
+            rolling.replace(value, values[i - window])
+        else:
+            rolling.push(value)
+            
+    expected = values[-window:]
+    assert rolling.mean == pytest.approx(np.mean(expected), rel=1e-9)
+    assert rolling.std == pytest.approx(np.std(expected), rel=1e-9)
+    
+    rolling.remove(expected[0])
+    assert rolling.std == pytest.approx(np.std(expected[1:]), rel=1e-9)
+
+def test_rolling_slope_matches_polyfit():
+    rng = np.random.default_rng(2)
+    values = rng.uniform(1e3, 1e4, 500) + np.arange(500) * 3.0
+    window = 64
+    rolling = RollingSlope()
+    for i, value in enumerate(values):
+        if i >= window:
+            rolling.popleft(values[i - window])
+        rolling.push(value)
+        
+    expected = np.polyfit(np.arange(window), values[-window:], 1)[0]
+    assert rolling.slope == pytest.approx(expected, rel=1e-9)
+
+@pytest.mark.parametrize("recompute_interval", [10**9, 7])
+def test_online_market_stats_track_full_window(recompute_interval):
+    rng = np.random.default_rng(3)
+    window = 32
+    buffer = MarketRingBuffer(window)
+    stats = OnlineMarketStats(recompute_interval)
+    prices = 100 * np.cumprod(1 + rng.normal(0, 0.01, 1000))
+    volumes = rng.uniform(1e5, 1e6, 1000)
+    
+    for i in range(1000):
+        evicted = (buffer.prices[0], buffer.volumes[0]) if buffer.is_full else (None, None)
+        buffer.append(float(i), prices[i], volumes[i])
+        stats.update(buffer, *evicted)
+        
+        if i % 97 == 0 or i == 999:
+            window_prices = buffer.prices
+            if len(window_prices) >= 2:
+                returns = np.diff(window_prices) / window_prices[:-1]
+                assert stats.volatility == pytest.approx(np.std(returns), rel=1e-8)
+                assert stats.trend == pytest.approx(
+                    np.polyfit(np.arange(len(window_prices)), buffer.volumes, 1)[0],
+                    rel=1e-7, abs=1e-6
+                )
+
+def test_online_market_stats_block_updates():
+    rng = np.random.default_rng(4)
+    window = 50
+    buffer = MarketRingBuffer(window)
+    stats = OnlineMarketStats(10**9)
+    prices = 100 * np.cumprod(1 + rng.normal(0, 0.01, 2000))
+    volumes = rng.uniform(1e5, 1e6, 2000)
+    
+    i = 0
+    for size in [1, 7, 30, 3, 49] * 20:
+        evicted = min(max(len(buffer) + size - window, 0), len(buffer))
+        evicted_prices = buffer.prices[:evicted].copy()
+        evicted_volumes = buffer.volumes[:evicted].copy()
+        buffer.extend(np.arange(i, i + size), prices[i:i + size], volumes[i:i + size])
+        stats.update_many(buffer, size, evicted_prices, evicted_volumes)
+        i += size
+        
+    np.testing.assert_array_equal(buffer.prices, prices[i - window:i])
+    returns = np.diff(buffer.prices) / buffer.prices[:-1]
+    assert stats.volatility == pytest.approx(np.std(returns), rel=1e-8)
+    assert stats.trend == pytest.approx(
+        np.polyfit(np.arange(window), buffer.volumes, 1)[0], rel=1e-7
+    )
@@ -0,0 +1,127 @@
+import asyncio
+import pytest
+from barn.orchestrator import BarnOrchestrator
+from barn.streaming import StreamingPipeline, StreamResult
+
+class RecordingPipeline:
+    """Pipeline stand-in that keeps its own history of processed updates."""
+    
+    def __init__(self, delay=0.0):
+        self.seen = []
+        self.delay = delay
+    
+    async def process_market_data(self, market_data):
+        await asyncio.sleep(self.delay)
+        if market_data.get("fail"):
+            raise RuntimeError("bad update")
+        self.seen.append(market_data["n"])
+        return {"n": market_data["n"], "count": len(self.seen)}
+
+def feed(tokens, per_token):
+    return [(token, {"n": n}) for n in range(per_token) for token in tokens]
+
+@pytest.mark.asyncio
+async def test_tokens_keep_isolated_state_and_order():
+    tokens = [f"T{i}" for i in range(8)]
+    async with StreamingPipeline(RecordingPipeline, workers=3, queue_size=4) as pipeline:
+        feeder = asyncio.ensure_future(pipeline.feed(feed(tokens, 20)))
+        results = [result async for result in pipeline]
+        await feeder
+    
+    assert len(results) == 160 and all(isinstance(r, StreamResult) and r.ok for r in results)
+    for token in tokens:
+        own = [r.results for r in results if r.token == token]
+        assert own == [{"n": n, "count": n + 1} for n in range(20)]
+        assert pipeline.pipelines[token].seen == list(range(20))
+
+@pytest.mark.asyncio
+async def test_bounded_queues_apply_backpressure():
+    async with StreamingPipeline(RecordingPipeline, workers=1, queue_size=2) as pipeline:
+        feeder = asyncio.ensure_future(pipeline.feed(feed(["A"], 50)))
+        await asyncio.sleep(0.05)
+        
+        # Nothing consumed: 2 results queued, 1 in flight, 2 waiting in the shard
+        assert not feeder.done()
+        assert pipeline._sequence <= 6
+        
+        results = [result async for result in pipeline]
+        await feeder
+    assert [r.sequence for r in results] == list(range(50))
+
+@pytest.mark.asyncio
+async def test_failed_update_does_not_stop_stream():
+    updates = [("A", {"n": 0}), ("A", {"n": 1, "fail": True}), ("A", {"n": 2})]
+    async with StreamingPipeline(RecordingPipeline, workers=2) as pipeline:
+        feeder = asyncio.ensure_future(pipeline.feed(updates))
+        results = [result async for result in pipeline]
+        await feeder
+    
+    assert [r.ok for r in results] == [True, False, True]
+    assert isinstance(results[1].error, RuntimeError)
+    assert results[2].results == {"n": 2, "count": 2}
+
+@pytest.mark.asyncio
+async def test_least_recently_updated_pipelines_are_evicted():
+    updates = [("A", {"n": 0}), ("B", {"n": 0}), ("A", {"n": 1}), ("C", {"n": 0}), ("B", {"n": 1})]
+    async with StreamingPipeline(RecordingPipeline, workers=1, max_pipelines=2) as pipeline:
+        feeder = asyncio.ensure_future(pipeline.feed(updates))
+        results = [result async for result in pipeline]
+        await feeder
+    
+    # C evicted B, so B's second update started over; then B evicted A
+    assert [r.results["count"] for r in results] == [1, 1, 2, 1, 1]
+    assert list(pipeline.pipelines) == ["C", "B"]
+    assert pipeline.evicted == 2
+
+@pytest.mark.asyncio
+async def test_pipelines_in_flight_are_evicted_once_idle():
+    tokens = [f"T{i}" for i in range(6)]
+    async with StreamingPipeline(lambda: RecordingPipeline(0.01), workers=4, max_pipelines=1) as pipeline:
+        feeder = asyncio.ensure_future(pipeline.feed(feed(tokens, 3)))
+        results = [result async for result in pipeline]
+        await feeder
+    
+    assert all(r.ok for r in results)
+    assert len(pipeline.pipelines) == 1
+
+@pytest.mark.asyncio
+async def test_dropped_token_starts_a_fresh_pipeline():
+    async with StreamingPipeline(RecordingPipeline, workers=1) as pipeline:
+        await pipeline.submit("A", {"n": 0})
+        first = await pipeline._results.get()
+        assert pipeline.drop("A") and not pipeline.drop("A")
+        await pipeline.submit("A", {"n": 1})
+        second = await pipeline._results.get()
+    
+    assert first.results["count"] == 1 and second.results["count"] == 1
+
+@pytest.mark.asyncio
+async def test_orchestrator_stream_runs_agents_per_token():
+    async def updates():
+        for step in range(3):
+            for token, drift in (("BTC", 0.01), ("ETH", -0.01)):
+                yield token, {
+                    "price_data": [100 * (1 + drift) ** i for i in range(10 + step)],
+                    "portfolio": {token: 1.0, "USDC": 100.0},
+                    "historical_returns": {token: [drift, 0.02, -0.01], "USDC": [0.0, 0.001, 0.0]}
+                }
+    
+    barn = BarnOrchestrator({"stream_workers": 2, "stream_queue_size": 2, "stream_max_pipelines": 1})
+    results = [result async for result in barn.stream(updates())]
+    
+    assert len(results) == 6 and all(r.ok for r in results)
+    assert {r.token for r in results} == {"BTC", "ETH"}
+    assert all(set(r.results) == {"risk_analysis", "trade_decision", "portfolio_update"} for r in results)
+
+@pytest.mark.asyncio
+async def test_stream_source_errors_propagate():
+    async def updates():
+        yield "A", {"n": 0}
+        raise ConnectionError("feed dropped")
+    
+    barn = BarnOrchestrator()
+    seen = []
+    with pytest.raises(ConnectionError):
+        async for result in barn.stream(updates(), pipeline_factory=RecordingPipeline):
+            seen.append(result)
+    assert [r.results["n"] for r in seen] == [0]
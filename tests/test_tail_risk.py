@@ -0,0 +1,47 @@
+import pytest
+import numpy as np
+from barn.core import RiskManager
+from barn.core.tail_risk import RollingTailRisk, SortedWindow
+
+def test_sorted_window_tracks_sliding_contents():
+    rng = np.random.default_rng(0)
+    window = SortedWindow(50, load=4)
+    # Rounded values force duplicates across bucket boundaries
+    values = np.round(rng.normal(0, 1, 400), 1)
+    for i, value in enumerate(values):
+        window.push(float(value))
+        live = values[max(i - 49, 0):i + 1]
+        ordered = sorted(live)
+        assert window.smallest(len(live)) == ordered
+        rank = i % len(live)
+        assert window.order_statistic(rank) == ordered[rank]
+        assert window.sum_smallest(rank + 1) == pytest.approx(sum(ordered[:rank + 1]), abs=1e-9)
+    assert window.values == list(values[-50:])
+
+@pytest.mark.parametrize("confidence", [0.9, 0.95, 0.99])
+def test_rolling_tail_risk_matches_full_sort(confidence):
+    rng = np.random.default_rng(1)
+    returns = rng.standard_t(3, 700) * 0.01
+    tail = RollingTailRisk(250, confidences=(confidence,))
+    for value in returns:
+        tail.push(float(value))
+        
+    window = returns[-250:]
+    var = np.percentile(window, (1 - confidence) * 100)
+    assert tail.value_at_risk(confidence) == pytest.approx(var)
+    assert tail.expected_shortfall(confidence) == pytest.approx(window[window <= var].mean())
+    assert tail.volatility == pytest.approx(np.std(window))
+
+def test_tail_metrics_feed_risk_manager():
+    tail = RollingTailRisk(100)
+    for price in 100 * np.cumprod(1 + np.random.default_rng(2).normal(0, 0.02, 120)):
+        tail.push_price(float(price))
+    manager = RiskManager()
+    
+    manager.update_metrics(tail.to_metrics("ETH", liquidity_score=0.8))
+    
+    levels = tail.levels()
+    assert set(levels) == {0.95, 0.99}
+    assert levels[0.99]["expected_shortfall"] <= levels[0.95]["expected_shortfall"] < 0
+    report = manager.get_risk_report()["token_metrics"]["ETH"]
+    assert 0 < report["current_risk"] <= 1